@@ -0,0 +1,62 @@
+"""add_seeker_progress_counters
+
+Revision ID: 457c3dee7a26
+Revises: b55d5a69c7d7
+Create Date: 2026-10-16 17:42:08.315904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '457c3dee7a26'
+down_revision: Union[str, Sequence[str], None] = 'b55d5a69c7d7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('answered_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('question_count', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index(batch_op.f('ix_seeker_profiles_questionnaire_completed'), ['questionnaire_completed'], unique=False)
+    
+    # Count progress against the active questionnaire
+    op.execute(sa.text("""
+        UPDATE seeker_profiles
+        SET answered_count = (
+                SELECT COUNT(*)
+                FROM answers
+                JOIN questions ON questions.id = answers.question_id
+                WHERE answers.seeker_profile_id = seeker_profiles.id
+                  AND questions.questionnaire_id = (
+                      SELECT id FROM questionnaires WHERE is_active LIMIT 1
+                  )
+            ),
+            question_count = (
+                SELECT COUNT(*)
+                FROM questions
+                WHERE questions.questionnaire_id = (
+                    SELECT id FROM questionnaires WHERE is_active LIMIT 1
+                )
+            )
+    """))
+    
+    # Completion time was never recorded; the last answer change is the best estimate
+    op.execute(sa.text("""
+        UPDATE seeker_profiles
+        SET questionnaire_completed_at = COALESCE(answers_updated_at, updated_at)
+        WHERE questionnaire_completed AND questionnaire_completed_at IS NULL
+    """))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_seeker_profiles_questionnaire_completed'))
+        batch_op.drop_column('question_count')
+        batch_op.drop_column('answered_count')
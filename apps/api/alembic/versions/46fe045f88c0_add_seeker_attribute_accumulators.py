@@ -0,0 +1,31 @@
+"""add_seeker_attribute_accumulators
+
+Revision ID: 46fe045f88c0
+Revises: f5e75d591469
+Create Date: 2026-10-16 15:41:52.904316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '46fe045f88c0'
+down_revision: Union[str, Sequence[str], None] = 'f5e75d591469'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Left NULL: accumulators are rebuilt from answers on a seeker's next submission
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('attribute_accumulators', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.drop_column('attribute_accumulators')
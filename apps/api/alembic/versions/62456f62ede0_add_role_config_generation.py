@@ -0,0 +1,32 @@
+"""add_role_config_generation
+
+Revision ID: 62456f62ede0
+Revises: a5bb58c740ef
+Create Date: 2026-10-16 16:48:09.731245
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '62456f62ede0'
+down_revision: Union[str, Sequence[str], None] = 'a5bb58c740ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing stats cards carry no "scored_with" stamp, so they are treated
+    # as stale and recomputed lazily the next time they are read
+    with op.batch_alter_table('offerer_role_configs', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('generation', sa.Integer(), nullable=False, server_default='1'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('offerer_role_configs', schema=None) as batch_op:
+        batch_op.drop_column('generation')
@@ -0,0 +1,33 @@
+"""add_seeker_answers_version
+
+Revision ID: 6b28526d61c1
+Revises: aba1e38a5e4b
+Create Date: 2026-10-16 19:05:37.140268
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6b28526d61c1'
+down_revision: Union[str, Sequence[str], None] = 'aba1e38a5e4b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing answer sets start at version 0 with no per-question history
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('answers_version', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('answer_versions', sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.drop_column('answer_versions')
+        batch_op.drop_column('answers_version')
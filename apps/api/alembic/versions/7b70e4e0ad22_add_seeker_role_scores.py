@@ -0,0 +1,111 @@
+"""add_seeker_role_scores
+
+Revision ID: 7b70e4e0ad22
+Revises: d7bae3fa8483
+Create Date: 2026-10-16 09:12:40.518733
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b70e4e0ad22'
+down_revision: Union[str, Sequence[str], None] = 'd7bae3fa8483'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _fit_score(stats: dict, weights: dict) -> float:
+    """Weighted average of stats, same rule as services.scoring.compute_fit_score"""
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for attribute, weight in (weights or {}).items():
+        if attribute in stats:
+            weighted_sum += stats[attribute] * weight
+            total_weight += weight
+    if total_weight == 0:
+        return 0.0
+    return round(weighted_sum / total_weight, 2)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    seeker_role_scores = op.create_table('seeker_role_scores',
+    sa.Column('seeker_profile_id', sa.Uuid(), nullable=False),
+    sa.Column('role_config_id', sa.Uuid(), nullable=False),
+    sa.Column('fit_score', sa.Float(), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['role_config_id'], ['offerer_role_configs.id'], ),
+    sa.ForeignKeyConstraint(['seeker_profile_id'], ['seeker_profiles.id'], ),
+    sa.PrimaryKeyConstraint('seeker_profile_id', 'role_config_id')
+    )
+    op.create_index(
+        'ix_seeker_role_scores_rank',
+        'seeker_role_scores',
+        ['role_config_id', sa.text('fit_score DESC'), 'seeker_profile_id'],
+        unique=False
+    )
+
+    # Backfill from existing stats cards
+    bind = op.get_bind()
+    role_configs = sa.table('offerer_role_configs',
+        sa.column('id', sa.Uuid()),
+        sa.column('role_name', sa.String()),
+        sa.column('weights', sa.JSON()),
+    )
+    seeker_profiles = sa.table('seeker_profiles',
+        sa.column('id', sa.Uuid()),
+        sa.column('stats_card', sa.JSON()),
+        sa.column('stats_computed_at', sa.DateTime()),
+    )
+
+    roles = bind.execute(
+        sa.select(role_configs.c.id, role_configs.c.role_name, role_configs.c.weights)
+    ).all()
+    profiles = bind.execute(
+        sa.select(seeker_profiles.c.id, seeker_profiles.c.stats_card, seeker_profiles.c.stats_computed_at)
+        .where(seeker_profiles.c.stats_card.is_not(None))
+    ).all()
+
+    now = datetime.utcnow()
+    rows = []
+    for profile_id, stats_card, stats_computed_at in profiles:
+        if not isinstance(stats_card, dict):
+            continue
+
+        # GET /seeker/stats used to store the bare stats dict; repair those cards
+        is_flat = "stats" not in stats_card
+        stats = stats_card if is_flat else stats_card.get("stats") or {}
+
+        fit_scores = {}
+        for role_id, role_name, weights in roles:
+            fit_score = _fit_score(stats, weights)
+            fit_scores[role_name] = fit_score
+            rows.append({
+                'seeker_profile_id': profile_id,
+                'role_config_id': role_id,
+                'fit_score': fit_score,
+                'computed_at': stats_computed_at or now,
+            })
+
+        bind.execute(
+            seeker_profiles.update()
+            .where(seeker_profiles.c.id == profile_id)
+            .values(
+                stats_card={"stats": stats, "fit_scores": fit_scores},
+                stats_computed_at=stats_computed_at or now,
+            )
+        )
+
+    if rows:
+        op.bulk_insert(seeker_role_scores, rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_seeker_role_scores_rank', table_name='seeker_role_scores')
+    op.drop_table('seeker_role_scores')
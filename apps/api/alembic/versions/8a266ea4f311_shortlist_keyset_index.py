@@ -0,0 +1,33 @@
+"""shortlist_keyset_index
+
+Revision ID: 8a266ea4f311
+Revises: ffd2046b809e
+Create Date: 2026-10-16 14:22:41.538102
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8a266ea4f311'
+down_revision: Union[str, Sequence[str], None] = 'ffd2046b809e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs keyset pagination of GET /offerer/shortlist on (swiped_at DESC, id DESC)
+    op.create_index(
+        'ix_swipe_decisions_shortlist',
+        'swipe_decisions',
+        ['offerer_id', 'action', sa.text('swiped_at DESC'), sa.text('id DESC')]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_swipe_decisions_shortlist', table_name='swipe_decisions')
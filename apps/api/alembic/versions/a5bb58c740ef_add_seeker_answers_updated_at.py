@@ -0,0 +1,40 @@
+"""add_seeker_answers_updated_at
+
+Revision ID: a5bb58c740ef
+Revises: 46fe045f88c0
+Create Date: 2026-10-16 16:10:27.613058
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5bb58c740ef'
+down_revision: Union[str, Sequence[str], None] = '46fe045f88c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('answers_updated_at', sa.DateTime(), nullable=True))
+    
+    # Best available history: the latest answer each seeker created
+    op.execute(sa.text("""
+        UPDATE seeker_profiles
+        SET answers_updated_at = (
+            SELECT MAX(answers.answered_at)
+            FROM answers
+            WHERE answers.seeker_profile_id = seeker_profiles.id
+        )
+    """))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.drop_column('answers_updated_at')
@@ -0,0 +1,50 @@
+"""add_packed_answer_storage
+
+Revision ID: aba1e38a5e4b
+Revises: 457c3dee7a26
+Create Date: 2026-10-16 18:26:51.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'aba1e38a5e4b'
+down_revision: Union[str, Sequence[str], None] = '457c3dee7a26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('packed_answer_layouts',
+    sa.Column('key', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=False),
+    sa.Column('questionnaire_id', sa.Uuid(), nullable=False),
+    sa.Column('slots', sa.JSON(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['questionnaire_id'], ['questionnaires.id'], ),
+    sa.PrimaryKeyConstraint('key')
+    )
+    with op.batch_alter_table('packed_answer_layouts', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_packed_answer_layouts_questionnaire_id'), ['questionnaire_id'], unique=False)
+    
+    # Seekers move to packed storage on their next submission with answer_storage="packed"
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('packed_answers', sa.LargeBinary(), nullable=True))
+        batch_op.add_column(sa.Column('packed_layout', sqlmodel.sql.sqltypes.AutoString(length=32), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.drop_column('packed_layout')
+        batch_op.drop_column('packed_answers')
+    
+    with op.batch_alter_table('packed_answer_layouts', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_packed_answer_layouts_questionnaire_id'))
+    
+    op.drop_table('packed_answer_layouts')
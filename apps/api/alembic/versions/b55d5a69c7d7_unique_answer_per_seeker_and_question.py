@@ -0,0 +1,49 @@
+"""unique_answer_per_seeker_and_question
+
+Revision ID: b55d5a69c7d7
+Revises: 62456f62ede0
+Create Date: 2026-10-16 17:20:36.148290
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b55d5a69c7d7'
+down_revision: Union[str, Sequence[str], None] = '62456f62ede0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Concurrent select-then-insert autosaves could store duplicates; keep the latest answer
+    op.execute(sa.text("""
+        DELETE FROM answers
+        WHERE id IN (
+            SELECT older.id
+            FROM answers AS older
+            JOIN answers AS newer
+              ON newer.seeker_profile_id = older.seeker_profile_id
+             AND newer.question_id = older.question_id
+             AND (
+                    newer.answered_at > older.answered_at
+                 OR (newer.answered_at = older.answered_at AND newer.id > older.id)
+             )
+        )
+    """))
+
+    op.create_index(
+        'ux_answers_seeker_question',
+        'answers',
+        ['seeker_profile_id', 'question_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_answers_seeker_question', table_name='answers')
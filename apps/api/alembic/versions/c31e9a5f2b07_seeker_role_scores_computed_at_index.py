@@ -0,0 +1,34 @@
+"""seeker_role_scores_computed_at_index
+
+Revision ID: c31e9a5f2b07
+Revises: 6b28526d61c1
+Create Date: 2026-10-16 21:08:13.204716
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c31e9a5f2b07'
+down_revision: Union[str, Sequence[str], None] = '6b28526d61c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs the max(computed_at) change check of the in-process role rankings
+    op.create_index(
+        op.f('ix_seeker_role_scores_computed_at'),
+        'seeker_role_scores',
+        ['computed_at'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_seeker_role_scores_computed_at'), table_name='seeker_role_scores')
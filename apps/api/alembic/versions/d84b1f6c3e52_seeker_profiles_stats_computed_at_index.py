@@ -0,0 +1,31 @@
+"""seeker_profiles_stats_computed_at_index
+
+Revision ID: d84b1f6c3e52
+Revises: c31e9a5f2b07
+Create Date: 2026-10-16 21:16:40.581930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd84b1f6c3e52'
+down_revision: Union[str, Sequence[str], None] = 'c31e9a5f2b07'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Backs the max(stats_computed_at) change check of the in-process candidate store
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_seeker_profiles_stats_computed_at'), ['stats_computed_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('seeker_profiles', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_seeker_profiles_stats_computed_at'))
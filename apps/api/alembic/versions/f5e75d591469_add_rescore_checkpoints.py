@@ -0,0 +1,39 @@
+"""add_rescore_checkpoints
+
+Revision ID: f5e75d591469
+Revises: 8a266ea4f311
+Create Date: 2026-10-16 15:03:18.275610
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f5e75d591469'
+down_revision: Union[str, Sequence[str], None] = '8a266ea4f311'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('rescore_checkpoints',
+    sa.Column('run_name', sqlmodel.sql.sqltypes.AutoString(length=255), nullable=False),
+    sa.Column('range_index', sa.Integer(), nullable=False),
+    sa.Column('range_start', sa.Uuid(), nullable=True),
+    sa.Column('range_end', sa.Uuid(), nullable=False),
+    sa.Column('last_seeker_profile_id', sa.Uuid(), nullable=True),
+    sa.Column('seekers_done', sa.Integer(), nullable=False),
+    sa.Column('completed', sa.Boolean(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('run_name', 'range_index')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('rescore_checkpoints')
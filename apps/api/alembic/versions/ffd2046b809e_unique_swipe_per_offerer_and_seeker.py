@@ -0,0 +1,49 @@
+"""unique_swipe_per_offerer_and_seeker
+
+Revision ID: ffd2046b809e
+Revises: 7b70e4e0ad22
+Create Date: 2026-10-16 13:47:05.204918
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'ffd2046b809e'
+down_revision: Union[str, Sequence[str], None] = '7b70e4e0ad22'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Racy read-before-write swipes could store duplicates; keep the earliest decision
+    op.execute(sa.text("""
+        DELETE FROM swipe_decisions
+        WHERE id IN (
+            SELECT later.id
+            FROM swipe_decisions AS later
+            JOIN swipe_decisions AS earlier
+              ON earlier.offerer_id = later.offerer_id
+             AND earlier.seeker_profile_id = later.seeker_profile_id
+             AND (
+                    earlier.swiped_at < later.swiped_at
+                 OR (earlier.swiped_at = later.swiped_at AND earlier.id < later.id)
+             )
+        )
+    """))
+
+    op.create_index(
+        'ux_swipe_decisions_offerer_seeker',
+        'swipe_decisions',
+        ['offerer_id', 'seeker_profile_id'],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ux_swipe_decisions_offerer_seeker', table_name='swipe_decisions')
@@ -2,7 +2,7 @@
 Authentication utilities for JWT tokens and password hashing.
 """
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Optional, Tuple
 from uuid import UUID
 
 from jose import JWTError, jwt
@@ -13,14 +13,22 @@ from sqlmodel import Session, select
 
 from config import get_settings
 from database import get_session
-from models import User
+from models import Offerer, User, UserRole
+from services.password_hashing import HashingPoolFull, hashing_pool
+from services.principal_cache import Principal, principal_cache
 
 
 # Get settings instance
 settings = get_settings()
 
-# Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing context; hashes of any other cost report needs_update
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.bcrypt_rounds,
+    bcrypt__min_rounds=settings.bcrypt_rounds,
+    bcrypt__max_rounds=settings.bcrypt_rounds,
+)
 
 # HTTP Bearer token scheme
 security = HTTPBearer()
@@ -36,6 +44,34 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many sign-ins in progress, try again shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+async def hash_password(password: str) -> str:
+    """Hash a password on the hashing pool (503 if the pool is full)."""
+    try:
+        return await hashing_pool.run(pwd_context.hash, password)
+    except HashingPoolFull:
+        raise _hashing_busy()
+
+
+async def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """
+    Verify a password on the hashing pool (503 if the pool is full).
+    Returns (valid, new_hash); new_hash is set when the stored hash should be
+    replaced, e.g. because BCRYPT_ROUNDS changed.
+    """
+    try:
+        return await hashing_pool.run(pwd_context.verify_and_update, plain_password, hashed_password)
+    except HashingPoolFull:
+        raise _hashing_busy()
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """Create a JWT access token."""
     to_encode = data.copy()
@@ -61,16 +97,8 @@ def decode_access_token(token: str) -> dict:
         )
 
 
-async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    session: Session = Depends(get_session),
-) -> User:
-    """
-    Dependency to get the current authenticated user from JWT token.
-    """
-    token = credentials.credentials
-    payload = decode_access_token(token)
-    
+def _user_from_payload(payload: dict, session: Session) -> User:
+    """Active user a decoded token belongs to"""
     user_id: str = payload.get("sub")
     if user_id is None:
         raise HTTPException(
@@ -106,6 +134,49 @@ async def get_current_user(
     return user
 
 
+async def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: Session = Depends(get_session),
+) -> User:
+    """
+    Dependency to get the current authenticated user from JWT token.
+    """
+    payload = decode_access_token(credentials.credentials)
+    return _user_from_payload(payload, session)
+
+
+async def get_current_principal(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    session: Session = Depends(get_session),
+) -> Principal:
+    """
+    Dependency to get the current authenticated principal (user id, role and,
+    for offerers, offerer id and role config) from the per-token cache,
+    resolving and caching it on a miss. Use get_current_user when the User
+    row itself is needed.
+    """
+    token = credentials.credentials
+    principal = principal_cache.get(token)
+    if principal is not None:
+        return principal
+    
+    payload = decode_access_token(token)
+    user = _user_from_payload(payload, session)
+    
+    offerer = None
+    if user.role == UserRole.OFFERER:
+        offerer = session.exec(select(Offerer).where(Offerer.email == user.email)).first()
+    principal = Principal(
+        user_id=user.id,
+        email=user.email,
+        role=user.role,
+        offerer_id=offerer.id if offerer else None,
+        role_config_id=offerer.role_config_id if offerer else None
+    )
+    principal_cache.put(token, principal, payload.get("exp"))
+    return principal
+
+
 async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
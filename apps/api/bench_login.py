@@ -0,0 +1,110 @@
+"""
+Login throughput benchmark
+
+Hammers POST /auth/login from several threads while a probe thread keeps
+timing GET /health, then compares the probe latency with an idle baseline.
+With password hashing on the hashing pool the probe latency should stay
+close to the baseline; the /health payload also reports the pool's queue
+depth. Run against a live server:
+
+    uvicorn main:app --port 8000
+    python bench_login.py [concurrency] [seconds]
+"""
+import statistics
+import sys
+import threading
+import time
+
+import requests
+
+BASE_URL = "http://localhost:8000"
+EMAIL = "bench-login@example.com"
+PASSWORD = "password123"
+
+
+def ensure_user():
+    """Register the benchmark user (400 if it already exists is fine)"""
+    response = requests.post(
+        f"{BASE_URL}/auth/register",
+        json={"email": EMAIL, "password": PASSWORD, "role": "seeker"}
+    )
+    if response.status_code not in (201, 400):
+        raise SystemExit(f"Registration failed: {response.status_code} {response.text}")
+
+
+def probe_latencies(stop: threading.Event, samples: list, pool_stats: list):
+    """Time GET /health every 20 ms until stopped"""
+    session = requests.Session()
+    while not stop.is_set():
+        started = time.perf_counter()
+        response = session.get(f"{BASE_URL}/health")
+        samples.append((time.perf_counter() - started) * 1000)
+        pool_stats.append(response.json().get("password_hashing", {}))
+        time.sleep(0.02)
+
+
+def login_worker(stop: threading.Event, results: dict, lock: threading.Lock):
+    """Log in repeatedly until stopped, counting outcomes by status code"""
+    session = requests.Session()
+    while not stop.is_set():
+        response = session.post(f"{BASE_URL}/auth/login", json={"email": EMAIL, "password": PASSWORD})
+        with lock:
+            results[response.status_code] = results.get(response.status_code, 0) + 1
+
+
+def summarize(label: str, samples: list):
+    samples = sorted(samples)
+    p95 = samples[int(len(samples) * 0.95) - 1] if len(samples) >= 20 else samples[-1]
+    print(f"   {label}: n={len(samples)} p50={statistics.median(samples):.1f} ms p95={p95:.1f} ms max={samples[-1]:.1f} ms")
+
+
+def run(concurrency: int, seconds: float):
+    print("\n1. Baseline GET /health latency (idle)...")
+    stop = threading.Event()
+    baseline, _ = [], []
+    probe = threading.Thread(target=probe_latencies, args=(stop, baseline, _))
+    probe.start()
+    time.sleep(min(seconds, 3))
+    stop.set()
+    probe.join()
+    summarize("idle", baseline)
+
+    print(f"\n2. GET /health latency during {concurrency} concurrent logins for {seconds:.0f}s...")
+    stop = threading.Event()
+    loaded, pool_stats = [], []
+    results, lock = {}, threading.Lock()
+    workers = [threading.Thread(target=login_worker, args=(stop, results, lock)) for _ in range(concurrency)]
+    probe = threading.Thread(target=probe_latencies, args=(stop, loaded, pool_stats))
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    probe.start()
+    time.sleep(seconds)
+    stop.set()
+    for worker in workers + [probe]:
+        worker.join()
+    elapsed = time.perf_counter() - started
+
+    summarize("under login load", loaded)
+    logins = results.get(200, 0)
+    print(f"   logins: {logins} ok ({logins / elapsed:.1f}/s), responses by status: {results}")
+    if pool_stats:
+        print(f"   hashing pool: max queued={max(stats.get('queued', 0) for stats in pool_stats)}, "
+              f"rejected={pool_stats[-1].get('rejected', 0)}")
+
+
+if __name__ == "__main__":
+    concurrency = int(sys.argv[1]) if len(sys.argv) > 1 else 16
+    seconds = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    print("=" * 60)
+    print("Login throughput benchmark")
+    print("=" * 60)
+    try:
+        ensure_user()
+        run(concurrency, seconds)
+        print("\n" + "=" * 60)
+        print("✅ Benchmark complete")
+        print("=" * 60)
+    except requests.exceptions.ConnectionError:
+        print("\n❌ Error: Could not connect to API server")
+        print("Make sure the server is running: uvicorn main:app --reload --port 8000")
@@ -2,6 +2,7 @@
 Configuration management for Job Tinder API
 """
 from functools import lru_cache
+from typing import Literal
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -25,6 +26,43 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 7  # 7 days
     magic_link_expiry: int = 3600  # Future use
     
+    # Offerer feed queue (precomputed next candidates per offerer)
+    feed_queue_size: int = 50
+    feed_queue_low_watermark: int = 20
+    
+    # In-process feed caches (role rankings, candidate store): seconds between
+    # checks for scores written by other processes
+    feed_cache_ttl_seconds: float = 5
+    
+    # Swipe durability: "sync" commits each swipe before responding,
+    # "write_behind" acknowledges once buffered and flushes in bulk
+    swipe_durability: Literal["sync", "write_behind"] = "sync"
+    swipe_flush_interval_ms: int = 5
+    swipe_flush_max_rows: int = 500
+    # Swipes still unwritten at shutdown are kept here and replayed on startup
+    swipe_spill_path: str = "./swipe_spill.jsonl"
+    
+    # Answer storage: "rows" keeps one answers row per question, "packed" keeps
+    # a seeker's scale and choice answers in one binary column (text stays rows)
+    answer_storage: Literal["rows", "packed"] = "rows"
+    
+    # Questionnaire / role config cache: seconds between checks for changes
+    reference_data_ttl_seconds: float = 30
+    
+    # Authenticated principal per token (per worker process)
+    principal_cache_ttl_seconds: float = 60
+    principal_cache_max_entries: int = 10000
+    
+    # Password hashing: bcrypt cost (hashes of another cost are upgraded on
+    # login) and the worker pool it runs on, off the event loop
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 4
+    password_hash_max_pending: int = 64
+    
+    # Idempotency-Key replay store (per worker process)
+    idempotency_ttl_seconds: int = 3600
+    idempotency_max_entries: int = 10000
+    
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
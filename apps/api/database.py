@@ -1,7 +1,8 @@
 """
 Database configuration and session management
 """
-from typing import Generator
+from typing import Generator, Type
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import SQLModel, Session, create_engine
 from config import get_settings
 
@@ -29,3 +30,14 @@ def get_session() -> Generator[Session, None, None]:
     """
     with Session(engine) as session:
         yield session
+
+
+def dialect_insert(model: Type[SQLModel]):
+    """
+    INSERT construct for the configured database that supports
+    on_conflict_do_nothing / on_conflict_do_update and RETURNING
+    (PostgreSQL and SQLite >= 3.35)
+    """
+    if engine.dialect.name == "postgresql":
+        return postgresql.insert(model)
+    return sqlite.insert(model)
@@ -7,6 +7,9 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from config import get_settings
 from database import create_db_and_tables
+from services.idempotency import IdempotencyMiddleware, idempotency_store
+from services.password_hashing import hashing_pool
+from services.swipe_buffer import swipe_buffer
 from routes.auth import router as auth_router
 from routes.questionnaire import router as questionnaire_router
 from routes.seeker import router as seeker_router
@@ -24,9 +27,15 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting Job Tinder API...")
     create_db_and_tables()
     print("✅ Database tables created/verified")
+    if settings.swipe_durability == "write_behind":
+        swipe_buffer.start()
+        print("✅ Swipe write-behind buffer started")
     yield
-    # Shutdown: cleanup if needed
+    # Shutdown: flush buffered swipes before exiting
     print("👋 Shutting down Job Tinder API...")
+    if swipe_buffer.running:
+        await swipe_buffer.stop()
+        print("✅ Buffered swipes flushed")
 
 
 app = FastAPI(
@@ -36,6 +45,14 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+# Replay responses of retried POSTs that carry an Idempotency-Key
+# (added first so CORS, the outermost middleware, also covers replays)
+app.add_middleware(
+    IdempotencyMiddleware,
+    store=idempotency_store,
+    paths=["/offerer/swipe", "/questionnaire/answers"],
+)
+
 # CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -74,6 +91,7 @@ async def health_check():
         "service": "job-tinder-api",
         "version": "0.1.0",
         "database": settings.database_url.split("://")[0],  # Just show DB type
+        "password_hashing": hashing_pool.stats(),
     }
 
 
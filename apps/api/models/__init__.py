@@ -7,15 +7,20 @@ from .seeker_profile import SeekerProfile
 from .offerer import Offerer
 
 # Questionnaire models
-from .questionnaire import Questionnaire, Question, Answer, QuestionType
+from .questionnaire import Questionnaire, Question, Answer, QuestionType, PackedAnswerLayout
 
 # Configuration
 from .offerer_role_config import OffererRoleConfig
+from .seeker_role_score import SeekerRoleScore
 
 # Actions
 from .swipe_decision import SwipeDecision, SwipeAction
 from .shortlist import Shortlist, ShortlistStatus
 
+# Maintenance
+from .rescore_checkpoint import RescoreCheckpoint
+from .cache_generation import CacheGeneration
+
 # Legacy models (keeping for migration compatibility)
 from .seeker import Seeker
 from .swipe import Swipe
@@ -31,13 +36,18 @@ __all__ = [
     "Question",
     "Answer",
     "QuestionType",
+    "PackedAnswerLayout",
     # Config
     "OffererRoleConfig",
+    "SeekerRoleScore",
     # Actions
     "SwipeDecision",
     "SwipeAction",
     "Shortlist",
     "ShortlistStatus",
+    # Maintenance
+    "RescoreCheckpoint",
+    "CacheGeneration",
     # Legacy
     "Seeker",
     "Swipe",
@@ -0,0 +1,26 @@
+"""
+CacheGeneration model - change counter for data held by in-process caches
+"""
+from datetime import datetime
+from sqlmodel import Field, SQLModel
+
+
+class CacheGeneration(SQLModel, table=True):
+    """
+    Generation of one kind of cached data, bumped by bulk writers outside
+    the API (e.g. rescore.py) so running API processes reload it
+    """
+    __tablename__ = "cache_generations"
+    
+    name: str = Field(max_length=64, primary_key=True)
+    generation: int = Field(default=0)
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "name": "seeker_scores",
+                "generation": 12
+            }
+        }
@@ -4,6 +4,7 @@ OffererRoleConfig model - role-specific scoring weights
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
+from sqlalchemy import event, inspect
 from sqlmodel import Field, SQLModel, Column, JSON
 
 
@@ -22,6 +23,10 @@ class OffererRoleConfig(SQLModel, table=True):
     # e.g., {"technical_skills": 0.4, "communication": 0.3, "leadership": 0.3}
     weights: dict = Field(sa_column=Column(JSON))
     
+    # Bumped whenever weights change; stats cards record the generation of
+    # every role they were scored with, so outdated cards are detected on read
+    generation: int = Field(default=1)
+    
     # Optional display configuration
     display_config: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     
@@ -46,3 +51,11 @@ class OffererRoleConfig(SQLModel, table=True):
                 }
             }
         }
+
+
+@event.listens_for(OffererRoleConfig, "before_update")
+def _bump_generation_on_weight_change(mapper, connection, target: OffererRoleConfig) -> None:
+    """Any flush that assigns new weights moves the role config to a new generation"""
+    if inspect(target).attrs.weights.history.has_changes():
+        target.generation = (target.generation or 0) + 1
+        target.updated_at = datetime.utcnow()
@@ -1,11 +1,11 @@
 """
-Questionnaire models - questions and answers
+Questionnaire models - questions, answers and packed answer layouts
 """
 from datetime import datetime
 from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
-from sqlmodel import Field, SQLModel, Column, JSON
+from sqlmodel import Field, SQLModel, Column, JSON, Index
 
 
 class QuestionType(str, Enum):
@@ -90,6 +90,10 @@ class Answer(SQLModel, table=True):
     Seeker answers to questionnaire questions
     """
     __tablename__ = "answers"
+    __table_args__ = (
+        # One answer per seeker and question; submissions upsert on this
+        Index("ux_answers_seeker_question", "seeker_profile_id", "question_id", unique=True),
+    )
     
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     seeker_profile_id: UUID = Field(foreign_key="seeker_profiles.id", index=True)
@@ -111,3 +115,22 @@ class Answer(SQLModel, table=True):
                 }
             }
         }
+
+
+class PackedAnswerLayout(SQLModel, table=True):
+    """
+    Slot layout of packed answers (answer_storage="packed")
+    Registered once per distinct layout; packed blobs name theirs by key, so
+    they stay readable after a questionnaire's questions change
+    """
+    __tablename__ = "packed_answer_layouts"
+    
+    # Content hash of the slots
+    key: str = Field(primary_key=True, max_length=32)
+    questionnaire_id: UUID = Field(foreign_key="questionnaires.id", index=True)
+    
+    # Slots in question order: [{"question_id": "...", "choices": ["a", "b"] or None}, ...]
+    # choices None means the slot holds the number itself
+    slots: list = Field(sa_column=Column(JSON))
+    
+    created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,42 @@
+"""
+RescoreCheckpoint model - progress of a resumable rescoring run
+"""
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+from sqlmodel import Field, SQLModel
+
+
+class RescoreCheckpoint(SQLModel, table=True):
+    """
+    Progress of one seeker id range within a rescoring run
+    A run is identified by its name ("all" or "role:<role name>")
+    """
+    __tablename__ = "rescore_checkpoints"
+    
+    run_name: str = Field(max_length=255, primary_key=True)
+    range_index: int = Field(primary_key=True)
+    
+    # Seeker id range: (range_start, range_end]; range_start None means unbounded
+    range_start: Optional[UUID] = Field(default=None)
+    range_end: UUID
+    
+    # Last seeker rescored and committed in this range
+    last_seeker_profile_id: Optional[UUID] = Field(default=None)
+    seekers_done: int = Field(default=0)
+    completed: bool = Field(default=False)
+    
+    updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "run_name": "all",
+                "range_index": 3,
+                "range_start": "2fffffff-ffff-ffff-ffff-ffffffffffff",
+                "range_end": "3fffffff-ffff-ffff-ffff-ffffffffffff",
+                "last_seeker_profile_id": "31a8c2d4-7e0f-4b6a-9c1d-2e3f4a5b6c7d",
+                "seekers_done": 8120,
+                "completed": False
+            }
+        }
@@ -4,7 +4,7 @@ SeekerProfile model - detailed seeker information
 from datetime import datetime
 from typing import Optional
 from uuid import UUID, uuid4
-from sqlmodel import Field, SQLModel, Column, JSON
+from sqlmodel import Field, SQLModel, Column, JSON, LargeBinary
 
 
 class SeekerProfile(SQLModel, table=True):
@@ -26,12 +26,35 @@ class SeekerProfile(SQLModel, table=True):
     preferences: Optional[dict] = Field(default=None, sa_column=Column(JSON))
     
     # Questionnaire completion tracking
-    questionnaire_completed: bool = Field(default=False)
+    questionnaire_completed: bool = Field(default=False, index=True)
     questionnaire_completed_at: Optional[datetime] = Field(default=None)
     
+    # Progress counters, maintained on answer submission: distinct questions
+    # answered and total questions of the questionnaire they count against
+    answered_count: int = Field(default=0)
+    question_count: int = Field(default=0)
+    
     # Stats card (computed from answers)
     stats_card: Optional[dict] = Field(default=None, sa_column=Column(JSON))
-    stats_computed_at: Optional[datetime] = Field(default=None)
+    # Indexed: max(stats_computed_at) tells the in-process candidate store when stats changed
+    stats_computed_at: Optional[datetime] = Field(default=None, index=True)
+    
+    # Answer set version, bumped by every submission that changes an answer,
+    # and the version at which each question last changed ({question_id: version})
+    answers_version: int = Field(default=0)
+    answer_versions: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    
+    # Last answer change; the stats card is stale if this is newer than stats_computed_at
+    answers_updated_at: Optional[datetime] = Field(default=None)
+    
+    # Running weighted sums / weight totals per attribute, so answer changes
+    # update stats by delta: {"plan": <scoring plan key>, "sums": {...}, "weights": {...}}
+    attribute_accumulators: Optional[dict] = Field(default=None, sa_column=Column(JSON))
+    
+    # Packed answer storage (answer_storage="packed"): scale and choice answers
+    # as float64 slots of the named PackedAnswerLayout; text answers stay rows
+    packed_answers: Optional[bytes] = Field(default=None, sa_column=Column(LargeBinary))
+    packed_layout: Optional[str] = Field(default=None, max_length=32)
     
     updated_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -0,0 +1,40 @@
+"""
+SeekerRoleScore model - materialized fit score per seeker and role
+"""
+from datetime import datetime
+from uuid import UUID
+from sqlmodel import Field, SQLModel, Index
+
+
+class SeekerRoleScore(SQLModel, table=True):
+    """
+    Fit score of a seeker for one role configuration
+    Mirrors stats_card["fit_scores"] so the feed can rank from an index
+    """
+    __tablename__ = "seeker_role_scores"
+    
+    seeker_profile_id: UUID = Field(foreign_key="seeker_profiles.id", primary_key=True)
+    role_config_id: UUID = Field(foreign_key="offerer_role_configs.id", primary_key=True)
+    
+    fit_score: float = Field(default=0.0)
+    
+    # Indexed: max(computed_at) tells in-process rankings when scores changed
+    computed_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "seeker_profile_id": "123e4567-e89b-12d3-a456-426614174000",
+                "role_config_id": "456e7890-a12b-34c5-d678-901234567890",
+                "fit_score": 87.5
+            }
+        }
+
+
+# Feed ranking index: one range scan per page for a given role
+Index(
+    "ix_seeker_role_scores_rank",
+    SeekerRoleScore.role_config_id,
+    SeekerRoleScore.fit_score.desc(),
+    SeekerRoleScore.seeker_profile_id,
+)
@@ -5,7 +5,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 from uuid import UUID, uuid4
-from sqlmodel import Field, SQLModel
+from sqlmodel import Field, SQLModel, Index
 
 
 class SwipeAction(str, Enum):
@@ -22,6 +22,10 @@ class SwipeDecision(SQLModel, table=True):
     Renamed from Swipe for clarity
     """
     __tablename__ = "swipe_decisions"
+    __table_args__ = (
+        # One decision per offerer and seeker; swipe inserts rely on it for ON CONFLICT
+        Index("ux_swipe_decisions_offerer_seeker", "offerer_id", "seeker_profile_id", unique=True),
+    )
 
     id: UUID = Field(default_factory=uuid4, primary_key=True)
     offerer_id: UUID = Field(foreign_key="offerers.id", index=True)
@@ -47,3 +51,13 @@ class SwipeDecision(SQLModel, table=True):
                 "note": "Strong technical background, good culture fit"
             }
         }
+
+
+# Shortlist pagination: an offerer's likes, newest first
+Index(
+    "ix_swipe_decisions_shortlist",
+    SwipeDecision.offerer_id,
+    SwipeDecision.action,
+    SwipeDecision.swiped_at.desc(),
+    SwipeDecision.id.desc(),
+)
@@ -0,0 +1,211 @@
+"""
+Recompute seeker stats cards and fit scores for the whole population
+- Splits seeker ids into ranges scored in parallel worker processes
+- Resumable: progress is checkpointed per range in rescore_checkpoints
+- --role recomputes one role's fit scores from stored stats
+- --dry-run scores without writing and reports throughput
+- Bumps the seeker_scores cache generation when it stops, so running API
+  processes reload their candidate store and rankings
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from pathlib import Path
+from typing import List, Optional, Tuple
+from uuid import UUID
+
+# Add parent directory to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+from sqlmodel import Session, create_engine, delete, select
+from config import get_settings
+from database import engine, connect_args
+from models import OffererRoleConfig, RescoreCheckpoint
+from services.batch_scoring import RescoreResult, rescore_role, rescore_seekers
+from services.cache_generations import SEEKER_SCORES, bump_cache_generation
+
+
+def id_ranges(count: int) -> List[Tuple[Optional[UUID], UUID]]:
+    """
+    Split the UUID space into `count` equal (start_after, end_at] ranges
+    Seeker ids are uuid4, so equal ranges hold roughly equal numbers of seekers
+    """
+    bounds = [(i * 2 ** 128) // count for i in range(count + 1)]
+    return [
+        (UUID(int=bounds[i] - 1) if i > 0 else None, UUID(int=bounds[i + 1] - 1))
+        for i in range(count)
+    ]
+
+
+def rescore_range(
+    run_name: str,
+    range_index: int,
+    start_after: Optional[UUID],
+    end_at: UUID,
+    role_config_id: Optional[UUID],
+    chunk_size: int,
+    dry_run: bool
+) -> Tuple[int, RescoreResult]:
+    """
+    Worker: rescore one id range with its own engine, checkpointing each chunk
+    """
+    worker_engine = create_engine(get_settings().database_url, connect_args=connect_args)
+    try:
+        with Session(worker_engine) as session:
+            checkpoint = None
+            if not dry_run:
+                checkpoint = session.get(RescoreCheckpoint, (run_name, range_index))
+                start_after = checkpoint.last_seeker_profile_id or start_after
+            seekers_before = checkpoint.seekers_done if checkpoint else 0
+
+            def save_checkpoint(last_seeker_profile_id: UUID, seekers_done: int) -> None:
+                checkpoint.last_seeker_profile_id = last_seeker_profile_id
+                checkpoint.seekers_done = seekers_before + seekers_done
+                checkpoint.updated_at = datetime.utcnow()
+                session.add(checkpoint)
+
+            options = dict(
+                start_after=start_after,
+                end_at=end_at,
+                chunk_seekers=chunk_size,
+                write=not dry_run,
+                on_chunk=save_checkpoint if checkpoint else None
+            )
+            if role_config_id is not None:
+                role_config = session.get(OffererRoleConfig, role_config_id)
+                result = rescore_role(session, role_config, **options)
+            else:
+                result = rescore_seekers(session, **options)
+
+            if checkpoint:
+                checkpoint.completed = True
+                checkpoint.updated_at = datetime.utcnow()
+                session.add(checkpoint)
+                session.commit()
+        return range_index, result
+    finally:
+        worker_engine.dispose()
+
+
+def plan_run(
+    session: Session,
+    run_name: str,
+    range_count: int,
+    restart: bool
+) -> List[RescoreCheckpoint]:
+    """
+    Checkpoints still to do for a run: the unfinished ranges of an interrupted
+    run, or a fresh set of ranges if there is none (or restart is set)
+    """
+    existing = session.exec(
+        select(RescoreCheckpoint)
+        .where(RescoreCheckpoint.run_name == run_name)
+        .order_by(RescoreCheckpoint.range_index)
+    ).all()
+    pending = [checkpoint for checkpoint in existing if not checkpoint.completed]
+
+    if pending and not restart:
+        print(f"↻ Resuming run '{run_name}': {len(existing) - len(pending)}/{len(existing)} ranges already done")
+        return pending
+
+    session.exec(delete(RescoreCheckpoint).where(RescoreCheckpoint.run_name == run_name))
+    checkpoints = [
+        RescoreCheckpoint(
+            run_name=run_name,
+            range_index=range_index,
+            range_start=start_after,
+            range_end=end_at
+        )
+        for range_index, (start_after, end_at) in enumerate(id_ranges(range_count))
+    ]
+    session.add_all(checkpoints)
+    session.commit()
+    for checkpoint in checkpoints:
+        session.refresh(checkpoint)
+    print(f"✓ Starting run '{run_name}' over {range_count} id ranges")
+    return checkpoints
+
+
+def main():
+    """Run a parallel, resumable rescore"""
+    parser = argparse.ArgumentParser(description="Recompute seeker stats cards and fit scores")
+    parser.add_argument("--role", help="Only recompute fit scores for this role (name or id)")
+    parser.add_argument("--dry-run", action="store_true", help="Score without writing and report throughput")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes (default: all cores)")
+    parser.add_argument("--ranges", type=int, help="Seeker id ranges to split into (default: 4 per worker)")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="Seekers scored and committed per chunk")
+    parser.add_argument("--restart", action="store_true", help="Discard checkpoints of an interrupted run and start over")
+    args = parser.parse_args()
+
+    range_count = args.ranges or args.workers * 4
+    print("🔁 Starting rescoring...")
+    print()
+
+    with Session(engine) as session:
+        role_config = None
+        if args.role:
+            statement = select(OffererRoleConfig).where(OffererRoleConfig.role_name == args.role)
+            role_config = session.exec(statement).first()
+            if role_config is None:
+                try:
+                    role_config = session.get(OffererRoleConfig, UUID(args.role))
+                except ValueError:
+                    pass
+            if role_config is None:
+                print(f"❌ Role config not found: {args.role}")
+                sys.exit(1)
+
+        run_name = f"role:{role_config.role_name}" if role_config else "all"
+        if args.dry_run:
+            ranges = [
+                (range_index, start_after, end_at)
+                for range_index, (start_after, end_at) in enumerate(id_ranges(range_count))
+            ]
+            print(f"✓ Dry run '{run_name}' over {range_count} id ranges (nothing is written)")
+        else:
+            ranges = [
+                (checkpoint.range_index, checkpoint.range_start, checkpoint.range_end)
+                for checkpoint in plan_run(session, run_name, range_count, args.restart)
+            ]
+        role_config_id = role_config.id if role_config else None
+
+    # Workers open their own engines; don't hand them the parent's pooled connections
+    engine.dispose()
+
+    started = time.perf_counter()
+    seekers = 0
+    answers = 0
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            futures = [
+                executor.submit(
+                    rescore_range, run_name, range_index, start_after, end_at,
+                    role_config_id, args.chunk_size, args.dry_run
+                )
+                for range_index, start_after, end_at in ranges
+            ]
+            for done, future in enumerate(as_completed(futures), start=1):
+                range_index, result = future.result()
+                seekers += result.seekers
+                answers += result.answers
+                print(f"✓ Range {range_index}: {result.seekers} seekers in {result.seconds:.1f}s ({done}/{len(futures)})")
+    finally:
+        if not args.dry_run:
+            # Committed chunks are live even if the run was interrupted
+            with Session(engine) as session:
+                bump_cache_generation(session, SEEKER_SCORES)
+                session.commit()
+            print(f"✓ Running API processes reload scores within {get_settings().feed_cache_ttl_seconds:g}s")
+
+    elapsed = time.perf_counter() - started
+    rate = seekers / elapsed if elapsed > 0 else 0.0
+    print()
+    verb = "Scored (dry run)" if args.dry_run else "Rescored"
+    print(f"✅ {verb} {seekers} seekers ({answers} answers) in {elapsed:.1f}s - {rate:,.0f} seekers/s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,8 +9,8 @@ from database import get_session
 from models import User, UserRole, Offerer
 from schemas.auth import RegisterRequest, LoginRequest, TokenResponse, UserResponse
 from auth import (
-    get_password_hash,
-    verify_password,
+    hash_password,
+    verify_and_update_password,
     create_access_token,
     get_current_active_user
 )
@@ -46,8 +46,11 @@ async def register(
             detail="Company name is required for offerer registration"
         )
 
+    # End the read transaction so its connection is not held while hashing
+    session.commit()
+
     # Create new user
-    hashed_password = get_password_hash(request.password)
+    hashed_password = await hash_password(request.password)
     new_user = User(
         email=request.email,
         hashed_password=hashed_password,
@@ -94,8 +97,12 @@ async def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
 
-    # Verify password
-    if not verify_password(request.password, user.hashed_password):
+    # Verify password off the event loop, without holding a connection meanwhile;
+    # new_hash is set when the stored hash's cost is outdated
+    hashed_password = user.hashed_password
+    session.commit()
+    password_valid, new_hash = await verify_and_update_password(request.password, hashed_password)
+    if not password_valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
@@ -111,6 +118,8 @@ async def login(
 
     # Update last login
     user.last_login = datetime.utcnow()
+    if new_hash:
+        user.hashed_password = new_hash
     session.add(user)
     session.commit()
 
@@ -1,52 +1,159 @@
 """
 Offerer endpoints - config, feed, swipe, shortlist
 """
-from typing import Optional
-from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import csv
+import io
+from typing import Callable, Iterator, Optional
+from uuid import UUID, uuid4
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select, and_, or_, func
 from datetime import datetime
 
-from database import get_session
+from database import engine, get_session, dialect_insert
 from models import (
-    User, UserRole, Offerer, SeekerProfile, 
-    OffererRoleConfig, SwipeDecision, SwipeAction
+    UserRole, Offerer, SeekerProfile, 
+    OffererRoleConfig, SwipeDecision, SwipeAction, SeekerRoleScore
 )
 from schemas.offerer import (
     OffererConfigRequest, OffererConfigResponse,
     CandidateCard, FeedResponse,
+    RankRequest, RankResponse,
     SwipeRequest, SwipeResponse,
+    BatchSwipeRequest, BatchSwipeItemResult, BatchSwipeResponse,
     ShortlistCandidate, ShortlistResponse,
     NoteRequest, NoteResponse,
     RoleConfigSummary, RoleConfigsResponse
 )
-from auth import get_current_active_user
+from auth import get_current_principal
+from config import get_settings
+from services.http_cache import etag_response
+from services.pagination import encode_cursor, decode_cursor, InvalidCursorError
+from services.principal_cache import Principal, principal_cache
+from services.reference_data import ReferenceData, get_reference_data
+from services.scoring import load_scoring_rules
+from services.stats_cards import refresh_stale_cards, write_back_cards
+from services.candidate_store import get_candidate_store
+from services.role_rankings import get_role_ranking
+from services.swipe_index import get_swiped_set, record_swipe, sync_swiped
+from services.swipe_buffer import swipe_buffer
+from services.feed_queue import (
+    get_feed_queue, refill_feed_queue, discard_from_feed_queue, invalidate_feed_queue
+)
 
 router = APIRouter(prefix="/offerer", tags=["offerer"])
+settings = get_settings()
+
+# Decisions accepted from clients, mapped to stored SwipeAction
+SWIPE_ACTIONS = {
+    "like": SwipeAction.LIKE,
+    "pass": SwipeAction.PASS
+}
+
+# Rows fetched per server-side cursor round trip and written per CSV chunk
+SHORTLIST_EXPORT_CHUNK_ROWS = 500
 
+# Leading characters that make spreadsheet apps read a cell as a formula
+CSV_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
 
-def require_offerer(current_user: User = Depends(get_current_active_user)) -> User:
+
+def require_offerer(principal: Principal = Depends(get_current_principal)) -> Principal:
     """Dependency to ensure user is an offerer"""
-    if current_user.role != UserRole.OFFERER:
+    if principal.role != UserRole.OFFERER:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only offerers can access this endpoint"
         )
-    return current_user
+    return principal
+
+
+def unswiped_page(db: Session, offerer_id: UUID, fetch: Callable[[], tuple]) -> tuple:
+    """
+    Fetch a page of ([(seeker_profile_id, fit_score)], ...) until none of its
+    candidates turn out to have been swiped through another worker. Each pass
+    adds the swipes it finds to the offerer's swiped set (and drops them from
+    the feed queue), so the next pass skips them.
+    """
+    while True:
+        page = fetch()
+        found = sync_swiped(db, offerer_id, [seeker_profile_id for seeker_profile_id, _ in page[0]])
+        if not found:
+            return page
+        for seeker_profile_id in found:
+            discard_from_feed_queue(offerer_id, seeker_profile_id)
+
+
+def encode_feed_cursor(fit_score: float, seeker_profile_id: UUID, role_config_id: UUID) -> str:
+    """Build the opaque feed cursor for the last candidate on a page"""
+    return encode_cursor({
+        "s": fit_score,
+        "id": seeker_profile_id,
+        "rc": role_config_id
+    })
+
+
+def decode_feed_cursor(cursor: str, role_config_id: UUID) -> tuple[float, UUID]:
+    """
+    Decode a feed cursor into its (fit_score, seeker_profile_id) keyset position
+    Rejects cursors issued for a different role configuration
+    """
+    try:
+        payload = decode_cursor(cursor)
+        fit_score = float(payload["s"])
+        seeker_profile_id = UUID(payload["id"])
+        cursor_role_config_id = UUID(payload["rc"])
+    except (InvalidCursorError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor format"
+        )
+    
+    if cursor_role_config_id != role_config_id:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cursor belongs to a different role configuration. Restart the feed without a cursor."
+        )
+    
+    return fit_score, seeker_profile_id
+
 
+def encode_shortlist_cursor(swiped_at: datetime, swipe_id: UUID) -> str:
+    """Build the opaque shortlist cursor for the last card on a page"""
+    return encode_cursor({"t": swiped_at.isoformat(), "id": swipe_id})
+
+
+def decode_shortlist_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a shortlist cursor into its (swiped_at, swipe_id) keyset position"""
+    try:
+        payload = decode_cursor(cursor)
+        swiped_at = datetime.fromisoformat(payload["t"])
+        swipe_id = UUID(payload["id"])
+    except (InvalidCursorError, KeyError, TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor format"
+        )
+    
+    return swiped_at, swipe_id
 
 
 @router.get("/role-configs", response_model=RoleConfigsResponse)
 async def list_role_configs(
-    db: Session = Depends(get_session)
+    if_none_match: Optional[str] = Header(None)
 ):
     """
     List all available role configurations
     Public endpoint - no auth required
-    """
-    statement = select(OffererRoleConfig).where(OffererRoleConfig.is_active == True).order_by(OffererRoleConfig.role_name)
-    configs = db.exec(statement).all()
     
+    Served from the reference data cache with an ETag; a matching
+    If-None-Match gets 304 Not Modified.
+    """
+    body, etag = get_reference_data().response("role_configs", _role_configs_response)
+    return etag_response(body, etag, if_none_match, "public, max-age=60")
+
+
+def _role_configs_response(reference_data: ReferenceData) -> RoleConfigsResponse:
+    """Active role configs response, built once per reference data snapshot"""
     config_summaries = [
         RoleConfigSummary(
             id=config.id,
@@ -54,7 +161,7 @@ async def list_role_configs(
             description=config.description,
             weights=config.weights
         )
-        for config in configs
+        for config in reference_data.active_role_configs
     ]
     
     return RoleConfigsResponse(
@@ -65,15 +172,14 @@ async def list_role_configs(
 @router.put("/config", response_model=OffererConfigResponse)
 async def set_offerer_config(
     config_request: OffererConfigRequest,
-    current_user: User = Depends(require_offerer),
+    principal: Principal = Depends(require_offerer),
     db: Session = Depends(get_session)
 ):
     """
     T5.1 - Set offerer's role configuration for feed sorting
     """
     # Get offerer profile
-    statement = select(Offerer).where(Offerer.email == current_user.email)
-    offerer = db.exec(statement).first()
+    offerer = db.get(Offerer, principal.offerer_id) if principal.offerer_id else None
     
     if not offerer:
         raise HTTPException(
@@ -101,6 +207,8 @@ async def set_offerer_config(
     db.add(offerer)
     db.commit()
     db.refresh(offerer)
+    invalidate_feed_queue(offerer.id)
+    principal_cache.invalidate_user(principal.user_id)
     
     return OffererConfigResponse(
         role_config_id=role_config.id,
@@ -111,143 +219,203 @@ async def set_offerer_config(
 
 @router.get("/feed", response_model=FeedResponse)
 async def get_candidate_feed(
-    cursor: Optional[str] = Query(None, description="Cursor for pagination (seeker_profile_id)"),
+    background_tasks: BackgroundTasks,
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the previous page"),
     limit: int = Query(10, ge=1, le=50, description="Number of results per page"),
-    current_user: User = Depends(require_offerer),
+    principal: Principal = Depends(require_offerer),
     db: Session = Depends(get_session)
 ):
     """
     T5.2 - Get paginated feed of candidates sorted by fit score
     Excludes already-swiped candidates
-    """
-    # Get offerer profile
-    statement = select(Offerer).where(Offerer.email == current_user.email)
-    offerer = db.exec(statement).first()
     
-    if not offerer:
+    The first page is served from the offerer's precomputed feed queue;
+    later pages walk the role's shared ranking from the cursor.
+    """
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Offerer profile not found"
         )
     
-    if not offerer.role_config_id:
+    if not principal.role_config_id:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Please set role configuration first using PUT /offerer/config"
         )
     
     # Get role config for weight calculations
-    role_config = db.get(OffererRoleConfig, offerer.role_config_id)
+    role_config = principal.role_config or db.get(OffererRoleConfig, principal.role_config_id)
     if not role_config:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Role configuration not found"
         )
     
-    # Get IDs of already-swiped seekers
-    swiped_seeker_ids_statement = select(SwipeDecision.seeker_profile_id).where(
-        SwipeDecision.offerer_id == offerer.id
+    if cursor:
+        # Walk the role's shared ranking, skipping this offerer's swiped candidates
+        after = decode_feed_cursor(cursor, role_config.id)
+        swiped_seekers = get_swiped_set(db, principal.offerer_id)
+        ranking = get_role_ranking(db, role_config.id)
+        ranked, has_more = unswiped_page(db, principal.offerer_id, lambda: ranking.page(
+            limit,
+            after=after,
+            exclude=swiped_seekers.__contains__
+        ))
+    else:
+        # Head of the precomputed queue; top it up after the response if low
+        queue = get_feed_queue(db, principal.offerer_id, role_config.id)
+        ranked, has_more = unswiped_page(db, principal.offerer_id, lambda: queue.peek(limit))
+        if queue.needs_refill():
+            background_tasks.add_task(refill_feed_queue, principal.offerer_id)
+    
+    # Hydrate cards for the page in one query
+    ranked_ids = [seeker_profile_id for seeker_profile_id, _ in ranked]
+    seekers_statement = select(SeekerProfile).where(SeekerProfile.id.in_(ranked_ids))
+    seekers = {seeker.id: seeker for seeker in db.exec(seekers_statement)} if ranked_ids else {}
+    
+    # Recompute outdated cards for display; persist them after the response
+    read_at = datetime.utcnow()
+    stats_cards, stale_ids = refresh_stale_cards(
+        db, {seeker_id: seeker.stats_card for seeker_id, seeker in seekers.items()}
     )
-    swiped_seeker_ids = {row for row in db.exec(swiped_seeker_ids_statement)}
-    
-    # Build base query for seekers with computed stats
-    base_statement = select(SeekerProfile).where(
-        and_(
-            SeekerProfile.questionnaire_completed == True,
-            SeekerProfile.stats_card.is_not(None),
-            SeekerProfile.id.not_in(swiped_seeker_ids) if swiped_seeker_ids else True
+    if stale_ids:
+        background_tasks.add_task(
+            write_back_cards, {seeker_id: stats_cards[seeker_id] for seeker_id in stale_ids}, read_at
         )
+    
+    # Build response
+    candidate_cards = []
+    for seeker_profile_id, fit_score in ranked:
+        seeker = seekers.get(seeker_profile_id)
+        if not seeker:
+            continue
+        stats_card = stats_cards[seeker_profile_id] or {}
+        if seeker_profile_id in stale_ids:
+            fit_score = (stats_card.get("fit_scores") or {}).get(role_config.role_name, fit_score)
+        candidate_cards.append(CandidateCard(
+            seeker_profile_id=seeker.id,
+            headline=seeker.headline,
+            location=seeker.location,
+            bio=seeker.bio,
+            stats=stats_card.get("stats") or {},
+            fit_score=fit_score,
+            questionnaire_completed=seeker.questionnaire_completed,
+            stats_computed_at=seeker.stats_computed_at
+        ))
+    
+    next_cursor = None
+    if has_more and ranked:
+        last_seeker_id, last_fit_score = ranked[-1]
+        next_cursor = encode_feed_cursor(last_fit_score, last_seeker_id, role_config.id)
+    
+    return FeedResponse(
+        candidates=candidate_cards,
+        next_cursor=next_cursor,
+        has_more=has_more
     )
+
+
+@router.post("/feed/rank", response_model=RankResponse)
+async def rank_candidates(
+    rank_request: RankRequest,
+    principal: Principal = Depends(require_offerer),
+    db: Session = Depends(get_session)
+):
+    """
+    Rank the whole candidate pool for ad-hoc weights (or the selected role config)
+    Scored in memory by the candidate store; excludes already-swiped candidates
+    """
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Offerer profile not found"
+        )
     
-    # Apply cursor pagination
-    if cursor:
-        try:
-            cursor_uuid = UUID(cursor)
-            base_statement = base_statement.where(SeekerProfile.id > cursor_uuid)
-        except ValueError:
+    weights = rank_request.weights
+    if weights is None:
+        if not principal.role_config_id:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Invalid cursor format"
+                detail="Provide weights or set role configuration first using PUT /offerer/config"
             )
+        role_config = principal.role_config or db.get(OffererRoleConfig, principal.role_config_id)
+        if not role_config:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Role configuration not found"
+            )
+        weights = role_config.weights
     
-    # Order by ID for deterministic pagination (we'll sort by fit score in Python)
-    base_statement = base_statement.order_by(SeekerProfile.id).limit(limit + 1)
-    
-    seekers = db.exec(base_statement).all()
+    store = get_candidate_store(db)
     
-    # Check if there are more results
-    has_more = len(seekers) > limit
-    if has_more:
-        seekers = seekers[:limit]
+    unknown_attributes = set(weights) - set(store.attributes)
+    if unknown_attributes:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown attributes: {', '.join(sorted(unknown_attributes))}"
+        )
     
-    # Compute fit scores and build candidate cards
-    candidates = []
-    for seeker in seekers:
-        if not seeker.stats_card or "fit_scores" not in seeker.stats_card:
-            continue
-        
-        fit_scores = seeker.stats_card.get("fit_scores", {})
-        role_fit_score = fit_scores.get(role_config.role_name, 0.0)
-        
-        candidates.append({
-            "seeker": seeker,
-            "fit_score": role_fit_score
-        })
+    # Already-swiped seekers (compressed in-memory index, loaded once per offerer;
+    # swipes made through other workers are caught per page)
+    swiped_seekers = get_swiped_set(db, principal.offerer_id)
     
-    # Sort by fit score (descending)
-    candidates.sort(key=lambda x: x["fit_score"], reverse=True)
+    ranked, total_ranked = unswiped_page(
+        db, principal.offerer_id,
+        lambda: store.rank(weights, rank_request.limit, exclude=swiped_seekers)
+    )
     
-    # Build response
-    candidate_cards = [
-        CandidateCard(
-            seeker_profile_id=c["seeker"].id,
-            headline=c["seeker"].headline,
-            location=c["seeker"].location,
-            bio=c["seeker"].bio,
-            stats=c["seeker"].stats_card.get("stats", {}),
-            fit_score=c["fit_score"],
-            questionnaire_completed=c["seeker"].questionnaire_completed,
-            stats_computed_at=c["seeker"].stats_computed_at
-        )
-        for c in candidates
-    ]
+    # Hydrate cards for the ranked ids in one query
+    ranked_ids = [seeker_profile_id for seeker_profile_id, _ in ranked]
+    seekers_statement = select(SeekerProfile).where(SeekerProfile.id.in_(ranked_ids))
+    seekers = {seeker.id: seeker for seeker in db.exec(seekers_statement)} if ranked_ids else {}
     
-    next_cursor = None
-    if has_more and seekers:
-        next_cursor = str(seekers[-1].id)
+    candidate_cards = []
+    for seeker_profile_id, fit_score in ranked:
+        seeker = seekers.get(seeker_profile_id)
+        if not seeker:
+            continue
+        candidate_cards.append(CandidateCard(
+            seeker_profile_id=seeker.id,
+            headline=seeker.headline,
+            location=seeker.location,
+            bio=seeker.bio,
+            stats=seeker.stats_card.get("stats", {}) if seeker.stats_card else {},
+            fit_score=fit_score,
+            questionnaire_completed=seeker.questionnaire_completed,
+            stats_computed_at=seeker.stats_computed_at
+        ))
     
-    return FeedResponse(
+    return RankResponse(
         candidates=candidate_cards,
-        next_cursor=next_cursor,
-        has_more=has_more
+        total_ranked=total_ranked
     )
 
 
 @router.post("/swipe", response_model=SwipeResponse)
 async def swipe_candidate(
     swipe_request: SwipeRequest,
-    current_user: User = Depends(require_offerer),
+    background_tasks: BackgroundTasks,
+    principal: Principal = Depends(require_offerer),
     db: Session = Depends(get_session)
 ):
     """
     T5.3 - Record swipe decision (like/pass) on candidate
     """
-    # Get offerer profile
-    statement = select(Offerer).where(Offerer.email == current_user.email)
-    offerer = db.exec(statement).first()
-    
-    if not offerer:
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Offerer profile not found"
         )
     
     # Validate decision
-    valid_decisions = ["like", "pass"]
-    if swipe_request.decision.lower() not in valid_decisions:
+    if swipe_request.decision.lower() not in SWIPE_ACTIONS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Invalid decision. Must be one of: {', '.join(valid_decisions)}"
+            detail=f"Invalid decision. Must be one of: {', '.join(SWIPE_ACTIONS)}"
         )
     
     # Verify seeker exists
@@ -258,38 +426,45 @@ async def swipe_candidate(
             detail="Seeker not found"
         )
     
-    # Check if already swiped
-    existing_swipe_statement = select(SwipeDecision).where(
-        and_(
-            SwipeDecision.offerer_id == offerer.id,
-            SwipeDecision.seeker_profile_id == swipe_request.seeker_profile_id
-        )
-    )
-    existing_swipe = db.exec(existing_swipe_statement).first()
-    
-    if existing_swipe:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Already swiped on this candidate"
-        )
-    
-    # Map decision to SwipeAction
-    action_map = {
-        "like": SwipeAction.LIKE,
-        "pass": SwipeAction.PASS
+    swipe_row = {
+        "id": uuid4(),
+        "offerer_id": principal.offerer_id,
+        "seeker_profile_id": swipe_request.seeker_profile_id,
+        "action": SWIPE_ACTIONS[swipe_request.decision.lower()],
+        "role_config_id": principal.role_config_id,
+        "swiped_at": datetime.utcnow()
     }
     
-    # Create swipe decision
-    swipe_decision = SwipeDecision(
-        offerer_id=offerer.id,
-        seeker_profile_id=swipe_request.seeker_profile_id,
-        action=action_map[swipe_request.decision.lower()],
-        role_config_id=offerer.role_config_id,
-        swiped_at=datetime.utcnow()
-    )
+    if settings.swipe_durability == "write_behind":
+        # The in-memory swiped set is the duplicate check; the flush loop
+        # writes with ON CONFLICT DO NOTHING as a backstop
+        swiped_seekers = get_swiped_set(db, principal.offerer_id)
+        if not swiped_seekers.add(swipe_request.seeker_profile_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Already swiped on this candidate"
+            )
+        swipe_buffer.enqueue(swipe_row)
+    else:
+        # Insert unless a decision already exists; the unique (offerer_id, seeker_profile_id)
+        # index makes this atomic, so concurrent duplicate swipes can't both succeed
+        insert_statement = dialect_insert(SwipeDecision).values(**swipe_row).on_conflict_do_nothing(
+            index_elements=["offerer_id", "seeker_profile_id"]
+        ).returning(SwipeDecision.id)
+        
+        inserted_id = db.exec(insert_statement).scalar_one_or_none()
+        db.commit()
+        
+        if inserted_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Already swiped on this candidate"
+            )
+        
+        record_swipe(principal.offerer_id, swipe_request.seeker_profile_id)
     
-    db.add(swipe_decision)
-    db.commit()
+    if discard_from_feed_queue(principal.offerer_id, swipe_request.seeker_profile_id):
+        background_tasks.add_task(refill_feed_queue, principal.offerer_id)
     
     message = "Candidate added to shortlist" if swipe_request.decision.lower() == "like" else "Candidate passed"
     
@@ -301,83 +476,330 @@ async def swipe_candidate(
     )
 
 
+@router.post("/swipes:batch", response_model=BatchSwipeResponse)
+async def swipe_candidates_batch(
+    batch_request: BatchSwipeRequest,
+    background_tasks: BackgroundTasks,
+    principal: Principal = Depends(require_offerer),
+    db: Session = Depends(get_session)
+):
+    """
+    Record a batch of queued swipe decisions in one transaction
+    Seekers are validated with one IN query and new decisions are inserted
+    with a single multi-row statement (or, in write_behind mode, queued on
+    the swipe buffer like single swipes). Each item reports its own outcome.
+    """
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Offerer profile not found"
+        )
+    
+    seeker_ids = {item.seeker_profile_id for item in batch_request.decisions}
+    
+    # Validate all seekers with one query
+    existing_seekers_statement = select(SeekerProfile.id).where(SeekerProfile.id.in_(seeker_ids))
+    existing_seeker_ids = set(db.exec(existing_seekers_statement))
+    
+    swiped_at = datetime.utcnow()
+    batch_seeker_ids = set()
+    results = []
+    rows = []
+    for item in batch_request.decisions:
+        decision = item.decision.lower()
+        result = BatchSwipeItemResult(
+            seeker_profile_id=item.seeker_profile_id,
+            decision=decision,
+            status="created"
+        )
+        
+        if decision not in SWIPE_ACTIONS:
+            result.status = "invalid"
+            result.detail = f"Invalid decision. Must be one of: {', '.join(SWIPE_ACTIONS)}"
+        elif item.seeker_profile_id not in existing_seeker_ids:
+            result.status = "not_found"
+            result.detail = "Seeker not found"
+        elif item.seeker_profile_id in batch_seeker_ids:
+            result.status = "conflict"
+            result.detail = "Duplicate decision in batch"
+        else:
+            batch_seeker_ids.add(item.seeker_profile_id)
+            rows.append({
+                "id": uuid4(),
+                "offerer_id": principal.offerer_id,
+                "seeker_profile_id": item.seeker_profile_id,
+                "action": SWIPE_ACTIONS[decision],
+                "role_config_id": principal.role_config_id,
+                "swiped_at": swiped_at
+            })
+        
+        results.append(result)
+    
+    created_ids = set()
+    if rows and settings.swipe_durability == "write_behind":
+        # Same path as single swipes: the in-memory swiped set is the duplicate
+        # check and the buffer writes the rows, so no flush can collide with them
+        swiped_seekers = get_swiped_set(db, principal.offerer_id)
+        for row in rows:
+            if swiped_seekers.add(row["seeker_profile_id"]):
+                swipe_buffer.enqueue(row)
+                created_ids.add(row["seeker_profile_id"])
+    elif rows:
+        # Rows that hit the unique index are skipped; RETURNING tells us which were inserted
+        insert_statement = dialect_insert(SwipeDecision).values(rows).on_conflict_do_nothing(
+            index_elements=["offerer_id", "seeker_profile_id"]
+        ).returning(SwipeDecision.seeker_profile_id)
+        created_ids = set(db.exec(insert_statement).scalars())
+        db.commit()
+        for seeker_profile_id in created_ids:
+            record_swipe(principal.offerer_id, seeker_profile_id)
+    
+    for result in results:
+        if result.status == "created" and result.seeker_profile_id not in created_ids:
+            result.status = "conflict"
+            result.detail = "Already swiped on this candidate"
+    
+    refill_needed = False
+    for seeker_profile_id in created_ids:
+        refill_needed = discard_from_feed_queue(principal.offerer_id, seeker_profile_id) or refill_needed
+    if refill_needed:
+        background_tasks.add_task(refill_feed_queue, principal.offerer_id)
+    
+    return BatchSwipeResponse(
+        results=results,
+        created=len(created_ids),
+        conflicts=sum(1 for result in results if result.status == "conflict")
+    )
+
+
 @router.get("/shortlist", response_model=ShortlistResponse)
 async def get_shortlist(
-    current_user: User = Depends(require_offerer),
+    background_tasks: BackgroundTasks,
+    cursor: Optional[str] = Query(None, description="Pagination cursor"),
+    limit: int = Query(50, ge=1, le=200, description="Number of candidates to return"),
+    principal: Principal = Depends(require_offerer),
     db: Session = Depends(get_session)
 ):
     """
-    T5.3 - Get all liked (shortlisted) candidates
+    T5.3 - Get liked (shortlisted) candidates, newest first, one page at a time
     """
-    # Get offerer profile
-    statement = select(Offerer).where(Offerer.email == current_user.email)
-    offerer = db.exec(statement).first()
-    
-    if not offerer:
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Offerer profile not found"
         )
     
-    # Get role config if set (for fit score calculation)
-    role_config = None
-    if offerer.role_config_id:
-        role_config = db.get(OffererRoleConfig, offerer.role_config_id)
-    
-    # Get all liked swipes
-    swipe_statement = select(SwipeDecision, SeekerProfile).join(
+    # Only the columns a shortlist card needs; fit score comes from the
+    # stored per-role scores for the offerer's current role (0 if unset)
+    swipe_statement = select(
+        SwipeDecision.id,
+        SwipeDecision.note,
+        SwipeDecision.swiped_at,
+        SeekerProfile.id,
+        SeekerProfile.headline,
+        SeekerProfile.location,
+        SeekerProfile.bio,
+        SeekerProfile.stats_card["stats"].label("stats"),
+        SeekerProfile.stats_card["scored_with"].label("scored_with"),
+        SeekerRoleScore.fit_score
+    ).join(
         SeekerProfile,
         SwipeDecision.seeker_profile_id == SeekerProfile.id
+    ).outerjoin(
+        SeekerRoleScore,
+        and_(
+            SeekerRoleScore.seeker_profile_id == SeekerProfile.id,
+            SeekerRoleScore.role_config_id == principal.role_config_id
+        )
     ).where(
         and_(
-            SwipeDecision.offerer_id == offerer.id,
+            SwipeDecision.offerer_id == principal.offerer_id,
             SwipeDecision.action == SwipeAction.LIKE
         )
-    ).order_by(SwipeDecision.swiped_at.desc())
+    )
     
-    results = db.exec(swipe_statement).all()
+    # Keyset position: strictly older than the last card, id breaks ties
+    if cursor:
+        swiped_at, swipe_id = decode_shortlist_cursor(cursor)
+        swipe_statement = swipe_statement.where(
+            or_(
+                SwipeDecision.swiped_at < swiped_at,
+                and_(
+                    SwipeDecision.swiped_at == swiped_at,
+                    SwipeDecision.id < swipe_id
+                )
+            )
+        )
+    
+    swipe_statement = swipe_statement.order_by(
+        SwipeDecision.swiped_at.desc(),
+        SwipeDecision.id.desc()
+    ).limit(limit + 1)
+    
+    rows = db.exec(swipe_statement).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    
+    # Recompute outdated cards for display; persist them after the response
+    read_at = datetime.utcnow()
+    stats_cards, stale_ids = refresh_stale_cards(db, {
+        row[3]: {"stats": row[7], "scored_with": row[8]} if row[7] is not None else None
+        for row in rows
+    })
+    role_config = None
+    if stale_ids:
+        background_tasks.add_task(
+            write_back_cards, {seeker_id: stats_cards[seeker_id] for seeker_id in stale_ids}, read_at
+        )
+        if principal.role_config_id:
+            role_config = principal.role_config or db.get(OffererRoleConfig, principal.role_config_id)
     
-    # Build candidate list
     candidates = []
-    for swipe, seeker in results:
-        # Compute fit score
-        fit_score = 0.0
-        if seeker.stats_card and "fit_scores" in seeker.stats_card and role_config:
-            fit_scores = seeker.stats_card.get("fit_scores", {})
-            fit_score = fit_scores.get(role_config.role_name, 0.0)
-        
+    for _, note, swiped_at, seeker_profile_id, headline, location, bio, _, _, fit_score in rows:
+        stats_card = stats_cards[seeker_profile_id] or {}
+        if seeker_profile_id in stale_ids and role_config:
+            fit_score = (stats_card.get("fit_scores") or {}).get(role_config.role_name, fit_score)
         candidates.append(ShortlistCandidate(
-            seeker_profile_id=seeker.id,
-            headline=seeker.headline,
-            location=seeker.location,
-            bio=seeker.bio,
-            stats=seeker.stats_card.get("stats", {}) if seeker.stats_card else {},
-            fit_score=fit_score,
-            note=swipe.note,
-            swiped_at=swipe.swiped_at
+            seeker_profile_id=seeker_profile_id,
+            headline=headline,
+            location=location,
+            bio=bio,
+            stats=stats_card.get("stats") or {},
+            fit_score=fit_score or 0.0,
+            note=note,
+            swiped_at=swiped_at
         ))
     
+    next_cursor = None
+    if has_more and rows:
+        last = rows[-1]
+        next_cursor = encode_shortlist_cursor(last[2], last[0])
+    
     return ShortlistResponse(
         candidates=candidates,
-        total=len(candidates)
+        total=len(candidates),
+        next_cursor=next_cursor,
+        has_more=has_more
+    )
+
+
+@router.get("/shortlist/export.csv")
+async def export_shortlist_csv(
+    principal: Principal = Depends(require_offerer),
+    db: Session = Depends(get_session)
+):
+    """
+    Export the full shortlist as CSV, one column per stats attribute
+    Rows are streamed as they are read, so memory stays flat for any shortlist size
+    """
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Offerer profile not found"
+        )
+    
+    attributes = [attr["id"] for attr in load_scoring_rules()["attributes"]]
+    
+    return StreamingResponse(
+        stream_shortlist_csv(principal.offerer_id, principal.role_config_id, attributes),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="shortlist.csv"'}
     )
 
 
+def csv_safe(value: str) -> str:
+    """Quote a user-supplied CSV cell so spreadsheets show it as text, never as a formula"""
+    return "'" + value if value.startswith(CSV_FORMULA_PREFIXES) else value
+
+
+def stream_shortlist_csv(
+    offerer_id: UUID,
+    role_config_id: Optional[UUID],
+    attributes: list[str]
+) -> Iterator[str]:
+    """
+    Generate shortlist CSV text in chunks of SHORTLIST_EXPORT_CHUNK_ROWS rows
+    
+    Uses its own session because the response body outlives the request's
+    session, and reads through a server-side cursor (yield_per).
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    # Header goes out before the query runs
+    writer.writerow([
+        "seeker_profile_id", "headline", "location", "fit_score",
+        "swiped_at", "note", *attributes
+    ])
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+    
+    statement = select(
+        SeekerProfile.id,
+        SeekerProfile.headline,
+        SeekerProfile.location,
+        SeekerRoleScore.fit_score,
+        SwipeDecision.swiped_at,
+        SwipeDecision.note,
+        SeekerProfile.stats_card["stats"].label("stats")
+    ).join(
+        SeekerProfile,
+        SwipeDecision.seeker_profile_id == SeekerProfile.id
+    ).outerjoin(
+        SeekerRoleScore,
+        and_(
+            SeekerRoleScore.seeker_profile_id == SeekerProfile.id,
+            SeekerRoleScore.role_config_id == role_config_id
+        )
+    ).where(
+        and_(
+            SwipeDecision.offerer_id == offerer_id,
+            SwipeDecision.action == SwipeAction.LIKE
+        )
+    ).order_by(
+        SwipeDecision.swiped_at.desc(),
+        SwipeDecision.id.desc()
+    ).execution_options(yield_per=SHORTLIST_EXPORT_CHUNK_ROWS)
+    
+    with Session(engine) as session:
+        pending = 0
+        for seeker_profile_id, headline, location, fit_score, swiped_at, note, stats in session.exec(statement):
+            stats = stats or {}
+            writer.writerow([
+                seeker_profile_id, csv_safe(headline or ""), csv_safe(location or ""),
+                fit_score if fit_score is not None else "",
+                swiped_at.isoformat(), csv_safe(note or ""),
+                *(
+                    csv_safe(value) if isinstance(value, str) else value
+                    for value in (stats.get(attr, "") for attr in attributes)
+                )
+            ])
+            pending += 1
+            if pending == SHORTLIST_EXPORT_CHUNK_ROWS:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+                pending = 0
+        if pending:
+            yield buffer.getvalue()
+
+
 @router.post("/shortlist/{seeker_profile_id}/note", response_model=NoteResponse)
 async def add_shortlist_note(
     seeker_profile_id: UUID,
     note_request: NoteRequest,
-    current_user: User = Depends(require_offerer),
+    principal: Principal = Depends(require_offerer),
     db: Session = Depends(get_session)
 ):
     """
     T5.3 - Add or update note for shortlisted candidate
     """
-    # Get offerer profile
-    statement = select(Offerer).where(Offerer.email == current_user.email)
-    offerer = db.exec(statement).first()
-    
-    if not offerer:
+    # Offerer profile from the cached principal
+    if principal.offerer_id is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Offerer profile not found"
@@ -386,7 +808,7 @@ async def add_shortlist_note(
     # Find the swipe decision
     swipe_statement = select(SwipeDecision).where(
         and_(
-            SwipeDecision.offerer_id == offerer.id,
+            SwipeDecision.offerer_id == principal.offerer_id,
             SwipeDecision.seeker_profile_id == seeker_profile_id,
             SwipeDecision.action == SwipeAction.LIKE
         )
@@ -1,13 +1,16 @@
 """
 Questionnaire routes for fetching questionnaires and submitting answers
 """
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+import copy
+from datetime import datetime
+from typing import List, NoReturn, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from sqlmodel import Session, delete, select, func, update
 from uuid import UUID
 
+from config import get_settings
 from database import get_session
-from models import Questionnaire, Question, Answer, User, SeekerProfile
+from models import Question, Answer, SeekerProfile
 from schemas.questionnaire import (
     QuestionnaireResponse,
     QuestionResponse,
@@ -15,40 +18,46 @@ from schemas.questionnaire import (
     AnswerSubmissionRequest,
     AnswerSubmissionResponse,
 )
-from auth import get_current_active_user
+from auth import get_current_principal
+from services.answer_storage import (
+    PackedAnswers, convert_to_packed, convert_to_rows, get_packed_layout, read_answers, upsert_answers
+)
+from services.http_cache import etag_response
+from services.principal_cache import Principal
+from services.reference_data import ReferenceData, get_reference_data
+from services.scoring import get_scoring_plan, store_stats
 
 
 router = APIRouter(prefix="/questionnaire", tags=["Questionnaire"])
+settings = get_settings()
 
 
 @router.get("", response_model=QuestionnaireResponse)
 async def get_questionnaire(
-    session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    if_none_match: Optional[str] = Header(None),
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Get the active questionnaire with all questions.
     Available to both seekers and offerers.
-    """
-    # Get the first active questionnaire (in production, you might have multiple)
-    statement = select(Questionnaire).where(Questionnaire.is_active == True).limit(1)
-    questionnaire = session.exec(statement).first()
     
-    if not questionnaire:
+    Served from the reference data cache with an ETag; a matching
+    If-None-Match gets 304 Not Modified.
+    """
+    reference_data = get_reference_data()
+    if reference_data.questionnaire is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="No active questionnaire found"
         )
     
-    # Get all questions for this questionnaire, ordered by order field
-    questions_statement = (
-        select(Question)
-        .where(Question.questionnaire_id == questionnaire.id)
-        .order_by(Question.order)
-    )
-    questions = session.exec(questions_statement).all()
-    
-    # Convert to response models
+    body, etag = reference_data.response("questionnaire", _questionnaire_response)
+    return etag_response(body, etag, if_none_match, "private, max-age=60")
+
+
+def _questionnaire_response(reference_data: ReferenceData) -> QuestionnaireResponse:
+    """Active questionnaire response, built once per reference data snapshot"""
+    questionnaire = reference_data.questionnaire
     question_responses = [
         QuestionResponse(
             id=q.id,
@@ -60,7 +69,7 @@ async def get_questionnaire(
             scoring_config=q.scoring_config,
             is_required=True  # Default to required
         )
-        for q in questions
+        for q in reference_data.questions
     ]
     
     return QuestionnaireResponse(
@@ -77,34 +86,44 @@ async def get_questionnaire(
 async def submit_answers(
     request: AnswerSubmissionRequest,
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Submit or update answers for the current user.
     Supports autosave - repeated submissions will upsert answers.
+    
+    Send base_version (the last answers_version received) with only the
+    changed answers: unchanged values are not written, and a stale
+    base_version gets 409 with the answers changed since then.
     Only available to seekers.
     """
     # Verify user is a seeker
-    if current_user.role.value != "seeker":
+    if principal.role.value != "seeker":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only seekers can submit questionnaire answers"
         )
     
-    # Get or create seeker profile
-    profile_statement = select(SeekerProfile).where(SeekerProfile.user_id == current_user.id)
+    # Get or create seeker profile, locked until commit: answers, counters and
+    # accumulators are read and updated from this row, so concurrent
+    # submissions from the same seeker run one after the other
+    profile_statement = (
+        select(SeekerProfile)
+        .where(SeekerProfile.user_id == principal.user_id)
+        .with_for_update()
+        .execution_options(populate_existing=True)
+    )
     seeker_profile = session.exec(profile_statement).first()
     
     if not seeker_profile:
         # Create profile if it doesn't exist
-        seeker_profile = SeekerProfile(user_id=current_user.id)
-        session.add(seeker_profile)
+        session.add(SeekerProfile(user_id=principal.user_id))
         session.commit()
-        session.refresh(seeker_profile)
+        seeker_profile = session.exec(profile_statement).first()
     
-    # Get the active questionnaire to count total questions
-    questionnaire_statement = select(Questionnaire).where(Questionnaire.is_active == True).limit(1)
-    questionnaire = session.exec(questionnaire_statement).first()
+    # The active questionnaire and its question ids come from the reference data cache
+    reference_data = get_reference_data()
+    questionnaire = reference_data.questionnaire
     
     if not questionnaire:
         raise HTTPException(
@@ -112,68 +131,204 @@ async def submit_answers(
             detail="No active questionnaire found"
         )
     
-    # Count total questions in questionnaire
-    total_questions_statement = select(Question).where(Question.questionnaire_id == questionnaire.id)
-    total_questions = len(session.exec(total_questions_statement).all())
-    
-    updated_count = 0
-    
-    # Process each answer submission
+    question_ids = {answer_submission.question_id for answer_submission in request.answers}
     for answer_submission in request.answers:
-        # Verify question exists and belongs to active questionnaire
-        question = session.get(Question, answer_submission.question_id)
-        if not question or question.questionnaire_id != questionnaire.id:
+        if answer_submission.question_id not in reference_data.question_ids:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Invalid question_id: {answer_submission.question_id}"
             )
-        
-        # Check if answer already exists (upsert logic)
-        existing_answer_statement = (
-            select(Answer)
-            .where(Answer.seeker_profile_id == seeker_profile.id)
-            .where(Answer.question_id == answer_submission.question_id)
+    
+    # Autosaves name the answers version they were based on; a stale one gets
+    # the answers changed since then back instead of overwriting them
+    if request.base_version is not None and request.base_version != seeker_profile.answers_version:
+        _raise_answers_conflict(session, seeker_profile, request.base_version)
+    
+    # Stats are kept current by applying each changed answer to the running
+    # accumulators (read under the profile lock); rebuild them from all
+    # answers if missing or out of date
+    plan = get_scoring_plan(session, questionnaire.id)
+    incremental = plan.accumulators_current(seeker_profile.attribute_accumulators)
+    accumulators = copy.deepcopy(seeker_profile.attribute_accumulators) if incremental else None
+    
+    # Bring the seeker's answers into the configured storage first
+    packed = settings.answer_storage == "packed"
+    if packed:
+        layout = get_packed_layout(session, questionnaire.id, questionnaire.version)
+        convert_to_packed(session, seeker_profile, layout)
+        packed_answers = PackedAnswers(layout, seeker_profile.packed_answers)
+    else:
+        convert_to_rows(session, seeker_profile)
+    
+    # Current values of the submitted questions, from rows and the packed column
+    current_values = dict(session.exec(
+        select(Answer.question_id, Answer.answer_value).where(
+            Answer.seeker_profile_id == seeker_profile.id,
+            Answer.question_id.in_(question_ids)
         )
-        existing_answer = session.exec(existing_answer_statement).first()
-        
-        if existing_answer:
-            # Update existing answer
-            existing_answer.answer_value = {"value": answer_submission.value}
-            session.add(existing_answer)
-        else:
-            # Create new answer
-            new_answer = Answer(
-                seeker_profile_id=seeker_profile.id,
-                question_id=answer_submission.question_id,
-                answer_value={"value": answer_submission.value}
-            )
-            session.add(new_answer)
-        
-        updated_count += 1
+    ).all()) if question_ids else {}
+    row_question_ids = set(current_values)
+    packed_question_ids = set()
+    if packed:
+        for question_id in question_ids:
+            packed_value = packed_answers.get(question_id)
+            if packed_value is not None:
+                current_values[question_id] = packed_value
+                packed_question_ids.add(question_id)
     
-    session.commit()
+    # Last submission wins when a question appears more than once; only
+    # answers that differ from what is stored are written
+    new_values = {
+        answer_submission.question_id: {"value": answer_submission.value}
+        for answer_submission in request.answers
+    }
+    changed_values = {
+        question_id: new_value for question_id, new_value in new_values.items()
+        if not (
+            (packed and packed_answers.holds(question_id, new_value))
+            or (question_id in row_question_ids and current_values[question_id] == new_value)
+        )
+    }
+    
+    if not changed_values and incremental:
+        # Nothing changed: answers, stats and counters are already current
+        response = _submission_response(seeker_profile, updated_answers=0)
+        session.commit()
+        return response
+    
+    if changed_values:
+        # Claim the next answers version; a submission that queued on the row
+        # lock from the same base version conflicts here
+        read_version = seeker_profile.answers_version
+        version_statement = update(SeekerProfile).where(SeekerProfile.id == seeker_profile.id)
+        if request.base_version is not None:
+            version_statement = version_statement.where(SeekerProfile.answers_version == request.base_version)
+        claimed = session.exec(
+            version_statement
+            .values(answers_version=SeekerProfile.answers_version + 1)
+            .returning(SeekerProfile.answers_version)
+        ).first()
+        if claimed is None:
+            session.rollback()
+            _raise_answers_conflict(session, seeker_profile, request.base_version)
+        # (the UPDATE has already synced answers_version in the session, so
+        # compare against the version read with the profile)
+        if claimed[0] != read_version + 1:
+            # Another submission landed after the profile was read (the lock
+            # is a no-op on SQLite): its deltas are not in our accumulators
+            incremental = False
+        seeker_profile.answers_version = claimed[0]
+        seeker_profile.answer_versions = {
+            **(seeker_profile.answer_versions or {}),
+            **{str(question_id): seeker_profile.answers_version for question_id in changed_values}
+        }
+    
+    if incremental:
+        for question_id, new_value in changed_values.items():
+            plan.update_accumulators(accumulators, question_id, current_values.get(question_id), new_value)
     
-    # Count how many questions have been answered
-    answered_statement = (
-        select(Answer)
-        .where(Answer.seeker_profile_id == seeker_profile.id)
-        .join(Question)
-        .where(Question.questionnaire_id == questionnaire.id)
+    if packed:
+        # Pack what fits; the rest (e.g. text answers) stays in answers rows
+        row_values = {
+            question_id: new_value for question_id, new_value in changed_values.items()
+            if not packed_answers.set(question_id, new_value)
+        }
+        moved_question_ids = [
+            question_id for question_id in changed_values
+            if question_id in row_question_ids and question_id not in row_values
+        ]
+        if moved_question_ids:
+            session.exec(delete(Answer).where(
+                Answer.seeker_profile_id == seeker_profile.id,
+                Answer.question_id.in_(moved_question_ids)
+            ))
+        seeker_profile.packed_answers = packed_answers.to_bytes()
+    else:
+        row_values = changed_values
+    
+    # Upsert every changed answers row in one statement
+    inserted_question_ids = upsert_answers(session, seeker_profile.id, row_values)
+    
+    # Questions answered for the first time: newly inserted rows that were not
+    # packed before, and newly packed answers that were not stored at all
+    first_answers = len(inserted_question_ids - packed_question_ids) + sum(
+        1 for question_id in changed_values
+        if question_id not in row_values and question_id not in current_values
     )
-    answered_questions = len(session.exec(answered_statement).all())
     
-    # Calculate completion percentage
-    completion_percent = (answered_questions / total_questions * 100) if total_questions > 0 else 0
+    # Progress counters follow the accumulators: bumped in SQL by first-time
+    # answers, recounted only when the accumulators are rebuilt (missing, a
+    # new questionnaire version, or a version claim that raced another write)
+    if incremental:
+        seeker_profile.answered_count = SeekerProfile.answered_count + first_answers
+    else:
+        seeker_profile.answered_count = session.exec(
+            select(func.count()).select_from(Answer).join(Question).where(
+                Answer.seeker_profile_id == seeker_profile.id,
+                Question.questionnaire_id == questionnaire.id
+            )
+        ).one() + (packed_answers.count() if packed else 0)
+    seeker_profile.question_count = plan.question_count
+    session.flush()
     
-    # Update questionnaire_completed flag if 100%
-    if completion_percent >= 100:
+    # Mark the questionnaire completed the first time it reaches 100%
+    response = _submission_response(seeker_profile, updated_answers=len(changed_values))
+    if response.completion_percent >= 100 and not seeker_profile.questionnaire_completed:
         seeker_profile.questionnaire_completed = True
-        session.add(seeker_profile)
-        session.commit()
+        seeker_profile.questionnaire_completed_at = datetime.utcnow()
+    
+    if not incremental:
+        if packed:
+            # Answers rows of a packed seeker never score
+            accumulators = plan.accumulate(packed_answers.items())
+        else:
+            answers_statement = select(Answer.question_id, Answer.answer_value).where(
+                Answer.seeker_profile_id == seeker_profile.id
+            )
+            accumulators = plan.accumulate(session.exec(answers_statement))
     
+    # Refresh the stats card and fit scores from the updated accumulators
+    seeker_profile.answers_updated_at = datetime.utcnow()
+    seeker_profile.attribute_accumulators = accumulators
+    store_stats(seeker_profile, plan.stats_from_accumulators(accumulators), session)
+    session.commit()
+    
+    return response
+
+
+def _submission_response(seeker_profile: SeekerProfile, updated_answers: int) -> AnswerSubmissionResponse:
+    """Progress after a submission, from the profile's maintained counters"""
+    total_questions = seeker_profile.question_count
+    answered_questions = seeker_profile.answered_count
+    completion_percent = (answered_questions / total_questions * 100) if total_questions > 0 else 0
     return AnswerSubmissionResponse(
         total_questions=total_questions,
         answered_questions=answered_questions,
         completion_percent=round(completion_percent, 2),
-        updated_answers=updated_count
+        updated_answers=updated_answers,
+        answers_version=seeker_profile.answers_version
+    )
+
+
+def _raise_answers_conflict(session: Session, seeker_profile: SeekerProfile, base_version: int) -> NoReturn:
+    """
+    409 listing the answers changed since base_version, so the client can
+    merge them and resubmit with the current answers_version
+    """
+    changed_question_ids = [
+        UUID(question_id) for question_id, version in (seeker_profile.answer_versions or {}).items()
+        if version > base_version
+    ]
+    current_values = read_answers(session, seeker_profile, changed_question_ids)
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "message": "Answers changed since base_version",
+            "answers_version": seeker_profile.answers_version,
+            "changes": [
+                {"question_id": str(question_id), "value": current_values[question_id].get("value")}
+                for question_id in changed_question_ids
+                if question_id in current_values
+            ]
+        }
     )
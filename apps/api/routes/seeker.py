@@ -1,16 +1,19 @@
 """
 Seeker routes for profile and stats
 """
+from datetime import datetime
 from typing import Dict, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Response, status
 from sqlmodel import Session, select
 from uuid import UUID
 
 from database import get_session
-from models import User, SeekerProfile
+from models import SeekerProfile
 from schemas.seeker import StatsResponse
-from auth import get_current_active_user
-from services.scoring import compute_stats, compute_all_fit_scores
+from auth import get_current_principal
+from services.http_cache import etag_response, strong_etag
+from services.principal_cache import Principal
+from services.stats_cards import refresh_stale_cards, write_back_cards
 
 
 router = APIRouter(prefix="/seeker", tags=["Seeker"])
@@ -18,9 +21,11 @@ router = APIRouter(prefix="/seeker", tags=["Seeker"])
 
 @router.get("/stats", response_model=StatsResponse)
 async def get_seeker_stats(
+    background_tasks: BackgroundTasks,
     include_fit_scores: bool = True,
+    if_none_match: Optional[str] = Header(None),
     session: Session = Depends(get_session),
-    current_user: User = Depends(get_current_active_user)
+    principal: Principal = Depends(get_current_principal)
 ):
     """
     Get computed stats for the current seeker.
@@ -29,41 +34,69 @@ async def get_seeker_stats(
         - Attribute scores (0-100) for all attributes
         - Optional: Fit scores for each role configuration
     
+    Serves the stored stats card with a strong ETag (304 on If-None-Match).
+    Outdated cards are recomputed in memory and stored in the background,
+    so the request itself never writes.
     Only available to seekers.
     """
     # Verify user is a seeker
-    if current_user.role.value != "seeker":
+    if principal.role.value != "seeker":
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only seekers can access stats"
         )
     
-    # Get seeker profile
-    profile_statement = select(SeekerProfile).where(SeekerProfile.user_id == current_user.id)
-    seeker_profile = session.exec(profile_statement).first()
+    # Read only what the response needs
+    profile_statement = select(
+        SeekerProfile.id,
+        SeekerProfile.stats_card,
+        SeekerProfile.stats_computed_at,
+        SeekerProfile.answers_updated_at,
+        SeekerProfile.questionnaire_completed,
+        SeekerProfile.answered_count,
+        SeekerProfile.question_count
+    ).where(SeekerProfile.user_id == principal.user_id)
+    profile = session.exec(profile_statement).first()
     
-    if not seeker_profile:
+    if not profile:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Seeker profile not found. Please complete the questionnaire first."
         )
     
-    # Compute attribute stats
-    stats = compute_stats(seeker_profile.id, session)
+    (
+        seeker_profile_id, stats_card, stats_computed_at, answers_updated_at,
+        questionnaire_completed, answered_count, question_count
+    ) = profile
     
-    # Optionally compute fit scores for all roles
-    fit_scores = None
-    if include_fit_scores:
-        fit_scores = compute_all_fit_scores(stats, session)
-    
-    # Update stats_card in profile for caching
-    seeker_profile.stats_card = stats
-    session.add(seeker_profile)
-    session.commit()
+    # Outdated cards (answers changed, or scored with old rules / role configs)
+    # are recomputed in memory and written back after the response
+    answers_changed = (
+        stats_computed_at is None
+        or (answers_updated_at is not None and answers_updated_at > stats_computed_at)
+    )
+    read_at = datetime.utcnow()
+    cards, stale = refresh_stale_cards(
+        session,
+        {seeker_profile_id: stats_card},
+        also_stale=[seeker_profile_id] if answers_changed else []
+    )
+    if stale:
+        stats_card = cards[seeker_profile_id] or {}
+        # Stamp the recomputed card with the answers it reflects, not the clock,
+        # so polls of the same state keep the same body and ETag until write-back lands
+        if answers_changed and answers_updated_at is not None:
+            stats_computed_at = answers_updated_at
+        background_tasks.add_task(write_back_cards, {seeker_profile_id: cards[seeker_profile_id]}, read_at)
     
-    return StatsResponse(
-        seeker_profile_id=seeker_profile.id,
-        stats=stats,
-        fit_scores=fit_scores,
-        questionnaire_completed=seeker_profile.questionnaire_completed
+    stats_response = StatsResponse(
+        seeker_profile_id=seeker_profile_id,
+        stats=stats_card.get("stats") or {},
+        fit_scores=(stats_card.get("fit_scores") or {}) if include_fit_scores else None,
+        questionnaire_completed=questionnaire_completed,
+        answered_questions=answered_count,
+        total_questions=question_count,
+        stats_computed_at=stats_computed_at
     )
+    body = stats_response.model_dump_json().encode("utf-8")
+    return etag_response(body, strong_etag(body), if_none_match, "private, no-cache")
@@ -1,7 +1,7 @@
 """
 Offerer endpoint schemas
 """
-from typing import Optional, List
+from typing import Optional, List, Dict
 from uuid import UUID
 from pydantic import BaseModel, Field
 from datetime import datetime
@@ -38,10 +38,25 @@ class CandidateCard(BaseModel):
 class FeedResponse(BaseModel):
     """Paginated feed of candidates"""
     candidates: List[CandidateCard]
-    next_cursor: Optional[str] = Field(None, description="Cursor for next page (seeker_profile_id)")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for next page")
     has_more: bool = Field(..., description="Whether there are more results")
 
 
+class RankRequest(BaseModel):
+    """Request to rank candidates with ad-hoc attribute weights"""
+    weights: Optional[Dict[str, float]] = Field(
+        None,
+        description="Attribute weights, e.g. {'technical_skills': 0.7}. Defaults to the selected role config"
+    )
+    limit: int = Field(10, ge=1, le=100, description="Number of candidates to return")
+
+
+class RankResponse(BaseModel):
+    """Top candidates for a weight vector"""
+    candidates: List[CandidateCard]
+    total_ranked: int = Field(..., description="Number of completed candidates considered")
+
+
 class SwipeRequest(BaseModel):
     """Request to swipe on a candidate"""
     seeker_profile_id: UUID
@@ -56,6 +71,26 @@ class SwipeResponse(BaseModel):
     decision: str
 
 
+class BatchSwipeRequest(BaseModel):
+    """Queued swipe decisions submitted together"""
+    decisions: List[SwipeRequest] = Field(..., min_length=1, max_length=500)
+
+
+class BatchSwipeItemResult(BaseModel):
+    """Outcome of one decision in a batch"""
+    seeker_profile_id: UUID
+    decision: str
+    status: str = Field(..., description="'created', 'conflict', 'not_found' or 'invalid'")
+    detail: Optional[str] = None
+
+
+class BatchSwipeResponse(BaseModel):
+    """Per-item results for a batch of swipes"""
+    results: List[BatchSwipeItemResult]
+    created: int
+    conflicts: int
+
+
 class ShortlistCandidate(BaseModel):
     """Candidate in shortlist with additional details"""
     seeker_profile_id: UUID
@@ -73,9 +108,11 @@ class ShortlistCandidate(BaseModel):
 
 
 class ShortlistResponse(BaseModel):
-    """List of shortlisted candidates"""
+    """Page of shortlisted candidates, newest first"""
     candidates: List[ShortlistCandidate]
-    total: int
+    total: int = Field(..., description="Number of candidates in this page")
+    next_cursor: Optional[str] = Field(None, description="Opaque cursor for next page")
+    has_more: bool = False
 
 
 class NoteRequest(BaseModel):
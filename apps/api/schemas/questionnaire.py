@@ -74,10 +74,13 @@ class AnswerSubmission(BaseModel):
 class AnswerSubmissionRequest(BaseModel):
     """Schema for submitting multiple answers at once"""
     answers: List[AnswerSubmission]
+    # answers_version the client's answers are based on; omit to skip the conflict check
+    base_version: Optional[int] = None
     
     class Config:
         json_schema_extra = {
             "example": {
+                "base_version": 7,
                 "answers": [
                     {"question_id": "123e4567-e89b-12d3-a456-426614174000", "value": 4},
                     {"question_id": "123e4567-e89b-12d3-a456-426614174001", "value": "Yes"}
@@ -91,7 +94,8 @@ class AnswerSubmissionResponse(BaseModel):
     total_questions: int
     answered_questions: int
     completion_percent: float
-    updated_answers: int
+    updated_answers: int  # Answers whose stored value changed
+    answers_version: int
     
     class Config:
         json_schema_extra = {
@@ -99,6 +103,7 @@ class AnswerSubmissionResponse(BaseModel):
                 "total_questions": 16,
                 "answered_questions": 8,
                 "completion_percent": 50.0,
-                "updated_answers": 2
+                "updated_answers": 2,
+                "answers_version": 8
             }
         }
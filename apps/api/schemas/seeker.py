@@ -1,6 +1,7 @@
 """
 Pydantic schemas for seeker endpoints
 """
+from datetime import datetime
 from pydantic import BaseModel
 from typing import Dict, Optional
 from uuid import UUID
@@ -12,6 +13,9 @@ class StatsResponse(BaseModel):
     stats: Dict[str, float]  # Attribute name -> score (0-100)
     fit_scores: Optional[Dict[str, float]] = None  # Role name -> fit score (0-100)
     questionnaire_completed: bool
+    answered_questions: int = 0
+    total_questions: int = 0
+    stats_computed_at: Optional[datetime] = None
     
     class Config:
         json_schema_extra = {
@@ -30,6 +34,9 @@ class StatsResponse(BaseModel):
                     "Sales Representative": 65.2,
                     "Team Lead": 73.8
                 },
-                "questionnaire_completed": True
+                "questionnaire_completed": True,
+                "answered_questions": 16,
+                "total_questions": 16,
+                "stats_computed_at": "2026-10-16T14:05:12.482913"
             }
         }
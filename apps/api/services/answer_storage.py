@@ -0,0 +1,321 @@
+"""
+Answer storage: one answers row per question, or packed per seeker
+
+With answer_storage="packed", a seeker's scale, yes/no and multiple choice
+answers live in SeekerProfile.packed_answers: one little-endian float64 slot
+per question, in question order. Scale slots hold the number itself, choice
+slots the position of the chosen option, unanswered slots NaN. Answers that
+fit no slot (text, non-numeric scale values, unknown choices) stay in the
+answers table; none of them can score, so scoring reads the packed column
+alone.
+
+Layouts are registered in packed_answer_layouts by a content hash, so blobs
+written before a questionnaire's questions changed remain readable.
+"""
+import hashlib
+import json
+import math
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+import numpy as np
+from sqlmodel import Session, delete, select
+
+from database import dialect_insert, engine
+from models import Answer, PackedAnswerLayout, Question, QuestionType, SeekerProfile
+
+
+PACKED_DTYPE = np.dtype("<f8")
+
+
+class PackedLayout:
+    """Slot layout of packed answers for one set of questions"""
+
+    def __init__(self, slots: List[Dict[str, Any]]):
+        self.slots = slots
+        self.key = hashlib.sha256(
+            json.dumps(slots, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        ).hexdigest()[:32]
+        self.question_ids = [UUID(slot["question_id"]) for slot in slots]
+        self.slot_index = {question_id: i for i, question_id in enumerate(self.question_ids)}
+        # Per slot: lowercased choice -> position, or None for numeric slots
+        self._choice_positions = [
+            {str(choice).lower(): i for i, choice in reversed(list(enumerate(slot["choices"])))}
+            if slot["choices"] is not None else None
+            for slot in slots
+        ]
+
+    def encode(self, question_id: UUID, answer_value: Any) -> Optional[float]:
+        """Slot value for an answer, or None if it does not fit the question's slot"""
+        slot = self.slot_index.get(question_id)
+        if slot is None:
+            return None
+        value = answer_value.get("value", answer_value) if isinstance(answer_value, dict) else answer_value
+
+        choice_positions = self._choice_positions[slot]
+        if choice_positions is None:
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                return None
+            try:
+                value = float(value)
+            except ValueError:
+                return None
+            return value if math.isfinite(value) else None
+
+        if isinstance(value, bool):
+            value = "yes" if value else "no"
+        if not isinstance(value, str):
+            return None
+        position = choice_positions.get(value.strip().lower())
+        return float(position) if position is not None else None
+
+    def decode(self, slot: int, code: float) -> Any:
+        """Answer value stored in a (non-NaN) slot"""
+        choices = self.slots[slot]["choices"]
+        if choices is None:
+            return int(code) if code.is_integer() else code
+        return choices[int(code)]
+
+    def unpack(self, blob: Optional[bytes]) -> np.ndarray:
+        """Writable slot array of a blob in this layout (all NaN for None)"""
+        if blob is None:
+            return np.full(len(self.slots), np.nan, dtype=PACKED_DTYPE)
+        return np.frombuffer(blob, dtype=PACKED_DTYPE).copy()
+
+
+def compile_packed_layout(questions: Iterable[Question]) -> PackedLayout:
+    """
+    Layout for a questionnaire's questions: one slot per scale, yes/no and
+    multiple choice question in display order. Choice slots list every option
+    of questions with scored options; plain yes/no questions use yes/no.
+    """
+    slots = []
+    for question in sorted(questions, key=lambda q: (q.order, str(q.id))):
+        if question.question_type == QuestionType.TEXT:
+            continue
+        options = question.options or {}
+        choices = [str(choice["value"]) for choice in options.get("choices", []) if "value" in choice]
+        if any("score" in choice for choice in options.get("choices", [])):
+            slot_choices = choices
+        elif question.question_type == QuestionType.YES_NO:
+            slot_choices = ["yes", "no"]
+        elif question.question_type == QuestionType.MULTIPLE_CHOICE:
+            if not choices:
+                continue
+            slot_choices = choices
+        else:
+            slot_choices = None
+        slots.append({"question_id": str(question.id), "choices": slot_choices})
+    return PackedLayout(slots)
+
+
+class PackedAnswers:
+    """A seeker's packed answers, loaded for reading or updating"""
+
+    def __init__(self, layout: PackedLayout, blob: Optional[bytes] = None):
+        self.layout = layout
+        self.values = layout.unpack(blob)
+
+    def get(self, question_id: UUID) -> Optional[Dict[str, Any]]:
+        """Stored answer value ({"value": ...}) or None if not packed"""
+        slot = self.layout.slot_index.get(question_id)
+        if slot is None or math.isnan(self.values[slot]):
+            return None
+        return {"value": self.layout.decode(slot, float(self.values[slot]))}
+
+    def set(self, question_id: UUID, answer_value: Any) -> bool:
+        """
+        Pack an answer; returns False if it does not fit a slot (it then
+        belongs in the answers table and the question's slot is cleared)
+        """
+        code = self.layout.encode(question_id, answer_value)
+        slot = self.layout.slot_index.get(question_id)
+        if slot is not None:
+            self.values[slot] = np.nan if code is None else code
+        return code is not None
+
+    def holds(self, question_id: UUID, answer_value: Any) -> bool:
+        """True if this exact answer is already packed"""
+        code = self.layout.encode(question_id, answer_value)
+        return code is not None and self.values[self.layout.slot_index[question_id]] == code
+
+    def items(self) -> List[Tuple[UUID, Dict[str, Any]]]:
+        """(question_id, answer_value) of every packed answer, in slot order"""
+        return [
+            (self.layout.question_ids[slot], {"value": self.layout.decode(slot, float(self.values[slot]))})
+            for slot in np.flatnonzero(~np.isnan(self.values)).tolist()
+        ]
+
+    def count(self) -> int:
+        return int(np.count_nonzero(~np.isnan(self.values)))
+
+    def to_bytes(self) -> bytes:
+        return self.values.astype(PACKED_DTYPE, copy=False).tobytes()
+
+
+_layouts: Dict[UUID, Tuple[int, PackedLayout]] = {}
+_layouts_by_key: Dict[str, PackedLayout] = {}
+_layouts_lock = threading.Lock()
+
+
+def get_packed_layout(session: Session, questionnaire_id: UUID, version: int) -> PackedLayout:
+    """
+    Current layout of a questionnaire version, compiled once per process and
+    registered in packed_answer_layouts before any blob uses it
+    """
+    cached = _layouts.get(questionnaire_id)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    questions = session.exec(
+        select(Question).where(Question.questionnaire_id == questionnaire_id)
+    ).all()
+    layout = compile_packed_layout(questions)
+
+    if layout.key not in _layouts_by_key:
+        # Own transaction: the registration must outlive a rolled back request
+        with Session(engine) as registry_session:
+            statement = dialect_insert(PackedAnswerLayout).values(
+                key=layout.key,
+                questionnaire_id=questionnaire_id,
+                slots=layout.slots,
+                created_at=datetime.utcnow()
+            ).on_conflict_do_nothing(index_elements=["key"])
+            registry_session.exec(statement)
+            registry_session.commit()
+
+    with _layouts_lock:
+        _layouts[questionnaire_id] = (version, layout)
+        _layouts_by_key[layout.key] = layout
+    return layout
+
+
+def load_packed_layouts(session: Session, keys: Iterable[str]) -> Dict[str, PackedLayout]:
+    """Registered layouts by key (cached; layouts never change once registered)"""
+    keys = set(keys)
+    missing = [key for key in keys if key not in _layouts_by_key]
+    if missing:
+        registered = session.exec(
+            select(PackedAnswerLayout.key, PackedAnswerLayout.slots).where(PackedAnswerLayout.key.in_(missing))
+        ).all()
+        with _layouts_lock:
+            for key, slots in registered:
+                _layouts_by_key[key] = PackedLayout(slots)
+    return {key: _layouts_by_key[key] for key in keys}
+
+
+def upsert_answers(session: Session, seeker_profile_id: UUID, answers: Dict[UUID, Dict[str, Any]]) -> Set[UUID]:
+    """
+    Insert or overwrite answers rows (question_id -> answer_value) in one
+    statement; returns the question ids whose rows were newly inserted
+    """
+    if not answers:
+        return set()
+    answered_at = datetime.utcnow()
+    row_ids = {question_id: uuid4() for question_id in answers}
+    statement = dialect_insert(Answer).values([
+        {
+            "id": row_ids[question_id],
+            "seeker_profile_id": seeker_profile_id,
+            "question_id": question_id,
+            "answer_value": answer_value,
+            "answered_at": answered_at
+        }
+        for question_id, answer_value in answers.items()
+    ])
+    statement = statement.on_conflict_do_update(
+        index_elements=["seeker_profile_id", "question_id"],
+        set_={"answer_value": statement.excluded.answer_value}
+    ).returning(Answer.question_id, Answer.id)
+    # Overwritten rows keep their existing id
+    return {
+        question_id for question_id, row_id in session.exec(statement)
+        if row_ids[question_id] == row_id
+    }
+
+
+def _stored_packed_answers(session: Session, seeker_profile: SeekerProfile) -> List[Tuple[UUID, Dict[str, Any]]]:
+    if seeker_profile.packed_layout is None:
+        return []
+    layout = load_packed_layouts(session, [seeker_profile.packed_layout])[seeker_profile.packed_layout]
+    return PackedAnswers(layout, seeker_profile.packed_answers).items()
+
+
+def convert_to_packed(session: Session, seeker_profile: SeekerProfile, layout: PackedLayout) -> None:
+    """
+    Move a seeker's answers into packed storage in `layout` (no-op if already
+    there). Repacks blobs of an older layout; answers that fit no slot,
+    including those to questions outside the layout, stay or become rows.
+    """
+    if seeker_profile.packed_layout == layout.key:
+        return
+    from_blob = dict(_stored_packed_answers(session, seeker_profile))
+    rows = dict(session.exec(
+        select(Answer.question_id, Answer.answer_value).where(Answer.seeker_profile_id == seeker_profile.id)
+    ).all())
+
+    packed = PackedAnswers(layout)
+    packed_ids = [question_id for question_id, answer_value in rows.items() if packed.set(question_id, answer_value)]
+    unpacked = {
+        question_id: answer_value for question_id, answer_value in from_blob.items()
+        if question_id not in rows and not packed.set(question_id, answer_value)
+    }
+
+    if packed_ids:
+        session.exec(delete(Answer).where(
+            Answer.seeker_profile_id == seeker_profile.id,
+            Answer.question_id.in_(packed_ids)
+        ))
+    upsert_answers(session, seeker_profile.id, unpacked)
+    seeker_profile.packed_answers = packed.to_bytes()
+    seeker_profile.packed_layout = layout.key
+
+
+def convert_to_rows(session: Session, seeker_profile: SeekerProfile) -> None:
+    """Move a seeker's packed answers back into answers rows (no-op if not packed)"""
+    if seeker_profile.packed_layout is None:
+        return
+    upsert_answers(session, seeker_profile.id, dict(_stored_packed_answers(session, seeker_profile)))
+    seeker_profile.packed_answers = None
+    seeker_profile.packed_layout = None
+
+
+def read_packed_answers(session: Session, seeker_profile_id: UUID) -> Optional[List[Tuple[UUID, Dict[str, Any]]]]:
+    """
+    A seeker's packed answers as (question_id, answer_value) pairs, or None if
+    the seeker's answers are stored as rows
+    """
+    row = session.exec(
+        select(SeekerProfile.packed_layout, SeekerProfile.packed_answers).where(SeekerProfile.id == seeker_profile_id)
+    ).first()
+    if row is None or row[0] is None:
+        return None
+    packed_layout, packed_answers = row
+    layout = load_packed_layouts(session, [packed_layout])[packed_layout]
+    return PackedAnswers(layout, packed_answers).items()
+
+
+def read_answers(
+    session: Session,
+    seeker_profile: SeekerProfile,
+    question_ids: Iterable[UUID]
+) -> Dict[UUID, Dict[str, Any]]:
+    """Current answer values of some of a seeker's questions, from rows and the packed column"""
+    question_ids = list(question_ids)
+    if not question_ids:
+        return {}
+    answers = dict(session.exec(
+        select(Answer.question_id, Answer.answer_value).where(
+            Answer.seeker_profile_id == seeker_profile.id,
+            Answer.question_id.in_(question_ids)
+        )
+    ).all())
+    wanted = set(question_ids)
+    answers.update(
+        (question_id, answer_value)
+        for question_id, answer_value in _stored_packed_answers(session, seeker_profile)
+        if question_id in wanted
+    )
+    return answers
@@ -0,0 +1,513 @@
+"""
+Vectorized batch scoring for re-scoring the whole seeker population
+"""
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlalchemy import exists, or_, update
+from sqlmodel import Session, select
+
+from models import Answer, SeekerProfile, OffererRoleConfig
+from services.answer_storage import PACKED_DTYPE, PackedLayout, load_packed_layouts
+from services.scoring import ScoringPlan, get_scoring_plan, scoring_stamp, upsert_role_scores
+
+
+class RescoreResult(NamedTuple):
+    """Totals of a batch rescoring run"""
+    seekers: int
+    answers: int
+    seconds: float
+    last_seeker_profile_id: Optional[UUID]
+
+
+def _round2(values: np.ndarray) -> np.ndarray:
+    """
+    Round to 2 decimals exactly like Python's round(); np.round scales by 100
+    first and can land on the other side of a .005 tie
+    """
+    rounded = np.round(values, 2)
+    ties = np.abs(values * 100 - np.floor(values * 100) - 0.5) < 1e-6
+    if ties.any():
+        rounded[ties] = [round(value, 2) for value in values[ties].tolist()]
+    return rounded
+
+
+class BatchScorer:
+    """
+    Scores many seekers at once from a compiled ScoringPlan.
+
+    Per-question settings become arrays indexed by question position, answer
+    rows become (seeker index, question index, value) arrays, and attribute
+    scores are grouped weighted means computed with np.bincount. Fit scores are
+    weighted column sums over all seekers at once, one pass per role.
+    Results match compute_stats / compute_fit_score.
+    """
+
+    def __init__(self, plan: ScoringPlan, role_configs: Sequence[OffererRoleConfig]):
+        self.plan = plan
+        self.attributes = plan.attributes
+        self.role_configs = list(role_configs)
+        self.stamp = scoring_stamp(plan.rules_hash, self.role_configs)
+
+        question_ids = list(plan.questions)
+        self._question_index = {question_id: i for i, question_id in enumerate(question_ids)}
+        questions = [plan.questions[question_id] for question_id in question_ids]
+        self._question_plans = questions
+        self._attribute = np.array([q.attribute_index for q in questions], dtype=np.int64)
+        self._weight = np.array([q.weight for q in questions], dtype=np.float64)
+        self._min = np.array([q.min_val for q in questions], dtype=np.float64)
+        self._span = np.array([q.max_val - q.min_val for q in questions], dtype=np.float64)
+        self._is_choice = np.array([q.choice_scores is not None for q in questions], dtype=bool)
+        self._packed: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+        # Per role, (attribute position, weight) in the role's own order and the
+        # total weight; like compute_fit_score only attributes in stats count.
+        # Columns are accumulated in that order so sums match it bit for bit.
+        attribute_index = {attr: i for i, attr in enumerate(self.attributes)}
+        self._role_terms: List[Tuple[List[Tuple[int, float]], float]] = []
+        for role_config in self.role_configs:
+            terms = [
+                (attribute_index[attr], weight)
+                for attr, weight in (role_config.weights or {}).items()
+                if attr in attribute_index
+            ]
+            self._role_terms.append((terms, sum(weight for _, weight in terms)))
+
+    def _raw_value(self, question_position: int, answer_value: Any) -> Optional[float]:
+        """Numeric value for a scale answer, or the normalized score for a choice answer"""
+        question = self._question_plans[question_position]
+        if question.choice_scores is not None:
+            return self.plan.question_score(question, answer_value)
+
+        value = answer_value.get("value", answer_value) if isinstance(answer_value, dict) else answer_value
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            return None
+
+    def score(
+        self,
+        rows: Sequence[Tuple[UUID, UUID, Any]]
+    ) -> Tuple[List[UUID], np.ndarray, np.ndarray]:
+        """
+        Score a chunk of (seeker_profile_id, question_id, answer_value) rows
+
+        Returns:
+            (seeker ids, stats matrix [seekers x attributes], fit matrix [seekers x roles]),
+            both rounded to 2 decimals like the per-seeker functions
+        """
+        seeker_ids: List[UUID] = []
+        seeker_index: Dict[UUID, int] = {}
+        seeker_column: List[int] = []
+        question_column: List[int] = []
+        value_column: List[float] = []
+
+        for seeker_profile_id, question_id, answer_value in rows:
+            position = seeker_index.get(seeker_profile_id)
+            if position is None:
+                position = seeker_index[seeker_profile_id] = len(seeker_ids)
+                seeker_ids.append(seeker_profile_id)
+            question_position = self._question_index.get(question_id)
+            if question_position is None:
+                continue
+            value = self._raw_value(question_position, answer_value)
+            if value is None:
+                continue
+            seeker_column.append(position)
+            question_column.append(question_position)
+            value_column.append(value)
+
+        seekers = np.array(seeker_column, dtype=np.int64)
+        questions = np.array(question_column, dtype=np.int64)
+        values = np.array(value_column, dtype=np.float64)
+
+        stats = self._reduce(len(seeker_ids), seekers, questions, self._normalize(questions, values))
+        return seeker_ids, stats, self.fit_scores(stats)
+
+    def score_packed(
+        self,
+        rows: Sequence[Tuple[UUID, str, bytes]],
+        layouts: Dict[str, PackedLayout]
+    ) -> Tuple[List[UUID], np.ndarray, np.ndarray]:
+        """
+        Score a chunk of (seeker_profile_id, packed_layout, packed_answers) rows
+        straight from the packed slots; same results as score() on the same
+        answers listed in slot order
+
+        Returns:
+            (seeker ids, stats matrix, fit matrix) as for score()
+        """
+        seeker_ids = [row[0] for row in rows]
+        by_layout: Dict[str, List[int]] = {}
+        for position, (_, layout_key, _) in enumerate(rows):
+            by_layout.setdefault(layout_key, []).append(position)
+
+        seeker_parts, question_parts, normalized_parts = [], [], []
+        for layout_key, positions in by_layout.items():
+            slots, questions, choice_table = self._packed_columns(layouts[layout_key])
+            if not len(slots):
+                continue
+            matrix = np.frombuffer(
+                b"".join(rows[position][2] for position in positions), dtype=PACKED_DTYPE
+            ).reshape(len(positions), -1)[:, slots]
+
+            # Choice slots hold option positions: look up their normalized scores
+            answered = ~np.isnan(matrix)
+            is_choice = self._is_choice[questions]
+            codes = np.where(answered & is_choice, matrix, 0).astype(np.int64)
+            values = np.where(is_choice, choice_table[np.arange(len(questions)), codes], matrix)
+            normalized = self._normalize(np.broadcast_to(questions, values.shape), values)
+
+            # Row-major nonzero keeps each seeker's answers in slot order
+            row_index, column = np.nonzero(answered & ~np.isnan(normalized))
+            seeker_parts.append(np.asarray(positions, dtype=np.int64)[row_index])
+            question_parts.append(questions[column])
+            normalized_parts.append(normalized[row_index, column])
+
+        if seeker_parts:
+            seekers = np.concatenate(seeker_parts)
+            questions = np.concatenate(question_parts)
+            normalized = np.concatenate(normalized_parts)
+        else:
+            seekers = questions = np.zeros(0, dtype=np.int64)
+            normalized = np.zeros(0, dtype=np.float64)
+
+        stats = self._reduce(len(seeker_ids), seekers, questions, normalized)
+        return seeker_ids, stats, self.fit_scores(stats)
+
+    def _packed_columns(self, layout: PackedLayout) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        For a packed layout: slots of scored questions, their question
+        positions, and per question the normalized score of each choice
+        """
+        cached = self._packed.get(layout.key)
+        if cached is not None:
+            return cached
+
+        slots, questions, choice_scores = [], [], []
+        for slot, question_id in enumerate(layout.question_ids):
+            question_position = self._question_index.get(question_id)
+            if question_position is None:
+                continue
+            question = self._question_plans[question_position]
+            choices = layout.slots[slot]["choices"]
+            # A slot of an older layout whose question changed kind cannot be read
+            if (choices is None) != (question.choice_scores is None):
+                continue
+            slots.append(slot)
+            questions.append(question_position)
+            choice_scores.append([
+                question.choice_scores.get(str(choice).lower(), np.nan) for choice in choices or []
+            ])
+
+        width = max((len(scores) for scores in choice_scores), default=0) or 1
+        choice_table = np.full((len(questions), width), np.nan, dtype=np.float64)
+        for row, scores in enumerate(choice_scores):
+            choice_table[row, :len(scores)] = scores
+
+        columns = (np.array(slots, dtype=np.int64), np.array(questions, dtype=np.int64), choice_table)
+        self._packed[layout.key] = columns
+        return columns
+
+    def _normalize(self, questions: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """normalize_score, vectorized; choice values are already normalized"""
+        span = self._span[questions]
+        scaled = np.divide(
+            values - self._min[questions], span,
+            out=np.zeros_like(values), where=span != 0
+        )
+        return np.where(self._is_choice[questions], values, np.clip(scaled * 100, 0, 100))
+
+    def _reduce(
+        self,
+        n_seekers: int,
+        seekers: np.ndarray,
+        questions: np.ndarray,
+        normalized: np.ndarray
+    ) -> np.ndarray:
+        """Stats matrix [seekers x attributes]: weighted mean of normalized scores per seeker and attribute"""
+        n_attributes = len(self.attributes)
+        weights = self._weight[questions]
+        groups = seekers * n_attributes + self._attribute[questions]
+        size = n_seekers * n_attributes
+        weighted_sums = np.bincount(groups, weights=normalized * weights, minlength=size)
+        total_weights = np.bincount(groups, weights=weights, minlength=size)
+        stats = np.divide(
+            weighted_sums, total_weights,
+            out=np.zeros(size, dtype=np.float64), where=total_weights != 0
+        ).reshape(n_seekers, n_attributes)
+        return _round2(stats)
+
+    def fit_scores(self, stats: np.ndarray) -> np.ndarray:
+        """Fit matrix [seekers x roles] for a stats matrix [seekers x attributes]"""
+        n_seekers = stats.shape[0]
+        fit_scores = np.zeros((n_seekers, len(self.role_configs)), dtype=np.float64)
+        for column, (terms, total_weight) in enumerate(self._role_terms):
+            if total_weight == 0:
+                continue
+            weighted_sum = np.zeros(n_seekers, dtype=np.float64)
+            for attribute_position, weight in terms:
+                weighted_sum += stats[:, attribute_position] * weight
+            fit_scores[:, column] = weighted_sum / total_weight
+        return _round2(fit_scores)
+
+    def stats_cards(
+        self,
+        seeker_ids: Sequence[UUID],
+        stats: np.ndarray,
+        fit_scores: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """Stats card dicts ({"stats": ..., "fit_scores": ..., "scored_with": ...}) in seeker order"""
+        role_names = [role_config.role_name for role_config in self.role_configs]
+        return [
+            {
+                "stats": dict(zip(self.attributes, stats[i].tolist())),
+                "fit_scores": dict(zip(role_names, fit_scores[i].tolist())),
+                "scored_with": self.stamp
+            }
+            for i in range(len(seeker_ids))
+        ]
+
+
+def write_scores(
+    session: Session,
+    scorer: BatchScorer,
+    seeker_ids: Sequence[UUID],
+    stats: np.ndarray,
+    fit_scores: np.ndarray
+) -> None:
+    """
+    Bulk-write stats cards and seeker_role_scores for one scored chunk
+    The caller is responsible for committing
+    """
+    if not seeker_ids:
+        return
+    computed_at = datetime.utcnow()
+
+    cards = scorer.stats_cards(seeker_ids, stats, fit_scores)
+    session.execute(
+        update(SeekerProfile),
+        [
+            {"id": seeker_profile_id, "stats_card": card, "stats_computed_at": computed_at}
+            for seeker_profile_id, card in zip(seeker_ids, cards)
+        ]
+    )
+
+    upsert_role_scores(session, [
+        {
+            "seeker_profile_id": seeker_profile_id,
+            "role_config_id": role_config.id,
+            "fit_score": float(fit_scores[i, column]),
+            "computed_at": computed_at
+        }
+        for i, seeker_profile_id in enumerate(seeker_ids)
+        for column, role_config in enumerate(scorer.role_configs)
+    ])
+
+
+def rescore_seekers(
+    session: Session,
+    start_after: Optional[UUID] = None,
+    end_at: Optional[UUID] = None,
+    chunk_seekers: int = 2000,
+    write: bool = True,
+    on_chunk: Optional[Callable[[UUID, int], None]] = None
+) -> RescoreResult:
+    """
+    Recompute stats and fit scores for every seeker with answers (rows or packed)
+
+    Seekers are processed in id order, `chunk_seekers` at a time: each chunk
+    reads its answers in one range query (packed seekers' packed columns in
+    another), is scored with BatchScorer and
+    written back in bulk, then committed. Running API processes are not
+    notified directly: their candidate store and rankings reload once their
+    change markers see the new scores (rescore.py bumps the seeker_scores
+    cache generation when a run ends).
+
+    on_chunk runs before each chunk's commit, so anything it writes through
+    the session (e.g. a checkpoint) commits atomically with the chunk.
+
+    Args:
+        session: Database session
+        start_after: Only seekers with an id greater than this
+        end_at: Only seekers with an id up to and including this
+        chunk_seekers: Seekers scored and committed per chunk
+        write: False to score without writing (throughput check)
+        on_chunk: Called for each chunk with (last seeker id, seekers so far)
+
+    Returns:
+        RescoreResult with totals for the run
+    """
+    started = time.perf_counter()
+    plan = get_scoring_plan(session)
+    if plan is None:
+        return RescoreResult(0, 0, 0.0, None)
+    scorer = BatchScorer(plan, session.exec(select(OffererRoleConfig)).all())
+
+    seekers_done = 0
+    answers_done = 0
+    last_seeker_id = start_after
+    while True:
+        # Next chunk of seeker ids (with answers rows or packed answers), then
+        # all of their answers as one range
+        ids_statement = select(SeekerProfile.id).where(or_(
+            SeekerProfile.packed_layout.is_not(None),
+            exists().where(Answer.seeker_profile_id == SeekerProfile.id)
+        ))
+        if last_seeker_id is not None:
+            ids_statement = ids_statement.where(SeekerProfile.id > last_seeker_id)
+        if end_at is not None:
+            ids_statement = ids_statement.where(SeekerProfile.id <= end_at)
+        chunk_ids = session.exec(
+            ids_statement.order_by(SeekerProfile.id).limit(chunk_seekers)
+        ).all()
+        if not chunk_ids:
+            break
+
+        answers_statement = select(
+            Answer.seeker_profile_id, Answer.question_id, Answer.answer_value
+        ).join(SeekerProfile, SeekerProfile.id == Answer.seeker_profile_id).where(
+            Answer.seeker_profile_id >= chunk_ids[0],
+            Answer.seeker_profile_id <= chunk_ids[-1],
+            SeekerProfile.packed_layout.is_(None)
+        ).order_by(Answer.seeker_profile_id)
+        rows = session.exec(answers_statement).all()
+        seeker_ids, stats, fit_scores = scorer.score(rows)
+        answers_done += len(rows)
+
+        # Packed seekers score from their packed column (their rows are text only)
+        packed_statement = select(
+            SeekerProfile.id, SeekerProfile.packed_layout, SeekerProfile.packed_answers
+        ).where(
+            SeekerProfile.id >= chunk_ids[0],
+            SeekerProfile.id <= chunk_ids[-1],
+            SeekerProfile.packed_layout.is_not(None)
+        ).order_by(SeekerProfile.id)
+        packed_rows = session.exec(packed_statement).all()
+        if packed_rows:
+            layouts = load_packed_layouts(session, {row[1] for row in packed_rows})
+            packed_ids, packed_stats, packed_fit_scores = scorer.score_packed(packed_rows, layouts)
+            seeker_ids = seeker_ids + packed_ids
+            stats = np.vstack([stats, packed_stats])
+            fit_scores = np.vstack([fit_scores, packed_fit_scores])
+            slots = np.frombuffer(b"".join(row[2] for row in packed_rows), dtype=PACKED_DTYPE)
+            answers_done += int(np.count_nonzero(~np.isnan(slots)))
+
+        last_seeker_id = chunk_ids[-1]
+        seekers_done += len(seeker_ids)
+
+        if write:
+            write_scores(session, scorer, seeker_ids, stats, fit_scores)
+        if on_chunk is not None:
+            on_chunk(last_seeker_id, seekers_done)
+        if write:
+            session.commit()
+
+    return RescoreResult(
+        seekers=seekers_done,
+        answers=answers_done,
+        seconds=time.perf_counter() - started,
+        last_seeker_profile_id=last_seeker_id
+    )
+
+
+def _with_role_fit(stats_card: Dict[str, Any], role_config: OffererRoleConfig, fit_score: float) -> Dict[str, Any]:
+    """Copy of a stats card with one role's fit score (and its stamp entry) replaced"""
+    card = {
+        **stats_card,
+        "fit_scores": {**(stats_card.get("fit_scores") or {}), role_config.role_name: fit_score}
+    }
+    scored_with = stats_card.get("scored_with")
+    if scored_with:
+        card["scored_with"] = {
+            **scored_with,
+            "roles": {**scored_with.get("roles", {}), str(role_config.id): role_config.generation}
+        }
+    return card
+
+
+def rescore_role(
+    session: Session,
+    role_config: OffererRoleConfig,
+    start_after: Optional[UUID] = None,
+    end_at: Optional[UUID] = None,
+    chunk_seekers: int = 2000,
+    write: bool = True,
+    on_chunk: Optional[Callable[[UUID, int], None]] = None
+) -> RescoreResult:
+    """
+    Recompute one role's fit scores from the stats already stored on each card
+
+    Used after a role's weights change: answers are not re-read and other
+    roles' scores are left untouched. Chunking, arguments and on_chunk behave
+    as in rescore_seekers.
+    """
+    started = time.perf_counter()
+    plan = get_scoring_plan(session)
+    if plan is None:
+        return RescoreResult(0, 0, 0.0, None)
+    scorer = BatchScorer(plan, [role_config])
+
+    seekers_done = 0
+    last_seeker_id = start_after
+    while True:
+        statement = select(SeekerProfile.id, SeekerProfile.stats_card).where(
+            SeekerProfile.stats_card.is_not(None)
+        )
+        if last_seeker_id is not None:
+            statement = statement.where(SeekerProfile.id > last_seeker_id)
+        if end_at is not None:
+            statement = statement.where(SeekerProfile.id <= end_at)
+        rows = session.exec(statement.order_by(SeekerProfile.id).limit(chunk_seekers)).all()
+        if not rows:
+            break
+
+        stats = np.array(
+            [
+                [(stats_card.get("stats") or {}).get(attr, 0.0) for attr in scorer.attributes]
+                for _, stats_card in rows
+            ],
+            dtype=np.float64
+        ).reshape(len(rows), len(scorer.attributes))
+        fit_scores = scorer.fit_scores(stats)[:, 0].tolist()
+        last_seeker_id = rows[-1][0]
+        seekers_done += len(rows)
+
+        if write:
+            computed_at = datetime.utcnow()
+            session.execute(
+                update(SeekerProfile),
+                [
+                    {
+                        "id": seeker_profile_id,
+                        "stats_card": _with_role_fit(stats_card, role_config, fit_score)
+                    }
+                    for (seeker_profile_id, stats_card), fit_score in zip(rows, fit_scores)
+                ]
+            )
+            upsert_role_scores(session, [
+                {
+                    "seeker_profile_id": seeker_profile_id,
+                    "role_config_id": role_config.id,
+                    "fit_score": fit_score,
+                    "computed_at": computed_at
+                }
+                for (seeker_profile_id, _), fit_score in zip(rows, fit_scores)
+            ])
+        if on_chunk is not None:
+            on_chunk(last_seeker_id, seekers_done)
+        if write:
+            session.commit()
+
+    return RescoreResult(
+        seekers=seekers_done,
+        answers=0,
+        seconds=time.perf_counter() - started,
+        last_seeker_profile_id=last_seeker_id
+    )
+
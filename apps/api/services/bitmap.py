@@ -0,0 +1,119 @@
+"""
+Compressed bitmap of non-negative integers (roaring-bitmap style)
+"""
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, Union
+
+
+# Containers switch from a sorted array to a dense bitmap past this many entries
+# (4096 x 2 bytes == 8 KB, the size of a dense 65536-bit container)
+ARRAY_CONTAINER_MAX = 4096
+BITMAP_CONTAINER_BYTES = 1 << 13
+
+Container = Union[array, bytearray]
+
+
+class OrdinalBitmap:
+    """
+    Set of integer ordinals split into 65536-wide chunks keyed by the high
+    16 bits. Sparse chunks store their low 16 bits in a sorted array('H');
+    dense chunks use a fixed 8 KB bitmap. Memory stays around 2 bytes per
+    member for sparse sets and never exceeds 8 KB per chunk.
+    """
+
+    def __init__(self):
+        self._containers: Dict[int, Container] = {}
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, ordinal: int) -> bool:
+        container = self._containers.get(ordinal >> 16)
+        if container is None:
+            return False
+        low = ordinal & 0xFFFF
+        if isinstance(container, bytearray):
+            return bool(container[low >> 3] & (1 << (low & 7)))
+        index = bisect_left(container, low)
+        return index < len(container) and container[index] == low
+
+    def __iter__(self) -> Iterator[int]:
+        for high in sorted(self._containers):
+            container = self._containers[high]
+            base = high << 16
+            if isinstance(container, bytearray):
+                for byte_index, byte in enumerate(container):
+                    while byte:
+                        bit = (byte & -byte).bit_length() - 1
+                        yield base | (byte_index << 3) | bit
+                        byte &= byte - 1
+            else:
+                for low in container:
+                    yield base | low
+
+    def add(self, ordinal: int) -> bool:
+        """Add an ordinal; returns True if it was not already present"""
+        if ordinal < 0:
+            raise ValueError("Ordinals must be non-negative")
+
+        high, low = ordinal >> 16, ordinal & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            container = array("H")
+            self._containers[high] = container
+
+        if isinstance(container, bytearray):
+            mask = 1 << (low & 7)
+            if container[low >> 3] & mask:
+                return False
+            container[low >> 3] |= mask
+        else:
+            index = bisect_left(container, low)
+            if index < len(container) and container[index] == low:
+                return False
+            container.insert(index, low)
+            if len(container) > ARRAY_CONTAINER_MAX:
+                self._containers[high] = self._to_bitmap(container)
+
+        self._size += 1
+        return True
+
+    def discard(self, ordinal: int) -> bool:
+        """Remove an ordinal; returns True if it was present"""
+        high, low = ordinal >> 16, ordinal & 0xFFFF
+        container = self._containers.get(high)
+        if container is None:
+            return False
+
+        if isinstance(container, bytearray):
+            mask = 1 << (low & 7)
+            if not container[low >> 3] & mask:
+                return False
+            container[low >> 3] &= ~mask
+        else:
+            index = bisect_left(container, low)
+            if index == len(container) or container[index] != low:
+                return False
+            del container[index]
+            if not container:
+                del self._containers[high]
+
+        self._size -= 1
+        return True
+
+    @staticmethod
+    def _to_bitmap(container: array) -> bytearray:
+        bitmap = bytearray(BITMAP_CONTAINER_BYTES)
+        for low in container:
+            bitmap[low >> 3] |= 1 << (low & 7)
+        return bitmap
+
+    @property
+    def nbytes(self) -> int:
+        """Approximate payload size of all containers in bytes"""
+        return sum(
+            len(container) if isinstance(container, bytearray) else container.itemsize * len(container)
+            for container in self._containers.values()
+        )
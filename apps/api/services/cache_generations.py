@@ -0,0 +1,33 @@
+"""
+Generation counters telling in-process caches to reload after bulk writes
+
+Caches of seeker scores notice ordinary writes through their own change
+markers. Bulk writers outside the API bump a generation as well, so a run
+whose parallel commits landed out of timestamp order is still picked up.
+"""
+from datetime import datetime
+
+from sqlmodel import Session, select
+
+from database import dialect_insert
+from models import CacheGeneration
+
+
+# Stats cards and seeker_role_scores (candidate store, role rankings)
+SEEKER_SCORES = "seeker_scores"
+
+
+def cache_generation(name: str):
+    """Scalar subquery of a generation (NULL until first bumped), for marker queries"""
+    return select(CacheGeneration.generation).where(CacheGeneration.name == name).scalar_subquery()
+
+
+def bump_cache_generation(session: Session, name: str) -> None:
+    """Increment a generation; the caller is responsible for committing"""
+    now = datetime.utcnow()
+    statement = dialect_insert(CacheGeneration).values(name=name, generation=1, updated_at=now)
+    statement = statement.on_conflict_do_update(
+        index_elements=["name"],
+        set_={"generation": CacheGeneration.generation + 1, "updated_at": now}
+    )
+    session.exec(statement)
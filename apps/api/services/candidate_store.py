@@ -0,0 +1,272 @@
+"""
+In-process columnar candidate store for vectorized fit scoring
+
+The store follows stats stored in this process as they commit. Stats written
+elsewhere (other workers, the rescore CLI, seed scripts) are picked up by a
+marker check at most every feed_cache_ttl_seconds: when the latest
+seeker_profiles.stats_computed_at moved, only the profiles computed since the
+last check are read and upserted. A seeker_scores cache generation bump
+(bulk rewrites) reloads the whole store.
+"""
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence, Set, Tuple, Union
+from uuid import UUID
+
+import numpy as np
+from sqlmodel import Session, func, select
+
+from config import get_settings
+from models import SeekerProfile
+from services.cache_generations import SEEKER_SCORES, cache_generation
+from services.role_rankings import LATE_COMMIT_SECONDS
+from services.scoring import load_scoring_rules, on_stats_stored
+from services.swipe_index import SwipedSet
+
+
+settings = get_settings()
+
+
+class CandidateStore:
+    """
+    Attribute stats of every completed seeker as a float32 matrix
+    (seekers x attributes) next to a parallel array of seeker ids.
+
+    Ranking for any weight vector is one matrix-vector product plus
+    argpartition. Rows are kept dense: removing a seeker moves the last
+    row into its slot, so the live rows are always matrix[:size].
+    """
+
+    def __init__(self, attributes: Sequence[str], capacity: int = 1024):
+        self.attributes = list(attributes)
+        self._attribute_index = {attr: i for i, attr in enumerate(self.attributes)}
+        self._matrix = np.zeros((capacity, len(self.attributes)), dtype=np.float32)
+        self._ids = np.empty(capacity, dtype=object)
+        self._rows: Dict[UUID, int] = {}
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, seeker_profile_id: UUID) -> bool:
+        return seeker_profile_id in self._rows
+
+    def _grow(self, min_capacity: int) -> None:
+        capacity = max(min_capacity, 2 * len(self._ids))
+        matrix = np.zeros((capacity, len(self.attributes)), dtype=np.float32)
+        matrix[:self._size] = self._matrix[:self._size]
+        ids = np.empty(capacity, dtype=object)
+        ids[:self._size] = self._ids[:self._size]
+        self._matrix, self._ids = matrix, ids
+
+    def _stats_vector(self, stats: Dict[str, float]) -> np.ndarray:
+        return np.array(
+            [stats.get(attr, 0.0) for attr in self.attributes],
+            dtype=np.float32
+        )
+
+    def upsert(self, seeker_profile_id: UUID, stats: Dict[str, float]) -> None:
+        """Insert or replace a seeker's stats row"""
+        vector = self._stats_vector(stats)
+        with self._lock:
+            row = self._rows.get(seeker_profile_id)
+            if row is None:
+                if self._size == len(self._ids):
+                    self._grow(self._size + 1)
+                row = self._size
+                self._size += 1
+                self._rows[seeker_profile_id] = row
+                self._ids[row] = seeker_profile_id
+            self._matrix[row] = vector
+
+    def remove(self, seeker_profile_id: UUID) -> None:
+        """Drop a seeker's row (no-op if absent)"""
+        with self._lock:
+            row = self._rows.pop(seeker_profile_id, None)
+            if row is None:
+                return
+            last = self._size - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._ids[last] = None
+            self._size = last
+
+    def bulk_load(self, rows: Sequence[Tuple[UUID, Dict[str, float]]]) -> None:
+        """Replace the store contents in one pass"""
+        with self._lock:
+            capacity = max(len(rows), 1024)
+            self._matrix = np.zeros((capacity, len(self.attributes)), dtype=np.float32)
+            self._ids = np.empty(capacity, dtype=object)
+            self._rows = {}
+            for row, (seeker_profile_id, stats) in enumerate(rows):
+                self._matrix[row] = self._stats_vector(stats)
+                self._ids[row] = seeker_profile_id
+                self._rows[seeker_profile_id] = row
+            self._size = len(rows)
+
+    def weight_vector(self, weights: Dict[str, float]) -> np.ndarray:
+        """
+        Normalize role weights into a vector over the store's attributes
+        Unknown attributes are ignored, matching compute_fit_score
+        """
+        vector = np.zeros(len(self.attributes), dtype=np.float32)
+        for attr, weight in (weights or {}).items():
+            index = self._attribute_index.get(attr)
+            if index is not None:
+                vector[index] = weight
+        total = vector.sum()
+        if total == 0:
+            return vector
+        return vector / total
+
+    def scores(self, weights: Dict[str, float]) -> np.ndarray:
+        """Fit scores (0-100) for every live row, in row order"""
+        return self._matrix[:self._size] @ self.weight_vector(weights)
+
+    def rank(
+        self,
+        weights: Dict[str, float],
+        limit: int,
+        exclude: Optional[Union[Set[UUID], SwipedSet]] = None
+    ) -> Tuple[List[Tuple[UUID, float]], int]:
+        """
+        Top candidates for a weight vector
+
+        Args:
+            weights: Attribute -> weight mapping (role config or ad-hoc)
+            limit: Number of candidates to return
+            exclude: Seeker ids to skip (e.g. already swiped)
+
+        Returns:
+            ([(seeker_profile_id, fit_score)] sorted by fit score desc, total ranked)
+        """
+        with self._lock:
+            size = self._size
+            if size == 0 or limit <= 0:
+                return [], size
+
+            scores = self.scores(weights)
+            ids = self._ids[:size]
+
+            # Over-fetch by the exclusion size so filtering can't starve the page
+            k = min(size, limit + (len(exclude) if exclude else 0))
+            if k < size:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(size)
+            top = top[np.argsort(-scores[top], kind="stable")]
+
+            ranked = []
+            for row in top:
+                seeker_profile_id = ids[row]
+                if exclude and seeker_profile_id in exclude:
+                    continue
+                ranked.append((seeker_profile_id, round(float(scores[row]), 2)))
+                if len(ranked) == limit:
+                    break
+
+            return ranked, size
+
+
+_store: Optional[CandidateStore] = None
+_store_lock = threading.Lock()
+# Marker state: whether it was read yet, latest stats_computed_at and generation seen
+_stats_checked = False
+_stats_seen: Optional[datetime] = None
+_stats_generation: Optional[int] = None
+_stats_checked_at = 0.0
+
+
+def _stats_rows(session: Session, since: Optional[datetime] = None) -> List[Tuple[UUID, bool, Dict[str, float]]]:
+    """(seeker_profile_id, questionnaire_completed, stats) for profiles with a stats card"""
+    statement = select(
+        SeekerProfile.id,
+        SeekerProfile.questionnaire_completed,
+        SeekerProfile.stats_card
+    ).where(SeekerProfile.stats_card.is_not(None))
+    if since is None:
+        statement = statement.where(SeekerProfile.questionnaire_completed == True)
+    else:
+        statement = statement.where(
+            SeekerProfile.stats_computed_at > since - timedelta(seconds=LATE_COMMIT_SECONDS)
+        )
+    return [
+        (seeker_profile_id, questionnaire_completed, stats_card.get("stats") or {})
+        for seeker_profile_id, questionnaire_completed, stats_card in session.exec(statement)
+    ]
+
+
+def _load_store(session: Session) -> CandidateStore:
+    attributes = [attr["id"] for attr in load_scoring_rules()["attributes"]]
+    store = CandidateStore(attributes)
+    store.bulk_load([
+        (seeker_profile_id, stats)
+        for seeker_profile_id, _, stats in _stats_rows(session)
+    ])
+    return store
+
+
+def _check_stats_marker(session: Session) -> None:
+    """Apply stats cards written elsewhere since the last check"""
+    global _store, _stats_checked, _stats_seen, _stats_generation, _stats_checked_at
+    if time.monotonic() - _stats_checked_at < settings.feed_cache_ttl_seconds:
+        return
+    with _store_lock:
+        if time.monotonic() - _stats_checked_at < settings.feed_cache_ttl_seconds:
+            return
+        latest, generation = session.exec(select(
+            select(func.max(SeekerProfile.stats_computed_at)).scalar_subquery(),
+            cache_generation(SEEKER_SCORES)
+        )).one()
+        if _stats_checked and _store is not None:
+            if generation != _stats_generation:
+                # Bulk rewrite (e.g. rescore.py): reload the whole store
+                _store = _load_store(session)
+            elif latest is not None and (_stats_seen is None or latest > _stats_seen):
+                for seeker_profile_id, questionnaire_completed, stats in _stats_rows(session, _stats_seen):
+                    if questionnaire_completed:
+                        _store.upsert(seeker_profile_id, stats)
+                    else:
+                        _store.remove(seeker_profile_id)
+        _stats_checked = True
+        _stats_seen, _stats_generation = latest, generation
+        _stats_checked_at = time.monotonic()
+
+
+def get_candidate_store(session: Session) -> CandidateStore:
+    """
+    Get the process-wide candidate store, loading it from the database on
+    first use
+    """
+    global _store
+    _check_stats_marker(session)
+    store = _store
+    if store is not None:
+        return store
+
+    with _store_lock:
+        if _store is None:
+            _store = _load_store(session)
+
+    return _store
+
+
+@on_stats_stored
+def _refresh_candidate_store(
+    seeker_profile_id: UUID,
+    questionnaire_completed: bool,
+    stats: Dict[str, float],
+    role_scores: Dict[UUID, float]
+) -> None:
+    """Keep the loaded store in step with newly stored stats"""
+    if _store is None:
+        return
+    if questionnaire_completed:
+        _store.upsert(seeker_profile_id, stats)
+    else:
+        _store.remove(seeker_profile_id)
@@ -0,0 +1,188 @@
+"""
+Per-offerer precomputed feed queues
+"""
+import threading
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel import Session
+
+from config import get_settings
+from services.role_rankings import RoleRanking, get_role_ranking, on_ranking_changed
+from services.scoring import on_stats_stored
+from services.swipe_index import SwipedSet, get_swiped_set
+
+
+settings = get_settings()
+
+
+class FeedQueue:
+    """
+    The next ranked, not-yet-swiped candidates for one offerer, in feed order.
+
+    Built by walking the role's shared ranking and refilled from where the
+    last walk stopped, so serving the first feed page never re-reads the
+    offerer's swipe history. Swipes discard entries; refills top it back up.
+    """
+
+    def __init__(self, role_config_id: UUID, ranking: RoleRanking, swiped: SwipedSet):
+        self.role_config_id = role_config_id
+        self._ranking = ranking
+        # Walk positions are only meaningful within one load of the ranking
+        self.ranking_loads = ranking.loads
+        self._swiped = swiped
+        self._keys: List[Tuple[float, UUID]] = []  # (-fit_score, seeker_profile_id)
+        self._queued: Dict[UUID, float] = {}
+        self._walk_position: Optional[Tuple[float, UUID]] = None
+        self.exhausted = False
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _exclude(self, seeker_profile_id: UUID) -> bool:
+        return seeker_profile_id in self._swiped or seeker_profile_id in self._queued
+
+    def refill(self, target: int) -> None:
+        """Walk the shared ranking until the queue holds `target` candidates"""
+        with self._lock:
+            needed = target - len(self._keys)
+            if needed <= 0 or self.exhausted:
+                return
+            ranked, has_more = self._ranking.page(
+                needed,
+                after=self._walk_position,
+                exclude=self._exclude
+            )
+            for seeker_profile_id, fit_score in ranked:
+                self._keys.append((-fit_score, seeker_profile_id))
+                self._queued[seeker_profile_id] = fit_score
+            if ranked:
+                last_seeker_id, last_fit_score = ranked[-1]
+                self._walk_position = (last_fit_score, last_seeker_id)
+            self.exhausted = not has_more
+
+    def peek(self, limit: int) -> Tuple[List[Tuple[UUID, float]], bool]:
+        """
+        First `limit` queued candidates without removing them
+
+        Returns:
+            ([(seeker_profile_id, fit_score)], has_more)
+        """
+        if len(self._keys) < limit and not self.exhausted:
+            self.refill(max(limit, settings.feed_queue_size))
+        with self._lock:
+            page = [(seeker_profile_id, -neg_fit_score) for neg_fit_score, seeker_profile_id in self._keys[:limit]]
+            has_more = len(self._keys) > limit or not self.exhausted
+            return page, has_more
+
+    def discard(self, seeker_profile_id: UUID) -> None:
+        """Remove a candidate (e.g. just swiped); usually the head of the queue"""
+        with self._lock:
+            fit_score = self._queued.pop(seeker_profile_id, None)
+            if fit_score is None:
+                return
+            key = (-fit_score, seeker_profile_id)
+            index = bisect_left(self._keys, key)
+            if index < len(self._keys) and self._keys[index] == key:
+                del self._keys[index]
+
+    def reposition(self, seeker_profile_id: UUID, fit_score: Optional[float]) -> None:
+        """
+        Apply a rescored (or removed, if fit_score is None) candidate.
+        Candidates ranked before the walk position belong in the queue;
+        anything after it will be picked up by a later refill.
+        """
+        self.discard(seeker_profile_id)
+        if fit_score is None or seeker_profile_id in self._swiped:
+            return
+        with self._lock:
+            key = (-fit_score, seeker_profile_id)
+            # Once exhausted no refill will walk further, so queue everything
+            belongs = self.exhausted
+            if self._walk_position is not None:
+                walk_key = (-self._walk_position[0], self._walk_position[1])
+                belongs = belongs or key <= walk_key
+            if belongs:
+                insort(self._keys, key)
+                self._queued[seeker_profile_id] = fit_score
+
+    def needs_refill(self) -> bool:
+        return not self.exhausted and len(self._keys) < settings.feed_queue_low_watermark
+
+
+_queues: Dict[UUID, FeedQueue] = {}
+_queues_lock = threading.Lock()
+
+
+def get_feed_queue(session: Session, offerer_id: UUID, role_config_id: UUID) -> FeedQueue:
+    """
+    Get an offerer's feed queue, building it if missing, built for another
+    role or walking a ranking that has since been bulk reloaded
+    """
+    ranking = get_role_ranking(session, role_config_id)
+    queue = _queues.get(offerer_id)
+    if queue is not None and queue.role_config_id == role_config_id and queue.ranking_loads == ranking.loads:
+        return queue
+
+    swiped = get_swiped_set(session, offerer_id)
+    queue = FeedQueue(role_config_id, ranking, swiped)
+    queue.refill(settings.feed_queue_size)
+    with _queues_lock:
+        _queues[offerer_id] = queue
+    return queue
+
+
+def refill_feed_queue(offerer_id: UUID) -> None:
+    """Background task: top up an offerer's queue if it is running low"""
+    queue = _queues.get(offerer_id)
+    if queue is not None and queue.needs_refill():
+        queue.refill(settings.feed_queue_size)
+
+
+def discard_from_feed_queue(offerer_id: UUID, seeker_profile_id: UUID) -> bool:
+    """
+    Drop a swiped candidate from the offerer's queue
+
+    Returns:
+        True if the queue should be refilled
+    """
+    queue = _queues.get(offerer_id)
+    if queue is None:
+        return False
+    queue.discard(seeker_profile_id)
+    return queue.needs_refill()
+
+
+def invalidate_feed_queue(offerer_id: UUID) -> None:
+    """Forget an offerer's queue (e.g. after a role config change)"""
+    with _queues_lock:
+        _queues.pop(offerer_id, None)
+
+
+@on_stats_stored
+def _reposition_in_feed_queues(
+    seeker_profile_id: UUID,
+    questionnaire_completed: bool,
+    stats: Dict[str, float],
+    role_scores: Dict[UUID, float]
+) -> None:
+    """Keep queued candidates consistent with rescored seekers"""
+    for queue in list(_queues.values()):
+        if queue.role_config_id not in role_scores:
+            continue
+        fit_score = role_scores[queue.role_config_id] if questionnaire_completed else None
+        queue.reposition(seeker_profile_id, fit_score)
+
+
+@on_ranking_changed
+def _reposition_after_marker_check(
+    role_config_id: UUID,
+    seeker_profile_id: UUID,
+    fit_score: Optional[float]
+) -> None:
+    """Keep queued candidates consistent with scores written by other processes"""
+    for queue in list(_queues.values()):
+        if queue.role_config_id == role_config_id:
+            queue.reposition(seeker_profile_id, fit_score)
@@ -0,0 +1,33 @@
+"""
+HTTP conditional request helpers (ETag / If-None-Match)
+"""
+import hashlib
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def strong_etag(body: bytes) -> str:
+    """Strong ETag for an exact response body"""
+    return '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    True if an If-None-Match header matches the ETag
+    Uses the weak comparison RFC 9110 requires for If-None-Match
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in candidates)
+
+
+def etag_response(body: bytes, etag: str, if_none_match: Optional[str], cache_control: str) -> Response:
+    """JSON response with ETag and Cache-Control, or 304 if If-None-Match matches"""
+    headers = {"ETag": etag, "Cache-Control": cache_control}
+    if etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
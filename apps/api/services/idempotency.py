@@ -0,0 +1,196 @@
+"""
+Idempotency-Key support for retried POSTs
+
+A client that sends `Idempotency-Key: <unique value>` with a POST may retry it
+freely: the first response is kept in a bounded in-process LRU and replayed
+for the same key without running the handler again. Keys are scoped to the
+caller's Authorization header and the request path; reusing a key with a
+different body is rejected. Concurrent retries of a request still in flight
+wait for it and get its response.
+
+The store is per worker process, so a retry that lands on another worker
+runs the handler again (which then behaves as without a key).
+"""
+import asyncio
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from starlette.datastructures import Headers
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import get_settings
+
+
+settings = get_settings()
+
+MAX_KEY_LENGTH = 255
+
+
+class StoredResponse(NamedTuple):
+    """A completed response, kept for replay"""
+    fingerprint: str
+    status: int
+    headers: List[Tuple[bytes, bytes]]
+    body: bytes
+    expires_at: float
+
+
+class IdempotencyStore:
+    """LRU of responses by idempotency key with a TTL, plus the keys in flight"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._responses: "OrderedDict[str, StoredResponse]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Event] = {}
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        """Stored response for a key, or None if absent or expired"""
+        stored = self._responses.get(key)
+        if stored is None:
+            return None
+        if stored.expires_at <= time.monotonic():
+            del self._responses[key]
+            return None
+        self._responses.move_to_end(key)
+        return stored
+
+    def put(self, key: str, fingerprint: str, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+        """Keep a response, evicting the least recently used beyond max_entries"""
+        self._responses[key] = StoredResponse(
+            fingerprint, status, headers, body, time.monotonic() + self.ttl_seconds
+        )
+        self._responses.move_to_end(key)
+        while len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+
+    def in_flight(self, key: str) -> Optional[asyncio.Event]:
+        """Event set when the request running under a key finishes, or None"""
+        return self._in_flight.get(key)
+
+    def begin(self, key: str) -> asyncio.Event:
+        """Mark a key's request as running"""
+        event = self._in_flight[key] = asyncio.Event()
+        return event
+
+    def finish(self, key: str) -> None:
+        """Mark a key's request as finished, releasing any retries waiting on it"""
+        event = self._in_flight.pop(key, None)
+        if event is not None:
+            event.set()
+
+    def clear(self) -> None:
+        self._responses.clear()
+
+
+def _json_error(status: int, detail: str) -> Tuple[int, List[Tuple[bytes, bytes]], bytes]:
+    body = json.dumps({"detail": detail}).encode("utf-8")
+    return status, [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())], body
+
+
+async def _send_response(send: Send, status: int, headers: List[Tuple[bytes, bytes]], body: bytes) -> None:
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+class IdempotencyMiddleware:
+    """
+    ASGI middleware replaying stored responses for POSTs to `paths` that carry
+    an Idempotency-Key header. Responses with a 5xx status are not stored, so
+    those requests can be retried for real.
+    """
+
+    def __init__(self, app: ASGIApp, store: IdempotencyStore, paths: Iterable[str]):
+        self.app = app
+        self.store = store
+        self.paths = frozenset(paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] != "POST" or scope["path"] not in self.paths:
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        idempotency_key = headers.get("idempotency-key")
+        if idempotency_key is None:
+            await self.app(scope, receive, send)
+            return
+        if not idempotency_key or len(idempotency_key) > MAX_KEY_LENGTH:
+            await _send_response(send, *_json_error(400, f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters"))
+            return
+
+        # The body is needed for the fingerprint; the app gets it replayed below
+        chunks = []
+        while True:
+            message = await receive()
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                break
+        body = b"".join(chunks)
+
+        key = hashlib.sha256("\n".join([
+            headers.get("authorization", ""), scope["path"], idempotency_key
+        ]).encode("utf-8")).hexdigest()
+        fingerprint = hashlib.sha256(body).hexdigest()
+
+        # Replay a stored response, or wait for the same request in flight
+        while True:
+            stored = self.store.get(key)
+            if stored is not None:
+                if stored.fingerprint != fingerprint:
+                    await _send_response(send, *_json_error(
+                        422, "Idempotency-Key was already used with a different request body"
+                    ))
+                    return
+                await _send_response(
+                    send, stored.status, stored.headers + [(b"idempotent-replayed", b"true")], stored.body
+                )
+                return
+            in_flight = self.store.in_flight(key)
+            if in_flight is None:
+                break
+            await in_flight.wait()
+
+        self.store.begin(key)
+        body_sent = False
+
+        async def replay_receive() -> Message:
+            nonlocal body_sent
+            if not body_sent:
+                body_sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        response_start: Dict[str, Any] = {}
+        response_body = []
+
+        async def capture_send(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                # Copy before sending: outer middleware (e.g. CORS) may append
+                # headers to the same list, and replays run through it again
+                response_start["status"] = message["status"]
+                response_start["headers"] = list(message.get("headers", []))
+            elif message["type"] == "http.response.body":
+                response_body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_receive, capture_send)
+            status = response_start.get("status")
+            if status is not None and status < 500:
+                self.store.put(key, fingerprint, status, response_start["headers"], b"".join(response_body))
+        finally:
+            self.store.finish(key)
+
+
+# Shared by the POST routes clients retry after timeouts
+idempotency_store = IdempotencyStore(
+    max_entries=settings.idempotency_max_entries,
+    ttl_seconds=settings.idempotency_ttl_seconds
+)
@@ -0,0 +1,44 @@
+"""
+Opaque keyset cursors for paginated endpoints
+"""
+import base64
+import binascii
+import json
+from typing import Any, Dict
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded"""
+
+
+def encode_cursor(payload: Dict[str, Any]) -> str:
+    """
+    Encode a keyset position as an opaque, URL-safe cursor string
+
+    Args:
+        payload: JSON-serializable keyset values (UUIDs are stringified)
+
+    Returns:
+        Base64url string without padding
+    """
+    raw = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Dict[str, Any]:
+    """
+    Decode a cursor produced by encode_cursor
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError, binascii.Error) as e:
+        raise InvalidCursorError("Invalid cursor format") from e
+
+    if not isinstance(payload, dict):
+        raise InvalidCursorError("Invalid cursor format")
+
+    return payload
@@ -0,0 +1,77 @@
+"""
+Bounded worker pool for password hashing
+
+bcrypt takes a few hundred milliseconds per hash or verify at production
+cost. Run on the event loop, that stalls every other request on the worker
+during a login burst; the pool runs it on a few threads instead (bcrypt
+releases the GIL). At most max_pending calls are running or queued at once;
+beyond that, calls fail fast with HashingPoolFull instead of queueing
+without bound.
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, TypeVar
+
+from config import get_settings
+
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+
+class HashingPoolFull(Exception):
+    """Raised when max_pending hashing calls are already running or queued"""
+
+
+class HashingPool:
+    """Thread pool for CPU-bound password hashing, with a bounded queue"""
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._rejected = 0
+
+    async def run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run fn(*args) on the pool and wait for its result"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise HashingPoolFull()
+            self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, self._call, fn, args)
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _call(self, fn: Callable[..., T], args: tuple) -> T:
+        with self._lock:
+            self._running += 1
+        try:
+            return fn(*args)
+        finally:
+            with self._lock:
+                self._running -= 1
+
+    def stats(self) -> Dict[str, int]:
+        """Queue depth and load, for the health endpoint"""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self._running,
+                "queued": max(self._pending - self._running, 0),
+                "max_pending": self.max_pending,
+                "rejected": self._rejected,
+            }
+
+
+hashing_pool = HashingPool(
+    workers=settings.password_hash_workers,
+    max_pending=settings.password_hash_max_pending
+)
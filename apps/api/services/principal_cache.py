@@ -0,0 +1,148 @@
+"""
+Per-token cache of the authenticated principal
+
+Resolving a bearer token takes a JWT decode, the User row and, for offerers,
+the Offerer row. The result is kept as an immutable Principal keyed by the
+SHA-256 of the token for principal_cache_ttl_seconds (never past the token's
+own expiry), so authenticated requests cost a dict lookup.
+
+A user's entries are dropped once a change to their email, role or is_active
+commits (e.g. deactivation) and when an offerer changes their role config.
+The cache is per worker process: other workers pick such changes up within
+the TTL.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+from sqlalchemy import event, inspect
+from sqlmodel import Session
+
+from config import get_settings
+from models import OffererRoleConfig, User, UserRole
+from services.reference_data import get_reference_data
+
+
+settings = get_settings()
+
+
+class Principal(NamedTuple):
+    """Who a request is authenticated as"""
+    user_id: UUID
+    email: str
+    role: UserRole
+    # Offerers only
+    offerer_id: Optional[UUID] = None
+    role_config_id: Optional[UUID] = None
+
+    @property
+    def role_config(self) -> Optional[OffererRoleConfig]:
+        """Selected role config from the reference data cache, or None"""
+        if self.role_config_id is None:
+            return None
+        return get_reference_data().role_config(self.role_config_id)
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class PrincipalCache:
+    """LRU of principals by token hash with a TTL, indexed by user for invalidation"""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[Principal, float]]" = OrderedDict()
+        self._keys_by_user: Dict[UUID, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, token: str) -> Optional[Principal]:
+        """Cached principal for a token, or None if absent or expired"""
+        key = token_key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            principal, expires_at = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return principal
+
+    def put(self, token: str, principal: Principal, token_expires_at: Optional[float] = None) -> None:
+        """Cache a principal until the TTL or the token's expiry (epoch seconds), whichever is first"""
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        key = token_key(token)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (principal, expires_at)
+            self._keys_by_user.setdefault(principal.user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached principal of a user"""
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_keys = self._keys_by_user.get(entry[0].user_id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[entry[0].user_id]
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.principal_cache_max_entries,
+    ttl_seconds=settings.principal_cache_ttl_seconds
+)
+
+
+# User fields a Principal is built from (last_login and password changes keep it valid)
+PRINCIPAL_USER_FIELDS = ("email", "role", "is_active")
+
+
+# Users whose principal fields changed are invalidated once the change
+# commits, so a request racing the commit cannot re-cache the old state
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = {
+        obj.id for obj in session.dirty
+        if isinstance(obj, User) and any(
+            inspect(obj).attrs[name].history.has_changes() for name in PRINCIPAL_USER_FIELDS
+        )
+    }
+    changed.update(obj.id for obj in session.deleted if isinstance(obj, User))
+    if changed:
+        session.info.setdefault("principal_changed_users", set()).update(changed)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("principal_changed_users", ()):
+        principal_cache.invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("principal_changed_users", None)
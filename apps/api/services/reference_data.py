@@ -0,0 +1,122 @@
+"""
+In-process cache of reference data: the active questionnaire with its ordered
+questions and every role config
+
+Steady-state reads make no database round trip. A snapshot is revalidated at
+most every reference_data_ttl_seconds with one marker query (active
+questionnaire id and version, question count, role config count, latest
+updated_at and generation total) and reloaded only when the marker changed.
+invalidate_reference_data() forces the next read to reload.
+
+Cached objects are detached from any session and shared between requests:
+read them, never modify them.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Tuple
+from uuid import UUID
+
+from pydantic import BaseModel
+from sqlmodel import Session, func, select
+
+from config import get_settings
+from database import engine
+from models import OffererRoleConfig, Question, Questionnaire
+from services.http_cache import strong_etag
+
+
+settings = get_settings()
+
+
+class ReferenceData:
+    """One consistent snapshot of the reference data"""
+
+    def __init__(
+        self,
+        marker: Tuple[Any, ...],
+        questionnaire: Optional[Questionnaire],
+        questions: List[Question],
+        role_configs: List[OffererRoleConfig]
+    ):
+        self.marker = marker
+        self.checked_at = time.monotonic()
+        self.questionnaire = questionnaire
+        self.questions = questions
+        self.question_ids: FrozenSet[UUID] = frozenset(question.id for question in questions)
+        self.role_configs = role_configs
+        self.active_role_configs = [role_config for role_config in role_configs if role_config.is_active]
+        self._role_configs_by_id = {role_config.id: role_config for role_config in role_configs}
+        self._responses: Dict[str, Tuple[bytes, str]] = {}
+
+    def role_config(self, role_config_id: UUID) -> Optional[OffererRoleConfig]:
+        return self._role_configs_by_id.get(role_config_id)
+
+    def response(self, name: str, build: Callable[["ReferenceData"], BaseModel]) -> Tuple[bytes, str]:
+        """
+        Serialized JSON body and strong ETag of a response built from this
+        snapshot, built once per snapshot
+        """
+        cached = self._responses.get(name)
+        if cached is None:
+            body = build(self).model_dump_json().encode("utf-8")
+            cached = self._responses[name] = (body, strong_etag(body))
+        return cached
+
+
+def _marker_statement():
+    active_questionnaire_id = (
+        select(Questionnaire.id).where(Questionnaire.is_active == True).limit(1).scalar_subquery()
+    )
+    return select(
+        active_questionnaire_id,
+        select(Questionnaire.version).where(Questionnaire.id == active_questionnaire_id).scalar_subquery(),
+        select(func.count()).select_from(Question).where(
+            Question.questionnaire_id == active_questionnaire_id
+        ).scalar_subquery(),
+        select(func.count()).select_from(OffererRoleConfig).scalar_subquery(),
+        select(func.max(OffererRoleConfig.updated_at)).scalar_subquery(),
+        select(func.sum(OffererRoleConfig.generation)).scalar_subquery(),
+    )
+
+
+def _load(session: Session, marker: Tuple[Any, ...]) -> ReferenceData:
+    questionnaire = session.exec(
+        select(Questionnaire).where(Questionnaire.id == marker[0])
+    ).first() if marker[0] is not None else None
+    questions = session.exec(
+        select(Question).where(Question.questionnaire_id == questionnaire.id).order_by(Question.order)
+    ).all() if questionnaire is not None else []
+    role_configs = session.exec(select(OffererRoleConfig).order_by(OffererRoleConfig.role_name)).all()
+    session.expunge_all()
+    return ReferenceData(marker, questionnaire, list(questions), list(role_configs))
+
+
+_reference_data: Optional[ReferenceData] = None
+_reference_data_lock = threading.Lock()
+
+
+def get_reference_data() -> ReferenceData:
+    """Current reference data snapshot (revalidated once per TTL)"""
+    global _reference_data
+    reference_data = _reference_data
+    if reference_data is not None and time.monotonic() - reference_data.checked_at < settings.reference_data_ttl_seconds:
+        return reference_data
+
+    with _reference_data_lock:
+        reference_data = _reference_data
+        if reference_data is not None and time.monotonic() - reference_data.checked_at < settings.reference_data_ttl_seconds:
+            return reference_data
+        with Session(engine) as session:
+            marker = tuple(session.exec(_marker_statement()).one())
+            if reference_data is not None and marker == reference_data.marker:
+                reference_data.checked_at = time.monotonic()
+                return reference_data
+            _reference_data = _load(session, marker)
+        return _reference_data
+
+
+def invalidate_reference_data() -> None:
+    """Reload on the next read (call after changing questionnaires or role configs)"""
+    global _reference_data
+    with _reference_data_lock:
+        _reference_data = None
@@ -0,0 +1,252 @@
+"""
+Shared per-role ranked candidate lists for the offerer feed
+
+Rankings follow stats stored in this process as they commit. Scores written
+elsewhere (other workers, seed scripts) are picked up by a marker check at
+most every feed_cache_ttl_seconds: when the latest
+seeker_role_scores.computed_at moved, only the rows computed since the last
+check (minus LATE_COMMIT_SECONDS, for writes that committed late) are read
+and moved within the loaded rankings. Bulk writers (the rescore CLI) bump
+the seeker_scores cache generation instead, which reloads every loaded
+ranking in place.
+"""
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlmodel import Session, func, select
+
+from config import get_settings
+from models import SeekerProfile, SeekerRoleScore
+from services.cache_generations import SEEKER_SCORES, cache_generation
+from services.scoring import on_stats_stored
+
+
+settings = get_settings()
+
+
+# Sort key: (-fit_score, seeker_profile_id) so ascending order is the feed order
+RankKey = Tuple[float, UUID]
+
+# Rows computed this long before the last seen change are read again with the
+# next change, so a write that committed after a later one is still applied
+LATE_COMMIT_SECONDS = 10
+
+# Callbacks notified when a marker check moves a seeker within a loaded
+# ranking, with (role_config_id, seeker_profile_id, fit_score or None if removed)
+RankingListener = Callable[[UUID, UUID, Optional[float]], None]
+_ranking_listeners: List[RankingListener] = []
+
+
+def on_ranking_changed(listener: RankingListener) -> RankingListener:
+    """Register a callback for scores written elsewhere and applied to a ranking"""
+    _ranking_listeners.append(listener)
+    return listener
+
+
+class RoleRanking:
+    """
+    Completed candidates for one role config, sorted by
+    (fit_score DESC, seeker_profile_id ASC) - the same order as the
+    seeker_role_scores ranking index.
+
+    One instance is shared by every offerer on the role. Offerers page through
+    it from a keyset position and skip their own swiped candidates lazily, so a
+    page costs O(log n + page size + skipped) regardless of how many offerers
+    share the role. Inserts are a binary search plus a list insert.
+    """
+
+    def __init__(self):
+        self._keys: List[RankKey] = []
+        self._scores: Dict[UUID, float] = {}
+        # Number of bulk loads, so holders of walk positions can tell a reload
+        self.loads = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, seeker_profile_id: UUID) -> bool:
+        return seeker_profile_id in self._scores
+
+    def bulk_load(self, rows: List[Tuple[UUID, float]]) -> None:
+        """Replace the ranking with rows already in feed order"""
+        with self._lock:
+            self._keys = [(-fit_score, seeker_profile_id) for seeker_profile_id, fit_score in rows]
+            self._scores = dict(rows)
+            self.loads += 1
+
+    def _remove_locked(self, seeker_profile_id: UUID) -> None:
+        fit_score = self._scores.pop(seeker_profile_id, None)
+        if fit_score is None:
+            return
+        key = (-fit_score, seeker_profile_id)
+        index = bisect_left(self._keys, key)
+        if index < len(self._keys) and self._keys[index] == key:
+            del self._keys[index]
+
+    def upsert(self, seeker_profile_id: UUID, fit_score: float) -> None:
+        """Insert a seeker or move them to their new fit score position"""
+        with self._lock:
+            if self._scores.get(seeker_profile_id) == fit_score:
+                return
+            self._remove_locked(seeker_profile_id)
+            insort(self._keys, (-fit_score, seeker_profile_id))
+            self._scores[seeker_profile_id] = fit_score
+
+    def remove(self, seeker_profile_id: UUID) -> None:
+        """Drop a seeker from the ranking (no-op if absent)"""
+        with self._lock:
+            self._remove_locked(seeker_profile_id)
+
+    def page(
+        self,
+        limit: int,
+        after: Optional[Tuple[float, UUID]] = None,
+        exclude: Optional[Callable[[UUID], bool]] = None
+    ) -> Tuple[List[Tuple[UUID, float]], bool]:
+        """
+        Walk the ranking from a keyset position
+
+        Args:
+            limit: Number of candidates to return
+            after: (fit_score, seeker_profile_id) of the last candidate already seen
+            exclude: Predicate for candidates to skip (e.g. already swiped)
+
+        Returns:
+            ([(seeker_profile_id, fit_score)], has_more)
+        """
+        with self._lock:
+            start = 0
+            if after is not None:
+                start = bisect_right(self._keys, (-after[0], after[1]))
+
+            results = []
+            for index in range(start, len(self._keys)):
+                neg_fit_score, seeker_profile_id = self._keys[index]
+                if exclude and exclude(seeker_profile_id):
+                    continue
+                if len(results) == limit:
+                    return results, True
+                results.append((seeker_profile_id, -neg_fit_score))
+
+            return results, False
+
+
+_rankings: Dict[UUID, RoleRanking] = {}
+_rankings_lock = threading.Lock()
+# Marker state: whether it was read yet, latest computed_at and generation seen
+_scores_checked = False
+_scores_seen: Optional[datetime] = None
+_scores_generation: Optional[int] = None
+_scores_checked_at = 0.0
+
+
+def _ranked_rows(session: Session, role_config_id: UUID) -> List[Tuple[UUID, float]]:
+    """A role's completed candidates in feed order: one ordered scan of the ranking index"""
+    statement = select(
+        SeekerRoleScore.seeker_profile_id,
+        SeekerRoleScore.fit_score
+    ).join(
+        SeekerProfile,
+        SeekerProfile.id == SeekerRoleScore.seeker_profile_id
+    ).where(
+        SeekerRoleScore.role_config_id == role_config_id,
+        SeekerProfile.questionnaire_completed == True
+    ).order_by(
+        SeekerRoleScore.fit_score.desc(),
+        SeekerRoleScore.seeker_profile_id
+    )
+    return [tuple(row) for row in session.exec(statement)]
+
+
+def _apply_score_changes(session: Session, since: Optional[datetime]) -> None:
+    """Move seekers whose scores were computed after `since` within the loaded rankings"""
+    if not _rankings:
+        return
+    statement = select(
+        SeekerRoleScore.role_config_id,
+        SeekerRoleScore.seeker_profile_id,
+        SeekerRoleScore.fit_score,
+        SeekerProfile.questionnaire_completed
+    ).join(
+        SeekerProfile,
+        SeekerProfile.id == SeekerRoleScore.seeker_profile_id
+    ).where(
+        SeekerRoleScore.role_config_id.in_(list(_rankings))
+    )
+    if since is not None:
+        statement = statement.where(SeekerRoleScore.computed_at > since - timedelta(seconds=LATE_COMMIT_SECONDS))
+    for role_config_id, seeker_profile_id, fit_score, questionnaire_completed in session.exec(statement):
+        ranking = _rankings[role_config_id]
+        if questionnaire_completed:
+            ranking.upsert(seeker_profile_id, fit_score)
+        else:
+            ranking.remove(seeker_profile_id)
+        for listener in _ranking_listeners:
+            listener(role_config_id, seeker_profile_id, fit_score if questionnaire_completed else None)
+
+
+def _check_scores_marker(session: Session) -> None:
+    """Apply seeker_role_scores written elsewhere since the last check"""
+    global _scores_checked, _scores_seen, _scores_generation, _scores_checked_at
+    if time.monotonic() - _scores_checked_at < settings.feed_cache_ttl_seconds:
+        return
+    with _rankings_lock:
+        if time.monotonic() - _scores_checked_at < settings.feed_cache_ttl_seconds:
+            return
+        latest, generation = session.exec(select(
+            select(func.max(SeekerRoleScore.computed_at)).scalar_subquery(),
+            cache_generation(SEEKER_SCORES)
+        )).one()
+        if _scores_checked:
+            if generation != _scores_generation:
+                # Bulk rewrite (e.g. rescore.py): reload each loaded ranking in place
+                for role_config_id, ranking in _rankings.items():
+                    ranking.bulk_load(_ranked_rows(session, role_config_id))
+            elif latest is not None and (_scores_seen is None or latest > _scores_seen):
+                _apply_score_changes(session, _scores_seen)
+        _scores_checked = True
+        _scores_seen, _scores_generation = latest, generation
+        _scores_checked_at = time.monotonic()
+
+
+def get_role_ranking(session: Session, role_config_id: UUID) -> RoleRanking:
+    """
+    Get the shared ranking for a role config, loading it on first use
+    with one ordered scan of the seeker_role_scores ranking index
+    """
+    _check_scores_marker(session)
+    ranking = _rankings.get(role_config_id)
+    if ranking is not None:
+        return ranking
+
+    with _rankings_lock:
+        ranking = _rankings.get(role_config_id)
+        if ranking is None:
+            ranking = RoleRanking()
+            ranking.bulk_load(_ranked_rows(session, role_config_id))
+            _rankings[role_config_id] = ranking
+
+    return ranking
+
+
+@on_stats_stored
+def _refresh_role_rankings(
+    seeker_profile_id: UUID,
+    questionnaire_completed: bool,
+    stats: Dict[str, float],
+    role_scores: Dict[UUID, float]
+) -> None:
+    """Move the seeker within every loaded role ranking"""
+    for role_config_id, fit_score in role_scores.items():
+        ranking = _rankings.get(role_config_id)
+        if ranking is None:
+            continue
+        if questionnaire_completed:
+            ranking.upsert(seeker_profile_id, fit_score)
+        else:
+            ranking.remove(seeker_profile_id)
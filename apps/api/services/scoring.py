@@ -1,25 +1,95 @@
 """
 Scoring service for computing seeker stats and fit scores
 """
+import hashlib
 import json
+import threading
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, List, Any, NamedTuple, Optional, Tuple
 from uuid import UUID
+from sqlalchemy import event
 from sqlmodel import Session, select
 
-from models import Question, Answer, SeekerProfile, OffererRoleConfig
+from database import dialect_insert
+from models import (
+    Questionnaire, Question, QuestionType, Answer,
+    SeekerProfile, OffererRoleConfig, SeekerRoleScore
+)
+from services.answer_storage import read_packed_answers
+from services.reference_data import get_reference_data
 
 
-# Load scoring rules from shared package
-def load_scoring_rules() -> Dict[str, Any]:
-    """Load scoring rules from packages/shared/scoring-rules.json"""
-    rules_path = Path(__file__).parent.parent.parent.parent / "packages" / "shared" / "scoring-rules.json"
+# Callbacks notified once stats written by store_stats commit, with
+# (seeker_profile_id, questionnaire_completed, stats, fit scores by role id)
+# (in-process caches such as the candidate store subscribe here)
+StatsListener = Callable[[UUID, bool, Dict[str, float], Dict[UUID, float]], None]
+_stats_listeners: List[StatsListener] = []
+
+
+def on_stats_stored(listener: StatsListener) -> StatsListener:
+    """Register a callback run whenever stats persisted by store_stats commit"""
+    _stats_listeners.append(listener)
+    return listener
+
+
+# Stats stored in a transaction reach the listeners only if it commits, so a
+# rolled back request cannot leave in-process caches with unpersisted scores
+@event.listens_for(Session, "after_commit")
+def _notify_stats_listeners(session):
+    for stored in session.info.pop("stored_stats", ()):
+        for listener in _stats_listeners:
+            listener(*stored)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_stored_stats(session):
+    session.info.pop("stored_stats", None)
+
+
+# Scoring rules file, parsed once and re-read only when it changes on disk
+SCORING_RULES_PATH = Path(__file__).parent.parent.parent.parent / "packages" / "shared" / "scoring-rules.json"
+_rules_cache: Optional[Tuple[Tuple[int, int], Dict[str, Any], str]] = None
+_rules_lock = threading.Lock()
+
+
+def _read_scoring_rules() -> Tuple[Dict[str, Any], str]:
+    """
+    Parsed scoring rules and the SHA-256 of the file contents
+    Cached on the file's (mtime, size), so unchanged rules are never re-parsed
+    """
+    global _rules_cache
+    rules_path = SCORING_RULES_PATH
     
-    if not rules_path.exists():
+    try:
+        stat = rules_path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(f"Scoring rules not found at {rules_path}")
     
-    with open(rules_path, 'r') as f:
-        return json.load(f)
+    signature = (stat.st_mtime_ns, stat.st_size)
+    cached = _rules_cache
+    if cached is not None and cached[0] == signature:
+        return cached[1], cached[2]
+    
+    with _rules_lock:
+        raw = rules_path.read_bytes()
+        rules = json.loads(raw)
+        rules_hash = hashlib.sha256(raw).hexdigest()
+        _rules_cache = (signature, rules, rules_hash)
+    return rules, rules_hash
+
+
+def load_scoring_rules() -> Dict[str, Any]:
+    """
+    Load scoring rules from packages/shared/scoring-rules.json
+    The returned dict is shared; callers must not modify it
+    """
+    return _read_scoring_rules()[0]
+
+
+def scoring_rules_hash() -> str:
+    """SHA-256 of the current scoring rules file"""
+    return _read_scoring_rules()[1]
 
 
 def normalize_score(value: float, min_val: float = 0, max_val: float = 5) -> float:
@@ -115,6 +185,233 @@ def compute_attribute_score(
     return weighted_sum / total_weight
 
 
+class QuestionPlan(NamedTuple):
+    """How one question's answer turns into a 0-100 attribute contribution"""
+    attribute_index: int
+    weight: float
+    min_val: float
+    max_val: float
+    # Normalized (0-100) score per choice value, for choice-style questions
+    choice_scores: Optional[Dict[str, float]]
+
+
+class ScoringPlan:
+    """
+    Scoring rules and questions of one questionnaire version, compiled into
+    per-question lookups so a seeker is scored in a single pass over answers
+    """
+    
+    def __init__(
+        self,
+        questionnaire_id: UUID,
+        version: int,
+        rules_hash: str,
+        attributes: List[str],
+        questions: Dict[UUID, QuestionPlan],
+        question_count: int = 0
+    ):
+        self.questionnaire_id = questionnaire_id
+        self.version = version
+        self.rules_hash = rules_hash
+        self.attributes = attributes
+        self.questions = questions
+        # All questions of the version, including those that never score
+        self.question_count = question_count
+    
+    def question_score(self, question: QuestionPlan, answer_value: Any) -> Optional[float]:
+        """Normalized score of one answer, or None if it does not score"""
+        value = answer_value.get("value", answer_value) if isinstance(answer_value, dict) else answer_value
+        
+        if question.choice_scores is not None:
+            if isinstance(value, bool):
+                value = "yes" if value else "no"
+            if isinstance(value, str):
+                return question.choice_scores.get(value.strip().lower())
+            return None
+        
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return None
+        try:
+            value = float(value)
+        except ValueError:
+            return None
+        return normalize_score(value, question.min_val, question.max_val)
+    
+    @property
+    def key(self) -> str:
+        """Identifies the questionnaire version and rules this plan was compiled from"""
+        return f"{self.questionnaire_id}:{self.version}:{self.rules_hash}"
+    
+    def contribution(self, question_id: UUID, answer_value: Any) -> Optional[Tuple[str, float, float]]:
+        """(attribute, weighted score, weight) one answer adds, or None if it does not score"""
+        if answer_value is None:
+            return None
+        question = self.questions.get(question_id)
+        if question is None:
+            return None
+        normalized = self.question_score(question, answer_value)
+        if normalized is None:
+            return None
+        return self.attributes[question.attribute_index], normalized * question.weight, question.weight
+    
+    def accumulate(self, answers: Iterable[Tuple[UUID, Any]]) -> Dict[str, Any]:
+        """
+        Running per-attribute weighted sums and weight totals over all answers,
+        in the form stored on SeekerProfile.attribute_accumulators
+        """
+        accumulators = self.empty_accumulators()
+        for question_id, answer_value in answers:
+            self.update_accumulators(accumulators, question_id, None, answer_value)
+        return accumulators
+    
+    def empty_accumulators(self) -> Dict[str, Any]:
+        return {
+            "plan": self.key,
+            "sums": {attr: 0.0 for attr in self.attributes},
+            "weights": {attr: 0.0 for attr in self.attributes}
+        }
+    
+    def accumulators_current(self, accumulators: Optional[Dict[str, Any]]) -> bool:
+        """True if stored accumulators were built with this plan"""
+        return bool(accumulators) and accumulators.get("plan") == self.key
+    
+    def update_accumulators(
+        self,
+        accumulators: Dict[str, Any],
+        question_id: UUID,
+        old_value: Any,
+        new_value: Any
+    ) -> None:
+        """Apply one answer changing from old_value to new_value (None = unanswered), in place"""
+        sums, weights = accumulators["sums"], accumulators["weights"]
+        old = self.contribution(question_id, old_value)
+        if old is not None:
+            attribute, weighted, weight = old
+            sums[attribute] -= weighted
+            weights[attribute] -= weight
+            # Drop float residue once an attribute has no scored answers left
+            if abs(weights[attribute]) < 1e-9:
+                sums[attribute] = weights[attribute] = 0.0
+        new = self.contribution(question_id, new_value)
+        if new is not None:
+            attribute, weighted, weight = new
+            sums[attribute] += weighted
+            weights[attribute] += weight
+    
+    def stats_from_accumulators(self, accumulators: Dict[str, Any]) -> Dict[str, float]:
+        """Attribute stats (0-100) from accumulated sums and weights"""
+        sums, weights = accumulators["sums"], accumulators["weights"]
+        return {
+            attribute: round(sums[attribute] / weights[attribute], 2) if weights.get(attribute) else 0.0
+            for attribute in self.attributes
+        }
+    
+    def score(self, answers: Iterable[Tuple[UUID, Any]]) -> Dict[str, float]:
+        """
+        Attribute stats from (question_id, answer_value) pairs
+        
+        Returns:
+            Dictionary mapping attribute names to scores (0-100)
+        """
+        return self.stats_from_accumulators(self.accumulate(answers))
+
+
+def compile_scoring_plan(
+    questionnaire_id: UUID,
+    version: int,
+    questions: Iterable[Question],
+    rules: Dict[str, Any],
+    rules_hash: str
+) -> ScoringPlan:
+    """
+    Compile questions and scoring rules into a ScoringPlan
+    
+    Scale answers normalize against the question's min/max (default 0-5).
+    Multiple choice answers use options.choices[*].score on the rules'
+    normalization range (default 0-10); yes/no answers score yes=100, no=0
+    unless the question lists scored choices. Text answers never score.
+    """
+    attributes = [attr["id"] for attr in rules["attributes"]]
+    attribute_index = {attr: i for i, attr in enumerate(attributes)}
+    normalization = rules.get("scoring_rules", {}).get("normalization", {})
+    choice_min = normalization.get("min", 0)
+    choice_max = normalization.get("max", 10)
+    
+    questions = list(questions)
+    compiled = {}
+    for question in questions:
+        scoring_config = question.scoring_config or {}
+        index = attribute_index.get(scoring_config.get("attribute"))
+        if index is None or question.question_type == QuestionType.TEXT:
+            continue
+        
+        options = question.options or {}
+        choice_scores = None
+        choices = [c for c in options.get("choices", []) if "score" in c]
+        if choices:
+            choice_scores = {
+                str(choice["value"]).lower(): normalize_score(choice["score"], choice_min, choice_max)
+                for choice in choices
+            }
+        elif question.question_type == QuestionType.YES_NO:
+            choice_scores = {"yes": 100.0, "no": 0.0}
+        elif question.question_type == QuestionType.MULTIPLE_CHOICE:
+            continue
+        
+        compiled[question.id] = QuestionPlan(
+            attribute_index=index,
+            weight=scoring_config.get("weight", 1.0),
+            min_val=options.get("min", 0),
+            max_val=options.get("max", 5),
+            choice_scores=choice_scores
+        )
+    
+    return ScoringPlan(questionnaire_id, version, rules_hash, attributes, compiled, len(questions))
+
+
+_plans: Dict[UUID, ScoringPlan] = {}
+_plans_lock = threading.Lock()
+
+
+def get_scoring_plan(session: Session, questionnaire_id: Optional[UUID] = None) -> Optional[ScoringPlan]:
+    """
+    Compiled plan for a questionnaire (default: the active one), or None if
+    there is none. Cached per questionnaire and recompiled when its version
+    or the scoring rules file changes. The active questionnaire comes from
+    the reference data cache; others are looked up.
+    """
+    rules, rules_hash = _read_scoring_rules()
+    
+    reference_data = get_reference_data()
+    active = reference_data.questionnaire
+    if active is not None and questionnaire_id in (None, active.id):
+        questionnaire_id, version = active.id, active.version
+    elif questionnaire_id is None:
+        return None
+    else:
+        row = session.exec(
+            select(Questionnaire.id, Questionnaire.version).where(Questionnaire.id == questionnaire_id)
+        ).first()
+        if row is None:
+            return None
+        questionnaire_id, version = row
+    
+    plan = _plans.get(questionnaire_id)
+    if plan is not None and plan.version == version and plan.rules_hash == rules_hash:
+        return plan
+    
+    if active is not None and questionnaire_id == active.id:
+        questions = reference_data.questions
+    else:
+        questions = session.exec(
+            select(Question).where(Question.questionnaire_id == questionnaire_id)
+        ).all()
+    plan = compile_scoring_plan(questionnaire_id, version, questions, rules, rules_hash)
+    with _plans_lock:
+        _plans[questionnaire_id] = plan
+    return plan
+
+
 def compute_stats(
     seeker_profile_id: UUID,
     session: Session
@@ -129,31 +426,20 @@ def compute_stats(
     Returns:
         Dictionary mapping attribute names to scores (0-100)
     """
-    # Load scoring rules to get list of attributes
-    scoring_rules = load_scoring_rules()
-    attributes = [attr["id"] for attr in scoring_rules["attributes"]]  # Use 'id' not 'name'
-    
-    # Get all answers for this seeker
-    answers_statement = select(Answer).where(Answer.seeker_profile_id == seeker_profile_id)
-    answers = session.exec(answers_statement).all()
-    
-    if not answers:
-        # Return zeros if no answers
-        return {attr: 0.0 for attr in attributes}
+    plan = get_scoring_plan(session)
+    if plan is None:
+        # No active questionnaire: nothing can score
+        return {attr["id"]: 0.0 for attr in load_scoring_rules()["attributes"]}
     
-    # Get all questions to build lookup dict
-    question_ids = [answer.question_id for answer in answers]
-    questions_statement = select(Question).where(Question.id.in_(question_ids))
-    questions_list = session.exec(questions_statement).all()
-    questions_dict = {q.id: q for q in questions_list}
+    # Packed seekers score from their packed column alone (no JSON to decode)
+    packed_answers = read_packed_answers(session, seeker_profile_id)
+    if packed_answers is not None:
+        return plan.score(packed_answers)
     
-    # Compute score for each attribute
-    stats = {}
-    for attribute in attributes:
-        score = compute_attribute_score(answers, questions_dict, attribute)
-        stats[attribute] = round(score, 2)
-    
-    return stats
+    answers_statement = select(Answer.question_id, Answer.answer_value).where(
+        Answer.seeker_profile_id == seeker_profile_id
+    )
+    return plan.score(session.exec(answers_statement))
 
 
 def compute_fit_score(
@@ -203,13 +489,98 @@ def compute_all_fit_scores(
     Returns:
         Dictionary mapping role names to fit scores (0-100)
     """
-    # Get all role configs
-    role_configs_statement = select(OffererRoleConfig)
-    role_configs = session.exec(role_configs_statement).all()
+    fit_scores = {}
+    for role_config in get_reference_data().role_configs:
+        fit_score = compute_fit_score(stats, role_config)
+        fit_scores[role_config.role_name] = fit_score
+    
+    return fit_scores
+
+
+def scoring_stamp(rules_hash: str, role_configs: Iterable[OffererRoleConfig]) -> Dict[str, Any]:
+    """What a stats card is scored with: rules content hash and each role config's generation"""
+    return {
+        "rules": rules_hash,
+        "roles": {str(role_config.id): role_config.generation for role_config in role_configs}
+    }
+
+
+def current_scoring_stamp() -> Dict[str, Any]:
+    """Stamp a stats card computed right now would carry"""
+    return scoring_stamp(scoring_rules_hash(), get_reference_data().role_configs)
+
+
+def card_is_current(stats_card: Optional[Dict[str, Any]], stamp: Dict[str, Any]) -> bool:
+    """True if a stats card was scored with the given rules and role config generations"""
+    return bool(stats_card) and stats_card.get("scored_with") == stamp
+
+
+def upsert_role_scores(session: Session, rows: List[Dict[str, Any]]) -> None:
+    """Insert or overwrite seeker_role_scores rows in one executemany"""
+    if not rows:
+        return
+    statement = dialect_insert(SeekerRoleScore)
+    statement = statement.on_conflict_do_update(
+        index_elements=["seeker_profile_id", "role_config_id"],
+        set_={
+            "fit_score": statement.excluded.fit_score,
+            "computed_at": statement.excluded.computed_at
+        }
+    )
+    session.execute(statement, rows)
+
+
+def store_stats(
+    seeker_profile: SeekerProfile,
+    stats: Dict[str, float],
+    session: Session
+) -> Dict[str, float]:
+    """
+    Persist freshly computed stats and the fit scores derived from them
+    
+    Writes the stats card ({"stats": ..., "fit_scores": ..., "scored_with": ...})
+    and keeps seeker_role_scores in sync. The caller is responsible for committing;
+    stats listeners (in-process caches) are notified once the transaction commits.
+    
+    Args:
+        seeker_profile: Seeker profile the stats belong to
+        stats: Dictionary of attribute scores (0-100)
+        session: Database session
+    
+    Returns:
+        Dictionary mapping role names to fit scores (0-100)
+    """
+    role_configs = get_reference_data().role_configs
+    computed_at = datetime.utcnow()
     
     fit_scores = {}
+    fit_scores_by_role_id = {}
+    role_scores = []
     for role_config in role_configs:
         fit_score = compute_fit_score(stats, role_config)
         fit_scores[role_config.role_name] = fit_score
+        fit_scores_by_role_id[role_config.id] = fit_score
+        role_scores.append({
+            "seeker_profile_id": seeker_profile.id,
+            "role_config_id": role_config.id,
+            "fit_score": fit_score,
+            "computed_at": computed_at
+        })
+    
+    # Overwrite the materialized scores for this seeker; an upsert, so two
+    # concurrent store_stats for the same seeker cannot collide on the key
+    upsert_role_scores(session, role_scores)
+    
+    seeker_profile.stats_card = {
+        "stats": stats,
+        "fit_scores": fit_scores,
+        "scored_with": scoring_stamp(scoring_rules_hash(), role_configs)
+    }
+    seeker_profile.stats_computed_at = computed_at
+    session.add(seeker_profile)
+    
+    session.info.setdefault("stored_stats", []).append(
+        (seeker_profile.id, seeker_profile.questionnaire_completed, stats, fit_scores_by_role_id)
+    )
     
     return fit_scores
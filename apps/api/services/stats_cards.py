@@ -0,0 +1,125 @@
+"""
+Lazy refresh of stats cards scored with outdated rules or role configs
+"""
+import logging
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+from sqlmodel import Session, select
+
+from database import engine
+from models import Answer, OffererRoleConfig, SeekerProfile
+from services.answer_storage import load_packed_layouts
+from services.batch_scoring import BatchScorer
+from services.reference_data import get_reference_data
+from services.scoring import (
+    card_is_current, get_scoring_plan, scoring_rules_hash, scoring_stamp, store_stats
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+def recompute_cards(
+    session: Session,
+    seeker_profile_ids: List[UUID],
+    role_configs: Optional[List[OffererRoleConfig]] = None
+) -> Dict[UUID, Dict[str, Any]]:
+    """
+    Score seekers in memory from their answers (one query for packed seekers,
+    one for the rest). Nothing is written
+    """
+    plan = get_scoring_plan(session)
+    if plan is None or not seeker_profile_ids:
+        return {}
+    if role_configs is None:
+        role_configs = get_reference_data().role_configs
+    scorer = BatchScorer(plan, role_configs)
+
+    # Packed seekers score from their packed column, the rest from answers rows
+    packed_statement = select(
+        SeekerProfile.id, SeekerProfile.packed_layout, SeekerProfile.packed_answers
+    ).where(
+        SeekerProfile.id.in_(seeker_profile_ids),
+        SeekerProfile.packed_layout.is_not(None)
+    )
+    packed_rows = session.exec(packed_statement).all()
+    cards = {}
+    if packed_rows:
+        layouts = load_packed_layouts(session, {row[1] for row in packed_rows})
+        seeker_ids, stats, fit_scores = scorer.score_packed(packed_rows, layouts)
+        cards.update(zip(seeker_ids, scorer.stats_cards(seeker_ids, stats, fit_scores)))
+
+    row_seeker_ids = [seeker_profile_id for seeker_profile_id in seeker_profile_ids if seeker_profile_id not in cards]
+    if row_seeker_ids:
+        answers_statement = select(
+            Answer.seeker_profile_id, Answer.question_id, Answer.answer_value
+        ).where(Answer.seeker_profile_id.in_(row_seeker_ids))
+        seeker_ids, stats, fit_scores = scorer.score(session.exec(answers_statement).all())
+        cards.update(zip(seeker_ids, scorer.stats_cards(seeker_ids, stats, fit_scores)))
+
+    # Like compute_stats, seekers without answers score zero everywhere
+    unanswered = [seeker_profile_id for seeker_profile_id in seeker_profile_ids if seeker_profile_id not in cards]
+    if unanswered:
+        zeros = np.zeros((len(unanswered), len(scorer.attributes)), dtype=np.float64)
+        cards.update(zip(unanswered, scorer.stats_cards(unanswered, zeros, scorer.fit_scores(zeros))))
+    return cards
+
+
+def refresh_stale_cards(
+    session: Session,
+    cards: Dict[UUID, Optional[Dict[str, Any]]],
+    also_stale: Iterable[UUID] = ()
+) -> Tuple[Dict[UUID, Optional[Dict[str, Any]]], List[UUID]]:
+    """
+    Replace outdated stats cards with freshly computed ones
+
+    A card is stale when its "scored_with" stamp does not match the current
+    rules hash and role config generations (or is listed in also_stale).
+
+    Args:
+        session: Database session
+        cards: Seeker profile id -> stored stats card (may be None)
+        also_stale: Ids to recompute regardless of their stamp
+
+    Returns:
+        (cards with stale ones recomputed, ids that were stale) - pass the
+        recomputed cards to write_back_cards to persist them
+    """
+    role_configs = get_reference_data().role_configs
+    stamp = scoring_stamp(scoring_rules_hash(), role_configs)
+    forced = set(also_stale)
+    stale = [
+        seeker_profile_id for seeker_profile_id, card in cards.items()
+        if seeker_profile_id in forced or not card_is_current(card, stamp)
+    ]
+    if not stale:
+        return cards, []
+
+    return {**cards, **recompute_cards(session, stale, role_configs)}, stale
+
+
+def write_back_cards(cards: Dict[UUID, Optional[Dict[str, Any]]], read_at: datetime) -> None:
+    """
+    Background task: store stats cards recomputed by refresh_stale_cards
+    Runs in its own session after the response is sent; goes through
+    store_stats so seeker_role_scores and in-process rankings follow.
+    Seekers whose answers changed after read_at (or that could not be
+    recomputed) are skipped; their next read recomputes the card
+    """
+    try:
+        with Session(engine) as session:
+            statement = select(SeekerProfile).where(SeekerProfile.id.in_(list(cards)))
+            for seeker_profile in session.exec(statement).all():
+                card = cards[seeker_profile.id]
+                if card is None:
+                    continue
+                if seeker_profile.answers_updated_at is not None and seeker_profile.answers_updated_at > read_at:
+                    continue
+                store_stats(seeker_profile, card.get("stats") or {}, session)
+            session.commit()
+    except Exception:
+        # The card stays stale and is retried on its next read
+        logger.exception("Stats card write-back failed for %d seekers", len(cards))
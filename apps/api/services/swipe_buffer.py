@@ -0,0 +1,233 @@
+"""
+Write-behind buffer for swipe decisions
+
+Acknowledged swipes are never dropped for a transient failure: a batch that
+still fails after max_attempts goes back on the queue, and whatever cannot
+be written while stopping is spilled to a JSON lines file that the next
+start() replays. Only rows the database rejects (e.g. a since-deleted
+seeker) are discarded, and they are removed from the offerer's swiped set.
+"""
+import asyncio
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session
+
+from config import get_settings
+from database import engine, dialect_insert
+from models import SwipeDecision, SwipeAction
+from services.swipe_index import forget_swipe
+
+
+settings = get_settings()
+logger = logging.getLogger(__name__)
+
+# Queue marker telling the flush loop to drain and exit
+_STOP = object()
+
+# Pause before retrying a requeued batch, so an outage doesn't spin the loop
+REQUEUE_DELAY_SECONDS = 1.0
+
+
+def write_swipes(rows: List[Dict[str, Any]]) -> int:
+    """
+    Bulk insert swipe rows in one transaction, skipping existing decisions
+
+    Returns:
+        Number of rows inserted
+    """
+    with Session(engine) as session:
+        statement = dialect_insert(SwipeDecision).values(rows).on_conflict_do_nothing(
+            index_elements=["offerer_id", "seeker_profile_id"]
+        ).returning(SwipeDecision.id)
+        inserted = len(session.exec(statement).all())
+        session.commit()
+    return inserted
+
+
+def write_swipes_each(rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Insert swipe rows one transaction per row
+
+    Returns:
+        Rows the database rejected (integrity errors)
+    """
+    rejected = []
+    for row in rows:
+        try:
+            write_swipes([row])
+        except IntegrityError:
+            rejected.append(row)
+    return rejected
+
+
+def _encode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: value.value if isinstance(value, SwipeAction)
+        else value.isoformat() if isinstance(value, datetime)
+        else str(value) if isinstance(value, UUID)
+        else value
+        for key, value in row.items()
+    }
+
+
+def _decode_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        **row,
+        "id": UUID(row["id"]),
+        "offerer_id": UUID(row["offerer_id"]),
+        "seeker_profile_id": UUID(row["seeker_profile_id"]),
+        "role_config_id": UUID(row["role_config_id"]) if row.get("role_config_id") else None,
+        "action": SwipeAction(row["action"]),
+        "swiped_at": datetime.fromisoformat(row["swiped_at"])
+    }
+
+
+class SwipeWriteBuffer:
+    """
+    Collects acknowledged swipes and writes them in bulk from a background task.
+    A batch is flushed after `flush_interval` seconds or `max_rows` rows,
+    whichever comes first. stop() drains everything still queued.
+    """
+
+    def __init__(self, flush_interval: float, max_rows: int, spill_path: str, max_attempts: int = 3):
+        self.flush_interval = flush_interval
+        self.max_rows = max_rows
+        self.spill_path = spill_path
+        self.max_attempts = max_attempts
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def start(self) -> None:
+        """Start the flush loop on the running event loop, replaying spilled swipes first"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        for row in self._read_spill():
+            self._queue.put_nowait(row)
+        self._task = asyncio.create_task(self._run())
+
+    def enqueue(self, row: Dict[str, Any]) -> None:
+        """Buffer one swipe row (column name -> value)"""
+        if not self.running:
+            raise RuntimeError("Swipe write buffer is not running")
+        self._queue.put_nowait(row)
+
+    async def stop(self) -> None:
+        """Flush everything still buffered, then stop the loop"""
+        if not self.running:
+            return
+        self._queue.put_nowait(_STOP)
+        await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is _STOP:
+                break
+            batch = [item]
+
+            # Gather more rows until the interval elapses or the batch is full
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.max_rows:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            if not await self._flush(batch):
+                logger.error("Requeueing %d buffered swipes after %d failed flushes", len(batch), self.max_attempts)
+                for row in batch:
+                    self._queue.put_nowait(row)
+                await asyncio.sleep(REQUEUE_DELAY_SECONDS)
+
+        # Drain whatever was enqueued before the stop marker
+        remaining = []
+        while not self._queue.empty():
+            item = self._queue.get_nowait()
+            if item is not _STOP:
+                remaining.append(item)
+        unwritten = []
+        for start in range(0, len(remaining), self.max_rows):
+            chunk = remaining[start:start + self.max_rows]
+            if not await self._flush(chunk):
+                unwritten.extend(chunk)
+        if unwritten:
+            self._spill(unwritten)
+
+    async def _flush(self, batch: List[Dict[str, Any]]) -> bool:
+        """Write a batch; returns False if it still failed after max_attempts"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                try:
+                    await asyncio.to_thread(write_swipes, batch)
+                except IntegrityError:
+                    # One bad row fails the whole insert: write row by row
+                    # (rows already stored are skipped by ON CONFLICT)
+                    rejected = await asyncio.to_thread(write_swipes_each, batch)
+                    self._discard(rejected)
+                return True
+            except Exception:
+                logger.exception(
+                    "Swipe flush failed (attempt %d/%d, %d rows)",
+                    attempt, self.max_attempts, len(batch)
+                )
+                await asyncio.sleep(self.flush_interval * attempt)
+        return False
+
+    def _discard(self, rows: List[Dict[str, Any]]) -> None:
+        """Give up on rows the database rejected; their seekers show in the feed again"""
+        for row in rows:
+            logger.error(
+                "Discarding buffered swipe rejected by the database: offerer %s, seeker %s, %s",
+                row["offerer_id"], row["seeker_profile_id"], row["action"].value
+            )
+            forget_swipe(row["offerer_id"], row["seeker_profile_id"])
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        """Append unwritten rows to the spill file, replayed by the next start()"""
+        with open(self.spill_path, "a", encoding="utf-8") as spill:
+            for row in rows:
+                spill.write(json.dumps(_encode_row(row)) + "\n")
+        logger.error("Spilled %d unwritten swipes to %s", len(rows), self.spill_path)
+
+    def _read_spill(self) -> List[Dict[str, Any]]:
+        """Rows spilled by an earlier stop(), removing the spill file"""
+        if not os.path.exists(self.spill_path):
+            return []
+        with open(self.spill_path, encoding="utf-8") as spill:
+            rows = [_decode_row(json.loads(line)) for line in spill if line.strip()]
+        os.remove(self.spill_path)
+        logger.info("Replaying %d spilled swipes from %s", len(rows), self.spill_path)
+        return rows
+
+
+# Used by POST /offerer/swipe when swipe_durability == "write_behind"
+swipe_buffer = SwipeWriteBuffer(
+    flush_interval=settings.swipe_flush_interval_ms / 1000,
+    max_rows=settings.swipe_flush_max_rows,
+    spill_path=settings.swipe_spill_path
+)
@@ -0,0 +1,141 @@
+"""
+Per-offerer swiped-candidate index for feed exclusion
+
+A swiped set is loaded once per offerer and then follows swipes committed
+by this process. Swipes recorded by other workers are found when a page is
+served: sync_swiped checks the page's seekers against swipe_decisions
+through the unique (offerer_id, seeker_profile_id) index.
+"""
+import threading
+from typing import Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlmodel import Session, select
+
+from models import SwipeDecision
+from services.bitmap import OrdinalBitmap
+
+
+class SeekerOrdinals:
+    """
+    Process-wide dense integer ordinal for each seeker profile id,
+    assigned on first sight. Ordinals only need to be stable within the
+    process because every bitmap built on them lives in the same process.
+    """
+
+    def __init__(self):
+        self._ordinals: Dict[UUID, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ordinals)
+
+    def get(self, seeker_profile_id: UUID) -> Optional[int]:
+        """Ordinal for a seeker, or None if it was never assigned"""
+        return self._ordinals.get(seeker_profile_id)
+
+    def assign(self, seeker_profile_id: UUID) -> int:
+        """Ordinal for a seeker, assigning the next one if needed"""
+        ordinal = self._ordinals.get(seeker_profile_id)
+        if ordinal is not None:
+            return ordinal
+        with self._lock:
+            ordinal = self._ordinals.get(seeker_profile_id)
+            if ordinal is None:
+                ordinal = len(self._ordinals)
+                self._ordinals[seeker_profile_id] = ordinal
+            return ordinal
+
+
+seeker_ordinals = SeekerOrdinals()
+
+
+class SwipedSet:
+    """
+    Seekers an offerer has already swiped, as a compressed bitmap of ordinals
+    Supports `in` and len() so it can be used anywhere a set of ids was
+    """
+
+    def __init__(self, ordinals: SeekerOrdinals = seeker_ordinals):
+        self._ordinals = ordinals
+        self._bitmap = OrdinalBitmap()
+
+    def __len__(self) -> int:
+        return len(self._bitmap)
+
+    def __contains__(self, seeker_profile_id: UUID) -> bool:
+        ordinal = self._ordinals.get(seeker_profile_id)
+        return ordinal is not None and ordinal in self._bitmap
+
+    def add(self, seeker_profile_id: UUID) -> bool:
+        """Mark a seeker as swiped; returns True if it was not already"""
+        return self._bitmap.add(self._ordinals.assign(seeker_profile_id))
+
+    def discard(self, seeker_profile_id: UUID) -> bool:
+        """Unmark a seeker (e.g. a buffered swipe that could not be stored)"""
+        ordinal = self._ordinals.get(seeker_profile_id)
+        return ordinal is not None and self._bitmap.discard(ordinal)
+
+    @property
+    def nbytes(self) -> int:
+        return self._bitmap.nbytes
+
+
+_swiped_sets: Dict[UUID, SwipedSet] = {}
+_swiped_sets_lock = threading.Lock()
+
+
+def get_swiped_set(session: Session, offerer_id: UUID) -> SwipedSet:
+    """
+    Get an offerer's swiped set, loading it from swipe_decisions on first use
+    Later swipes are applied in memory through record_swipe
+    """
+    swiped = _swiped_sets.get(offerer_id)
+    if swiped is not None:
+        return swiped
+
+    with _swiped_sets_lock:
+        swiped = _swiped_sets.get(offerer_id)
+        if swiped is None:
+            swiped = SwipedSet()
+            statement = select(SwipeDecision.seeker_profile_id).where(
+                SwipeDecision.offerer_id == offerer_id
+            )
+            for seeker_profile_id in session.exec(statement.execution_options(yield_per=1000)):
+                swiped.add(seeker_profile_id)
+            _swiped_sets[offerer_id] = swiped
+
+    return swiped
+
+
+def sync_swiped(session: Session, offerer_id: UUID, seeker_profile_ids: Iterable[UUID]) -> List[UUID]:
+    """
+    Add swipes recorded elsewhere (e.g. by another worker) among the given
+    seekers to the offerer's swiped set
+
+    Returns:
+        Seekers found swiped that the set did not hold yet
+    """
+    seeker_profile_ids = list(seeker_profile_ids)
+    if not seeker_profile_ids:
+        return []
+    swiped = get_swiped_set(session, offerer_id)
+    statement = select(SwipeDecision.seeker_profile_id).where(
+        SwipeDecision.offerer_id == offerer_id,
+        SwipeDecision.seeker_profile_id.in_(seeker_profile_ids)
+    )
+    return [seeker_profile_id for seeker_profile_id in session.exec(statement) if swiped.add(seeker_profile_id)]
+
+
+def record_swipe(offerer_id: UUID, seeker_profile_id: UUID) -> None:
+    """Apply a committed swipe to the offerer's loaded swiped set (if any)"""
+    swiped = _swiped_sets.get(offerer_id)
+    if swiped is not None:
+        swiped.add(seeker_profile_id)
+
+
+def forget_swipe(offerer_id: UUID, seeker_profile_id: UUID) -> None:
+    """Undo record_swipe for a swipe that was never stored"""
+    swiped = _swiped_sets.get(offerer_id)
+    if swiped is not None:
+        swiped.discard(seeker_profile_id)
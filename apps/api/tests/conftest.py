@@ -0,0 +1,25 @@
+"""
+Shared test setup: tests that touch the database get a throwaway SQLite file
+"""
+import os
+import tempfile
+
+# Must be set before config.get_settings() first runs (database.engine is built at import)
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("DEBUG", "false")
+
+import pytest
+from sqlmodel import Session, SQLModel
+
+from database import engine
+from services.reference_data import invalidate_reference_data
+
+
+@pytest.fixture
+def session():
+    SQLModel.metadata.create_all(engine)
+    invalidate_reference_data()
+    with Session(engine) as session:
+        yield session
+    SQLModel.metadata.drop_all(engine)
+    invalidate_reference_data()
@@ -0,0 +1,98 @@
+"""
+Unit tests for packed answer storage
+"""
+from uuid import uuid4
+from services.answer_storage import PackedAnswers, compile_packed_layout
+from services.scoring import compile_scoring_plan, load_scoring_rules
+from models import Question
+from models.questionnaire import QuestionType
+
+
+def _questions():
+    questionnaire_id = uuid4()
+    return [
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Python skills",
+            question_type=QuestionType.SCALE, order=2,
+            options={"min": 1, "max": 10},
+            scoring_config={"attribute": "technical_skills", "weight": 0.6}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Approach",
+            question_type=QuestionType.MULTIPLE_CHOICE, order=1,
+            options={"choices": [
+                {"value": "break_down", "label": "Break it down", "score": 9},
+                {"value": "trial_error", "label": "Trial and error", "score": 5}
+            ]},
+            scoring_config={"attribute": "technical_skills", "weight": 0.4}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Led a team?",
+            question_type=QuestionType.YES_NO, order=3, options={},
+            scoring_config={"attribute": "leadership", "weight": 0.3}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Anything else?",
+            question_type=QuestionType.TEXT, order=4, options={},
+            scoring_config={}
+        ),
+    ]
+
+
+def test_layout_slots_follow_question_order_and_skip_text():
+    """Test that each non-text question gets a slot in display order"""
+    scale, choice, yes_no, text = _questions()
+    layout = compile_packed_layout([scale, choice, yes_no, text])
+
+    assert layout.question_ids == [choice.id, scale.id, yes_no.id]
+    assert layout.slots[0]["choices"] == ["break_down", "trial_error"]
+    assert layout.slots[1]["choices"] is None
+    assert layout.slots[2]["choices"] == ["yes", "no"]
+    # The key depends on the slots only
+    assert compile_packed_layout([text, yes_no, scale, choice]).key == layout.key
+
+
+def test_packed_answers_round_trip():
+    """Test that packed answers decode to what was submitted and misfits are rejected"""
+    scale, choice, yes_no, text = _questions()
+    layout = compile_packed_layout([scale, choice, yes_no, text])
+    packed = PackedAnswers(layout)
+
+    assert packed.set(scale.id, {"value": 7})
+    assert packed.set(choice.id, {"value": " Trial_Error"})
+    assert packed.set(yes_no.id, {"value": True})
+    assert not packed.set(text.id, {"value": "I like teams"})
+    assert len(packed.to_bytes()) == 3 * 8
+
+    restored = PackedAnswers(layout, packed.to_bytes())
+    assert restored.items() == [
+        (choice.id, {"value": "trial_error"}),
+        (scale.id, {"value": 7}),
+        (yes_no.id, {"value": "yes"}),
+    ]
+    assert restored.count() == 3
+    # Equivalent spellings of a stored answer are not a change
+    assert restored.holds(choice.id, {"value": "TRIAL_ERROR"})
+    assert restored.holds(scale.id, {"value": "7"})
+    assert not restored.holds(scale.id, {"value": 8})
+    assert not restored.holds(text.id, {"value": "I like teams"})
+
+    # A value that no longer fits clears the slot
+    assert not restored.set(scale.id, {"value": "lots"})
+    assert restored.get(scale.id) is None
+    assert restored.count() == 2
+
+
+def test_packed_answers_score_like_submitted_answers():
+    """Test that decoding packed answers does not change the stats"""
+    questions = _questions()
+    scale, choice, yes_no, _ = questions
+    plan = compile_scoring_plan(uuid4(), 1, questions, load_scoring_rules(), "hash")
+    layout = compile_packed_layout(questions)
+
+    submitted = [(scale.id, {"value": "4.5"}), (choice.id, {"value": "BREAK_DOWN"}), (yes_no.id, {"value": "no"})]
+    packed = PackedAnswers(layout)
+    for question_id, answer_value in submitted:
+        assert packed.set(question_id, answer_value)
+
+    assert plan.score(packed.items()) == plan.score(submitted)
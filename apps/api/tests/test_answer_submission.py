@@ -0,0 +1,91 @@
+"""
+Tests for questionnaire answer submission against a SQLite database
+"""
+import asyncio
+import re
+
+import pytest
+from sqlalchemy import event
+from sqlmodel import select
+
+from database import engine
+from models import Answer, Question, Questionnaire, SeekerProfile, User, UserRole
+from models.questionnaire import QuestionType
+from routes.questionnaire import submit_answers
+from schemas.questionnaire import AnswerSubmission, AnswerSubmissionRequest
+from services.principal_cache import Principal
+from services.scoring import get_scoring_plan
+
+
+@pytest.fixture
+def seeker(session):
+    questionnaire = Questionnaire(name="Skills", version=1, is_active=True)
+    session.add(questionnaire)
+    questions = [
+        Question(
+            questionnaire_id=questionnaire.id, text=f"Skill {i}",
+            question_type=QuestionType.SCALE, order=i,
+            options={"min": 1, "max": 10},
+            scoring_config={"attribute": "technical_skills", "weight": 0.5}
+        )
+        for i in range(3)
+    ]
+    session.add_all(questions)
+    user = User(email="seeker@example.com", hashed_password="x", role=UserRole.SEEKER)
+    session.add(user)
+    session.commit()
+    principal = Principal(user_id=user.id, email=user.email, role=UserRole.SEEKER)
+    return principal, [question.id for question in questions]
+
+
+def _submit(session, principal, answers, base_version=None):
+    request = AnswerSubmissionRequest(
+        answers=[AnswerSubmission(question_id=question_id, value=value) for question_id, value in answers],
+        base_version=base_version
+    )
+    return asyncio.run(submit_answers(request, session=session, principal=principal))
+
+
+def _capture_statements():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(" ".join(statement.split()))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    return statements, lambda: event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_autosave_applies_deltas_without_rereading_answers(session, seeker):
+    """Test that a later autosave updates counters and accumulators by delta"""
+    principal, question_ids = seeker
+    first = _submit(session, principal, [(question_ids[0], 6)])
+    assert first.answered_questions == 1
+    
+    statements, stop = _capture_statements()
+    try:
+        second = _submit(session, principal, [(question_ids[1], 8)], base_version=first.answers_version)
+    finally:
+        stop()
+    
+    assert second.answers_version == first.answers_version + 1
+    assert second.answered_questions == 2
+    # Neither the full answer set nor a recount was read
+    full_answers = re.compile(r"FROM answers WHERE answers\.seeker_profile_id = \?$")
+    assert not any(full_answers.search(statement) for statement in statements)
+    assert not any("count(" in statement.lower() for statement in statements)
+    
+    # Changing an existing answer keeps the count; accumulators match a full rebuild
+    third = _submit(session, principal, [(question_ids[0], 9)], base_version=second.answers_version)
+    assert third.answered_questions == 2
+    
+    profile = session.exec(select(SeekerProfile).where(SeekerProfile.user_id == principal.user_id)).one()
+    session.refresh(profile)
+    plan = get_scoring_plan(session)
+    answers = session.exec(
+        select(Answer.question_id, Answer.answer_value).where(Answer.seeker_profile_id == profile.id)
+    ).all()
+    assert profile.answered_count == 2
+    assert plan.stats_from_accumulators(profile.attribute_accumulators) == pytest.approx(
+        plan.stats_from_accumulators(plan.accumulate(answers))
+    )
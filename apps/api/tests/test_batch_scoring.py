@@ -0,0 +1,138 @@
+"""
+Unit tests for the vectorized batch scorer
+"""
+import random
+import pytest
+from uuid import uuid4
+from services.answer_storage import PackedAnswers, compile_packed_layout
+from services.batch_scoring import BatchScorer
+from services.scoring import compile_scoring_plan, compute_fit_score, load_scoring_rules
+from models import Question, OffererRoleConfig
+from models.questionnaire import QuestionType
+
+
+def _questions():
+    questionnaire_id = uuid4()
+    return questionnaire_id, [
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Python skills",
+            question_type=QuestionType.SCALE, order=1,
+            options={"min": 1, "max": 10},
+            scoring_config={"attribute": "technical_skills", "weight": 0.6}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Approach",
+            question_type=QuestionType.MULTIPLE_CHOICE, order=2,
+            options={"choices": [
+                {"value": "break_down", "label": "Break it down", "score": 9},
+                {"value": "trial_error", "label": "Trial and error", "score": 5}
+            ]},
+            scoring_config={"attribute": "technical_skills", "weight": 0.4}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Led a team?",
+            question_type=QuestionType.YES_NO, order=3, options={},
+            scoring_config={"attribute": "leadership", "weight": 0.3}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Presenting",
+            question_type=QuestionType.SCALE, order=4,
+            options={"min": 1, "max": 10},
+            scoring_config={"attribute": "communication", "weight": 0.7}
+        ),
+    ]
+
+
+def test_batch_scores_match_per_seeker_scoring():
+    """Test that grouped reductions agree exactly with ScoringPlan and compute_fit_score"""
+    questionnaire_id, questions = _questions()
+    plan = compile_scoring_plan(questionnaire_id, 1, questions, load_scoring_rules(), "hash")
+    role_configs = [
+        OffererRoleConfig(id=uuid4(), role_name="Engineer",
+                          weights={"technical_skills": 0.5, "communication": 0.3, "leadership": 0.2}),
+        OffererRoleConfig(id=uuid4(), role_name="Lead",
+                          weights={"leadership": 0.7, "communication": 0.3, "unknown": 1.0}),
+        OffererRoleConfig(id=uuid4(), role_name="Empty", weights={}),
+    ]
+    scorer = BatchScorer(plan, role_configs)
+
+    rnd = random.Random(7)
+    answers = {}
+    for _ in range(200):
+        seeker_answers = [
+            (questions[0].id, {"value": rnd.randint(1, 10)}),
+            (questions[1].id, {"value": rnd.choice(["break_down", "trial_error"])}),
+            (questions[2].id, {"value": rnd.choice(["yes", "no"])}),
+            (questions[3].id, {"value": rnd.randint(1, 10)}),
+        ]
+        # Some seekers skip questions
+        answers[uuid4()] = [a for a in seeker_answers if rnd.random() > 0.2]
+    rows = [
+        (seeker_id, question_id, value)
+        for seeker_id, seeker_answers in answers.items()
+        for question_id, value in seeker_answers
+    ]
+
+    seeker_ids, stats, fit_scores = scorer.score(rows)
+    cards = scorer.stats_cards(seeker_ids, stats, fit_scores)
+
+    for seeker_id, card in zip(seeker_ids, cards):
+        expected_stats = plan.score(answers[seeker_id])
+        assert card["stats"] == expected_stats
+        for role_config in role_configs:
+            assert card["fit_scores"][role_config.role_name] == compute_fit_score(expected_stats, role_config)
+
+
+def test_batch_scorer_skips_unscorable_answers():
+    """Test that unknown questions and invalid values leave stats at zero"""
+    questionnaire_id, questions = _questions()
+    plan = compile_scoring_plan(questionnaire_id, 1, questions, load_scoring_rules(), "hash")
+    scorer = BatchScorer(plan, [])
+    seeker_id = uuid4()
+
+    seeker_ids, stats, fit_scores = scorer.score([
+        (seeker_id, uuid4(), {"value": 5}),
+        (seeker_id, questions[0].id, {"value": "lots"}),
+        (seeker_id, questions[1].id, {"value": "unknown_choice"}),
+    ])
+
+    assert seeker_ids == [seeker_id]
+    assert stats.tolist() == [[0.0] * len(plan.attributes)]
+    assert fit_scores.shape == (1, 0)
+
+
+def test_packed_scores_match_per_seeker_scoring():
+    """Test that scoring packed columns agrees exactly with ScoringPlan on the same answers"""
+    questionnaire_id, questions = _questions()
+    plan = compile_scoring_plan(questionnaire_id, 1, questions, load_scoring_rules(), "hash")
+    layout = compile_packed_layout(questions)
+    role_configs = [
+        OffererRoleConfig(id=uuid4(), role_name="Engineer",
+                          weights={"technical_skills": 0.5, "communication": 0.3, "leadership": 0.2}),
+    ]
+    scorer = BatchScorer(plan, role_configs)
+
+    rnd = random.Random(11)
+    rows = []
+    expected = {}
+    for _ in range(200):
+        packed = PackedAnswers(layout)
+        for question_id, value in [
+            (questions[0].id, rnd.randint(1, 10)),
+            (questions[1].id, rnd.choice(["break_down", "trial_error"])),
+            (questions[2].id, rnd.choice(["yes", "no"])),
+            (questions[3].id, rnd.randint(1, 10)),
+        ]:
+            if rnd.random() > 0.2:
+                packed.set(question_id, {"value": value})
+        seeker_id = uuid4()
+        rows.append((seeker_id, layout.key, packed.to_bytes()))
+        expected[seeker_id] = plan.score(packed.items())
+
+    seeker_ids, stats, fit_scores = scorer.score_packed(rows, {layout.key: layout})
+    cards = scorer.stats_cards(seeker_ids, stats, fit_scores)
+
+    assert seeker_ids == [row[0] for row in rows]
+    for seeker_id, card in zip(seeker_ids, cards):
+        assert card["stats"] == expected[seeker_id]
+        assert card["fit_scores"]["Engineer"] == compute_fit_score(expected[seeker_id], role_configs[0])
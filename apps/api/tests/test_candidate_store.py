@@ -0,0 +1,69 @@
+"""
+Unit tests for the in-memory candidate store
+"""
+import pytest
+from uuid import uuid4
+from services.candidate_store import CandidateStore
+from services.scoring import compute_fit_score
+from models import OffererRoleConfig
+
+
+ATTRIBUTES = ["technical_skills", "communication", "leadership"]
+
+
+def test_rank_matches_compute_fit_score():
+    """Test that vectorized scores agree with the per-seeker scorer"""
+    store = CandidateStore(ATTRIBUTES, capacity=2)
+    weights = {"technical_skills": 0.5, "communication": 0.3, "leadership": 0.2}
+    role_config = OffererRoleConfig(id=uuid4(), role_name="Engineer", weights=weights)
+    
+    seekers = {
+        uuid4(): {"technical_skills": 90.0, "communication": 80.0, "leadership": 70.0},
+        uuid4(): {"technical_skills": 40.0, "communication": 95.0, "leadership": 60.0},
+        uuid4(): {"technical_skills": 75.0, "communication": 50.0, "leadership": 100.0},
+    }
+    for seeker_id, stats in seekers.items():
+        store.upsert(seeker_id, stats)
+    
+    ranked, total = store.rank(weights, limit=3)
+    
+    assert total == 3
+    expected = sorted(
+        ((seeker_id, compute_fit_score(stats, role_config)) for seeker_id, stats in seekers.items()),
+        key=lambda item: item[1],
+        reverse=True
+    )
+    assert [seeker_id for seeker_id, _ in ranked] == [seeker_id for seeker_id, _ in expected]
+    for (_, score), (_, expected_score) in zip(ranked, expected):
+        assert score == pytest.approx(expected_score, abs=0.01)
+
+
+def test_rank_top_k_with_exclusion():
+    """Test that excluded seekers are skipped without shrinking the page"""
+    store = CandidateStore(ATTRIBUTES)
+    ids = [uuid4() for _ in range(10)]
+    for i, seeker_id in enumerate(ids):
+        store.upsert(seeker_id, {"technical_skills": float(i * 10)})
+    
+    ranked, _ = store.rank({"technical_skills": 1.0}, limit=3, exclude={ids[9], ids[7]})
+    
+    assert [seeker_id for seeker_id, _ in ranked] == [ids[8], ids[6], ids[5]]
+    assert [score for _, score in ranked] == [80.0, 60.0, 50.0]
+
+
+def test_upsert_and_remove_keep_rows_dense():
+    """Test incremental refresh: updates replace rows, removals compact the matrix"""
+    store = CandidateStore(ATTRIBUTES)
+    a, b, c = uuid4(), uuid4(), uuid4()
+    store.upsert(a, {"leadership": 10.0})
+    store.upsert(b, {"leadership": 20.0})
+    store.upsert(c, {"leadership": 30.0})
+    
+    store.upsert(a, {"leadership": 99.0})
+    store.remove(b)
+    
+    assert len(store) == 2
+    assert b not in store
+    ranked, total = store.rank({"leadership": 1.0}, limit=5)
+    assert total == 2
+    assert ranked == [(a, 99.0), (c, 30.0)]
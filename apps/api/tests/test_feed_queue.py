@@ -0,0 +1,62 @@
+"""
+Unit tests for per-offerer feed queues
+"""
+from uuid import uuid4
+from services.feed_queue import FeedQueue
+from services.role_rankings import RoleRanking
+from services.swipe_index import SeekerOrdinals, SwipedSet
+
+
+def _build(scores, swiped_ids=()):
+    ranking = RoleRanking()
+    for seeker_id, score in scores.items():
+        ranking.upsert(seeker_id, score)
+    swiped = SwipedSet(SeekerOrdinals())
+    for seeker_id in swiped_ids:
+        swiped.add(seeker_id)
+    return FeedQueue(uuid4(), ranking, swiped), ranking, swiped
+
+
+def test_queue_serves_ranked_unswiped_candidates():
+    """Test that the queue head follows the ranking and skips swiped seekers"""
+    ids = [uuid4() for _ in range(6)]
+    queue, _, _ = _build({seeker_id: float(90 - i) for i, seeker_id in enumerate(ids)}, swiped_ids=[ids[1]])
+    queue.refill(3)
+    
+    page, has_more = queue.peek(2)
+    
+    assert [seeker_id for seeker_id, _ in page] == [ids[0], ids[2]]
+    assert has_more
+    assert len(queue) == 3
+
+
+def test_discard_then_refill_continues_from_walk_position():
+    """Test that swiping pops the head and refills resume where the walk stopped"""
+    ids = [uuid4() for _ in range(5)]
+    queue, _, swiped = _build({seeker_id: float(50 - i) for i, seeker_id in enumerate(ids)})
+    queue.refill(2)
+    
+    swiped.add(ids[0])
+    queue.discard(ids[0])
+    queue.refill(3)
+    
+    page, _ = queue.peek(10)
+    assert [seeker_id for seeker_id, _ in page] == ids[1:]
+    assert queue.exhausted
+
+
+def test_reposition_inserts_candidates_ranked_before_walk_position():
+    """Test that a newly scored high-fit seeker jumps into the queue"""
+    ids = [uuid4() for _ in range(4)]
+    queue, ranking, _ = _build({seeker_id: float(40 - i) for i, seeker_id in enumerate(ids)})
+    queue.refill(2)
+    
+    newcomer, straggler = uuid4(), uuid4()
+    ranking.upsert(newcomer, 99.0)
+    queue.reposition(newcomer, 99.0)
+    ranking.upsert(straggler, 1.0)
+    queue.reposition(straggler, 1.0)
+    
+    page, has_more = queue.peek(3)
+    assert [seeker_id for seeker_id, _ in page] == [newcomer, ids[0], ids[1]]
+    assert has_more
@@ -0,0 +1,43 @@
+"""
+Unit tests for ETag helpers
+"""
+import pytest
+from services.http_cache import etag_matches, etag_response, strong_etag
+
+
+def test_strong_etag_depends_on_body():
+    """Test that ETags are quoted, stable and change with the body"""
+    etag = strong_etag(b'{"a":1}')
+    assert etag.startswith('"') and etag.endswith('"')
+    assert etag == strong_etag(b'{"a":1}')
+    assert etag != strong_etag(b'{"a":2}')
+
+
+def test_etag_matches_if_none_match_forms():
+    """Test single, listed, weak and wildcard If-None-Match values"""
+    etag = strong_etag(b"body")
+    
+    assert etag_matches(etag, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f"W/{etag}", etag)
+    assert etag_matches("*", etag)
+    
+    assert not etag_matches(None, etag)
+    assert not etag_matches('"other"', etag)
+
+
+def test_etag_response_not_modified():
+    """Test that a matching If-None-Match gets 304 with the same headers and no body"""
+    body = b'{"a":1}'
+    etag = strong_etag(body)
+    
+    response = etag_response(body, etag, None, "public, max-age=60")
+    assert response.status_code == 200
+    assert response.body == body
+    assert response.headers["etag"] == etag
+    assert response.headers["cache-control"] == "public, max-age=60"
+    
+    not_modified = etag_response(body, etag, etag, "public, max-age=60")
+    assert not_modified.status_code == 304
+    assert not_modified.body == b""
+    assert not_modified.headers["etag"] == etag
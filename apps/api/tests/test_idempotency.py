@@ -0,0 +1,112 @@
+"""
+Unit tests for Idempotency-Key replay
+"""
+import time
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.testclient import TestClient
+from services.idempotency import IdempotencyMiddleware, IdempotencyStore
+
+
+def _app(store, cors_origins=None):
+    app = FastAPI()
+    app.add_middleware(IdempotencyMiddleware, store=store, paths=["/swipe"])
+    if cors_origins:
+        app.add_middleware(CORSMiddleware, allow_origins=cors_origins)
+    calls = {"count": 0}
+
+    @app.post("/swipe")
+    async def swipe(payload: dict):
+        calls["count"] += 1
+        if payload.get("fail"):
+            raise HTTPException(status_code=503, detail="Try again")
+        return {"call": calls["count"], "payload": payload}
+
+    @app.post("/other")
+    async def other():
+        calls["count"] += 1
+        return {"call": calls["count"]}
+
+    return TestClient(app), calls
+
+
+def test_replays_response_for_same_key():
+    """Test that a retried request gets the stored response without running the handler"""
+    client, calls = _app(IdempotencyStore(max_entries=10, ttl_seconds=60))
+    headers = {"Idempotency-Key": "abc", "Authorization": "Bearer one"}
+
+    first = client.post("/swipe", json={"seeker": 1}, headers=headers)
+    retry = client.post("/swipe", json={"seeker": 1}, headers=headers)
+
+    assert calls["count"] == 1
+    assert retry.status_code == first.status_code == 200
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+
+
+def test_replay_does_not_repeat_outer_middleware_headers():
+    """Test that headers added by outer middleware (CORS) are not stored with the response"""
+    client, calls = _app(IdempotencyStore(max_entries=10, ttl_seconds=60), cors_origins=["https://app.example.com"])
+    headers = {"Idempotency-Key": "abc", "Origin": "https://app.example.com"}
+
+    first = client.post("/swipe", json={"seeker": 1}, headers=headers)
+    retry = client.post("/swipe", json={"seeker": 1}, headers=headers)
+
+    assert calls["count"] == 1
+    assert retry.headers.get_list("vary") == first.headers.get_list("vary") == ["Origin"]
+
+
+def test_keys_are_scoped_to_caller_and_path():
+    """Test that other callers, other paths and requests without a key run normally"""
+    client, calls = _app(IdempotencyStore(max_entries=10, ttl_seconds=60))
+
+    client.post("/swipe", json={"seeker": 1}, headers={"Idempotency-Key": "abc", "Authorization": "Bearer one"})
+    client.post("/swipe", json={"seeker": 1}, headers={"Idempotency-Key": "abc", "Authorization": "Bearer two"})
+    client.post("/swipe", json={"seeker": 1})
+    client.post("/swipe", json={"seeker": 1})
+    client.post("/other", headers={"Idempotency-Key": "abc"})
+    client.post("/other", headers={"Idempotency-Key": "abc"})
+
+    assert calls["count"] == 6
+
+
+def test_rejects_key_reuse_with_different_body():
+    """Test that a key replayed with another body is refused"""
+    client, calls = _app(IdempotencyStore(max_entries=10, ttl_seconds=60))
+    headers = {"Idempotency-Key": "abc"}
+
+    client.post("/swipe", json={"seeker": 1}, headers=headers)
+    response = client.post("/swipe", json={"seeker": 2}, headers=headers)
+
+    assert response.status_code == 422
+    assert calls["count"] == 1
+
+
+def test_server_errors_are_not_stored():
+    """Test that a 5xx response leaves the key free for a real retry"""
+    client, calls = _app(IdempotencyStore(max_entries=10, ttl_seconds=60))
+    headers = {"Idempotency-Key": "abc"}
+
+    assert client.post("/swipe", json={"fail": True}, headers=headers).status_code == 503
+    assert client.post("/swipe", json={"fail": True}, headers=headers).status_code == 503
+    assert calls["count"] == 2
+
+
+def test_store_evicts_least_recently_used_and_expired():
+    """Test the LRU bound and the TTL"""
+    store = IdempotencyStore(max_entries=2, ttl_seconds=60)
+    store.put("a", "f", 200, [], b"a")
+    store.put("b", "f", 200, [], b"b")
+    store.get("a")
+    store.put("c", "f", 200, [], b"c")
+
+    assert store.get("b") is None
+    assert store.get("a").body == b"a"
+    assert len(store) == 2
+
+    expiring = IdempotencyStore(max_entries=2, ttl_seconds=0.01)
+    expiring.put("a", "f", 200, [], b"a")
+    time.sleep(0.02)
+    assert expiring.get("a") is None
@@ -0,0 +1,36 @@
+"""
+Unit tests for opaque pagination cursors
+"""
+import pytest
+from uuid import uuid4
+from services.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+
+def test_cursor_round_trip():
+    """Test that a cursor decodes back to its keyset values"""
+    seeker_id = uuid4()
+    cursor = encode_cursor({"s": 83.25, "id": seeker_id})
+    
+    payload = decode_cursor(cursor)
+    
+    assert payload["s"] == 83.25
+    assert payload["id"] == str(seeker_id)
+
+
+def test_cursor_is_url_safe():
+    """Test that cursors can be passed as query parameters unescaped"""
+    cursor = encode_cursor({"s": 99.99, "id": str(uuid4()), "rc": str(uuid4())})
+    
+    assert "=" not in cursor
+    assert "+" not in cursor
+    assert "/" not in cursor
+
+
+def test_decode_cursor_rejects_garbage():
+    """Test that malformed cursors raise InvalidCursorError"""
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor!")
+    
+    # Valid base64 of a JSON list, not an object
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("WzFd")
@@ -0,0 +1,55 @@
+"""
+Unit tests for the password hashing pool and rehash on login
+"""
+import asyncio
+import threading
+import pytest
+from passlib.context import CryptContext
+
+from auth import pwd_context, verify_and_update_password
+from services.password_hashing import HashingPool, HashingPoolFull
+
+
+def test_pool_runs_calls_off_the_event_loop():
+    """Test that calls run on pool threads and return their result"""
+    pool = HashingPool(workers=2, max_pending=4)
+
+    async def main():
+        return await asyncio.gather(*(pool.run(lambda: threading.current_thread().name) for _ in range(3)))
+
+    names = asyncio.run(main())
+    assert all(name.startswith("password-hash") for name in names)
+    assert pool.stats()["queued"] == 0 and pool.stats()["running"] == 0
+
+
+def test_pool_rejects_beyond_max_pending():
+    """Test that calls beyond max_pending fail fast and are counted"""
+    pool = HashingPool(workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def main():
+        blocked = [asyncio.ensure_future(pool.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        stats = pool.stats()
+        with pytest.raises(HashingPoolFull):
+            await pool.run(lambda: None)
+        release.set()
+        await asyncio.gather(*blocked)
+        return stats
+
+    stats = asyncio.run(main())
+    assert stats["running"] == 1 and stats["queued"] == 1
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["queued"] == 0
+
+
+def test_login_verify_upgrades_hash_of_other_cost():
+    """Test that a valid password stored at another bcrypt cost gets a new hash"""
+    old_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4).hash("password123")
+
+    valid, new_hash = asyncio.run(verify_and_update_password("password123", old_hash))
+    assert valid and new_hash is not None
+    assert not pwd_context.needs_update(new_hash)
+
+    assert asyncio.run(verify_and_update_password("wrong", old_hash)) == (False, None)
+    assert asyncio.run(verify_and_update_password("password123", new_hash)) == (True, None)
@@ -0,0 +1,61 @@
+"""
+Unit tests for the per-token principal cache
+"""
+import time
+import pytest
+from uuid import uuid4
+
+from models import UserRole
+from services.principal_cache import Principal, PrincipalCache
+
+
+def _principal(**fields):
+    return Principal(user_id=uuid4(), email="o@example.com", role=UserRole.OFFERER, offerer_id=uuid4(), **fields)
+
+
+def test_get_returns_cached_principal_by_token():
+    """Test that principals are found by token and are immutable"""
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+    principal = _principal()
+    cache.put("token-a", principal)
+
+    assert cache.get("token-a") is principal
+    assert cache.get("token-b") is None
+    with pytest.raises(AttributeError):
+        principal.offerer_id = None
+
+
+def test_invalidate_user_drops_all_their_tokens():
+    """Test that invalidation removes every token of one user and no others"""
+    cache = PrincipalCache(max_entries=10, ttl_seconds=60)
+    principal, other = _principal(), _principal()
+    cache.put("token-a", principal)
+    cache.put("token-b", principal)
+    cache.put("token-c", other)
+
+    cache.invalidate_user(principal.user_id)
+
+    assert cache.get("token-a") is None
+    assert cache.get("token-b") is None
+    assert cache.get("token-c") is other
+    assert len(cache) == 1
+
+
+def test_entries_expire_with_ttl_or_token():
+    """Test the TTL, the token's own expiry and the LRU bound"""
+    cache = PrincipalCache(max_entries=2, ttl_seconds=60)
+    cache.put("expired-token", _principal(), token_expires_at=time.time() - 1)
+    assert cache.get("expired-token") is None
+
+    cache.put("a", _principal())
+    cache.put("b", _principal())
+    cache.get("a")
+    cache.put("c", _principal())
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert len(cache) == 2
+
+    expiring = PrincipalCache(max_entries=2, ttl_seconds=0.01)
+    expiring.put("a", _principal())
+    time.sleep(0.02)
+    assert expiring.get("a") is None
@@ -0,0 +1,55 @@
+"""
+Unit tests for the reference data snapshot
+"""
+from uuid import uuid4
+
+from models import OffererRoleConfig, Question, QuestionType, Questionnaire
+from schemas.offerer import RoleConfigsResponse, RoleConfigSummary
+from services.reference_data import ReferenceData
+
+
+def _snapshot():
+    questionnaire = Questionnaire(id=uuid4(), name="Skills", version=2, is_active=True)
+    questions = [
+        Question(id=uuid4(), questionnaire_id=questionnaire.id, text=f"Q{i}", question_type=QuestionType.SCALE, order=i)
+        for i in range(3)
+    ]
+    role_configs = [
+        OffererRoleConfig(id=uuid4(), role_name="Engineer", weights={"technical_skills": 1.0}),
+        OffererRoleConfig(id=uuid4(), role_name="Retired", weights={}, is_active=False),
+    ]
+    return ReferenceData((questionnaire.id, 2, 3, 2, None, 2), questionnaire, questions, role_configs)
+
+
+def test_snapshot_indexes():
+    """Test question id set, active role configs and role config lookup"""
+    reference_data = _snapshot()
+    
+    assert reference_data.question_ids == {question.id for question in reference_data.questions}
+    assert [config.role_name for config in reference_data.active_role_configs] == ["Engineer"]
+    retired = reference_data.role_configs[1]
+    assert reference_data.role_config(retired.id) is retired
+    assert reference_data.role_config(uuid4()) is None
+
+
+def test_response_built_once_per_snapshot():
+    """Test that response bodies and ETags are built once and reused"""
+    reference_data = _snapshot()
+    builds = []
+    
+    def build(snapshot):
+        builds.append(snapshot)
+        summaries = [
+            RoleConfigSummary(id=config.id, role_name=config.role_name, description=None, weights=config.weights)
+            for config in snapshot.active_role_configs
+        ]
+        return RoleConfigsResponse(configs=summaries, total=len(summaries))
+    
+    body, etag = reference_data.response("role_configs", build)
+    assert reference_data.response("role_configs", build) == (body, etag)
+    assert len(builds) == 1
+    assert RoleConfigsResponse.model_validate_json(body).total == 1
+    
+    # A new snapshot builds its own response
+    assert _snapshot().response("role_configs", build)[1] != etag
+    assert len(builds) == 2
@@ -0,0 +1,56 @@
+"""
+Unit tests for shared per-role candidate rankings
+"""
+from uuid import UUID, uuid4
+from services.role_rankings import RoleRanking
+
+
+def _ids(results):
+    return [seeker_profile_id for seeker_profile_id, _ in results]
+
+
+def test_page_walks_in_fit_score_order():
+    """Test that pages follow (fit_score DESC, id ASC) across cursor positions"""
+    ranking = RoleRanking()
+    a, b, c, d = sorted(uuid4() for _ in range(4))
+    for seeker_id, score in [(c, 50.0), (a, 90.0), (d, 50.0), (b, 70.0)]:
+        ranking.upsert(seeker_id, score)
+    
+    first, has_more = ranking.page(2)
+    assert _ids(first) == [a, b]
+    assert has_more
+    
+    second, has_more = ranking.page(2, after=(first[-1][1], first[-1][0]))
+    assert _ids(second) == [c, d]
+    assert not has_more
+
+
+def test_page_skips_excluded_lazily():
+    """Test per-offerer exclusion without changing the shared list"""
+    ranking = RoleRanking()
+    ids = [uuid4() for _ in range(5)]
+    for i, seeker_id in enumerate(ids):
+        ranking.upsert(seeker_id, float(100 - i))
+    swiped = {ids[0], ids[2]}
+    
+    page, has_more = ranking.page(2, exclude=swiped.__contains__)
+    
+    assert _ids(page) == [ids[1], ids[3]]
+    assert has_more
+    assert len(ranking) == 5
+
+
+def test_upsert_moves_existing_seeker():
+    """Test that rescoring a seeker repositions them instead of duplicating"""
+    ranking = RoleRanking()
+    low, high = uuid4(), uuid4()
+    ranking.upsert(low, 10.0)
+    ranking.upsert(high, 80.0)
+    
+    ranking.upsert(low, 95.0)
+    ranking.remove(high)
+    ranking.remove(uuid4())
+    
+    page, has_more = ranking.page(10)
+    assert page == [(low, 95.0)]
+    assert not has_more
@@ -7,7 +7,10 @@ from services.scoring import (
     normalize_score,
     compute_attribute_score,
     compute_fit_score,
-    load_scoring_rules
+    compile_scoring_plan,
+    load_scoring_rules,
+    scoring_stamp,
+    card_is_current
 )
 from models import Question, Answer, OffererRoleConfig
 from models.questionnaire import QuestionType
@@ -217,6 +220,129 @@ def test_load_scoring_rules():
     assert "teamwork" in attribute_names
 
 
+def _plan_questions(questionnaire_id):
+    """Scale, multiple choice, yes/no and text questions for plan tests"""
+    return [
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Python skills",
+            question_type=QuestionType.SCALE, order=1,
+            options={"min": 1, "max": 5},
+            scoring_config={"attribute": "technical_skills", "weight": 2.0}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Approach",
+            question_type=QuestionType.MULTIPLE_CHOICE, order=2,
+            options={"choices": [
+                {"value": "break_down", "label": "Break it down", "score": 9},
+                {"value": "trial_error", "label": "Trial and error", "score": 5}
+            ]},
+            scoring_config={"attribute": "technical_skills", "weight": 1.0}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Led a team?",
+            question_type=QuestionType.YES_NO, order=3, options={},
+            scoring_config={"attribute": "leadership", "weight": 1.0}
+        ),
+        Question(
+            id=uuid4(), questionnaire_id=questionnaire_id, text="Anything else?",
+            question_type=QuestionType.TEXT, order=4, options={},
+            scoring_config={"attribute": "communication", "weight": 1.0}
+        ),
+    ]
+
+
+def test_scoring_plan_matches_legacy_scale_scoring():
+    """Compiled plan gives the same scale scores as compute_attribute_score"""
+    questionnaire_id = uuid4()
+    scale = _plan_questions(questionnaire_id)[0]
+    plan = compile_scoring_plan(questionnaire_id, 1, [scale], load_scoring_rules(), "hash")
+    
+    answer = Answer(id=uuid4(), seeker_profile_id=uuid4(), question_id=scale.id, answer_value={"value": 4})
+    legacy = compute_attribute_score([answer], {scale.id: scale}, "technical_skills")
+    
+    stats = plan.score([(scale.id, {"value": 4})])
+    assert stats["technical_skills"] == round(legacy, 2) == 75.0
+    assert set(stats) == set(plan.attributes)
+
+
+def test_scoring_plan_scores_choice_and_yes_no_answers():
+    """Choice answers use their option score, yes/no map to 100/0, text is ignored"""
+    questionnaire_id = uuid4()
+    scale, choice, yes_no, text = _plan_questions(questionnaire_id)
+    plan = compile_scoring_plan(
+        questionnaire_id, 1, [scale, choice, yes_no, text], load_scoring_rules(), "hash"
+    )
+    
+    assert text.id not in plan.questions
+    # Unscored questions still count towards questionnaire progress
+    assert plan.question_count == 4
+    stats = plan.score([
+        (scale.id, {"value": 5}),
+        (choice.id, {"value": "break_down"}),
+        (yes_no.id, {"value": "yes"}),
+        (text.id, {"value": "I like teams"}),
+    ])
+    
+    # technical_skills: (100 * 2.0 + 90 * 1.0) / 3.0 = 96.67 (choice score 9 on 0-10)
+    assert stats["technical_skills"] == 96.67
+    assert stats["leadership"] == 100.0
+    assert stats["communication"] == 0.0
+    
+    assert plan.score([(yes_no.id, {"value": "no"})])["leadership"] == 0.0
+    # Unknown choices and unknown questions are skipped
+    assert plan.score([(choice.id, {"value": "nope"}), (uuid4(), {"value": 5})])["technical_skills"] == 0.0
+
+
+
+def test_accumulator_deltas_match_full_scoring():
+    """Applying answer changes as deltas gives the same stats as rescoring all answers"""
+    questionnaire_id = uuid4()
+    scale, choice, yes_no, text = _plan_questions(questionnaire_id)
+    plan = compile_scoring_plan(
+        questionnaire_id, 1, [scale, choice, yes_no, text], load_scoring_rules(), "hash"
+    )
+    
+    answers = {scale.id: {"value": 2}, choice.id: {"value": "trial_error"}}
+    accumulators = plan.accumulate(answers.items())
+    assert plan.accumulators_current(accumulators)
+    
+    changes = [
+        (scale.id, {"value": 5}),
+        (yes_no.id, {"value": "yes"}),
+        (choice.id, {"value": "break_down"}),
+        (yes_no.id, {"value": "no"}),
+        (scale.id, {"value": "not a number"}),
+    ]
+    for question_id, new_value in changes:
+        plan.update_accumulators(accumulators, question_id, answers.get(question_id), new_value)
+        answers[question_id] = new_value
+        assert plan.stats_from_accumulators(accumulators) == plan.score(answers.items())
+    
+    # Accumulators from another plan version are not reused
+    newer = compile_scoring_plan(
+        questionnaire_id, 2, [scale, choice, yes_no, text], load_scoring_rules(), "hash"
+    )
+    assert not newer.accumulators_current(accumulators)
+
+
+def test_card_is_current_tracks_rules_and_role_generations():
+    """Cards are stale once the rules hash, a role's generation or the role set changes"""
+    engineer = OffererRoleConfig(id=uuid4(), role_name="Engineer", weights={"technical_skills": 1.0})
+    lead = OffererRoleConfig(id=uuid4(), role_name="Lead", weights={"leadership": 1.0})
+    card = {"stats": {}, "fit_scores": {}, "scored_with": scoring_stamp("rules-a", [engineer, lead])}
+    
+    assert card_is_current(card, scoring_stamp("rules-a", [engineer, lead]))
+    assert not card_is_current(card, scoring_stamp("rules-b", [engineer, lead]))
+    assert not card_is_current(card, scoring_stamp("rules-a", [engineer]))
+    
+    lead.generation += 1
+    assert not card_is_current(card, scoring_stamp("rules-a", [engineer, lead]))
+    
+    # Cards written before stamping are always stale
+    assert not card_is_current({"stats": {}, "fit_scores": {}}, scoring_stamp("rules-a", [engineer]))
+    assert not card_is_current(None, scoring_stamp("rules-a", [engineer]))
+
+
 if __name__ == "__main__":
     # Run tests with pytest
     pytest.main([__file__, "-v"])
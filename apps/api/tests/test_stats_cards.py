@@ -0,0 +1,48 @@
+"""
+Tests for stats card staleness against a SQLite database
+"""
+from datetime import datetime
+
+from sqlmodel import select
+
+from models import OffererRoleConfig, SeekerProfile, User, UserRole
+from services.reference_data import invalidate_reference_data
+from services.scoring import store_stats
+from services.stats_cards import refresh_stale_cards, write_back_cards
+
+
+def test_weight_update_makes_stored_cards_stale(session):
+    """Test that changing a role's weights in the database bumps its generation"""
+    role_config = OffererRoleConfig(role_name="Engineer", weights={"technical_skills": 1.0})
+    user = User(email="seeker@example.com", hashed_password="x", role=UserRole.SEEKER)
+    session.add_all([role_config, user])
+    session.commit()
+    seeker_profile = SeekerProfile(user_id=user.id, questionnaire_completed=True)
+    session.add(seeker_profile)
+    store_stats(seeker_profile, {"technical_skills": 70.0, "communication": 40.0}, session)
+    session.commit()
+
+    cards = {seeker_profile.id: seeker_profile.stats_card}
+    assert refresh_stale_cards(session, cards)[1] == []
+
+    role_config = session.exec(select(OffererRoleConfig)).one()
+    role_config.weights = {"technical_skills": 0.5, "communication": 0.5}
+    session.add(role_config)
+    session.commit()
+    assert role_config.generation == 2
+
+    # Unrelated edits keep the generation
+    role_config.description = "Builds things"
+    session.add(role_config)
+    session.commit()
+    assert role_config.generation == 2
+
+    invalidate_reference_data()
+    read_at = datetime.utcnow()
+    refreshed, stale = refresh_stale_cards(session, cards)
+    assert stale == [seeker_profile.id]
+
+    # Writing back the recomputed cards makes them current again
+    write_back_cards({seeker_profile.id: refreshed[seeker_profile.id]}, read_at)
+    session.refresh(seeker_profile)
+    assert refresh_stale_cards(session, {seeker_profile.id: seeker_profile.stats_card})[1] == []
@@ -0,0 +1,78 @@
+"""
+Unit tests for the compressed swiped-candidate index
+"""
+import random
+from uuid import uuid4
+from services.bitmap import OrdinalBitmap, ARRAY_CONTAINER_MAX, BITMAP_CONTAINER_BYTES
+from services.swipe_index import SeekerOrdinals, SwipedSet
+
+
+def test_bitmap_membership_across_containers():
+    """Test add/contains for ordinals in several 65536-wide chunks"""
+    bitmap = OrdinalBitmap()
+    ordinals = [0, 1, 65535, 65536, 200000, 3 * 65536 + 7]
+    for ordinal in ordinals:
+        assert bitmap.add(ordinal)
+    
+    assert not bitmap.add(65536)
+    assert len(bitmap) == len(ordinals)
+    assert list(bitmap) == sorted(ordinals)
+    assert 2 not in bitmap
+    assert 65537 not in bitmap
+
+
+def test_bitmap_converts_dense_containers():
+    """Test that a chunk switches to a fixed 8 KB bitmap once it gets dense"""
+    bitmap = OrdinalBitmap()
+    rng = random.Random(7)
+    members = set(rng.sample(range(65536), ARRAY_CONTAINER_MAX + 100))
+    for ordinal in members:
+        bitmap.add(ordinal)
+    
+    assert len(bitmap) == len(members)
+    assert bitmap.nbytes == BITMAP_CONTAINER_BYTES
+    assert set(bitmap) == members
+    assert all(ordinal in bitmap for ordinal in members)
+
+
+def test_bitmap_discard_from_sparse_and_dense_containers():
+    """Test that discard removes members from both container kinds"""
+    bitmap = OrdinalBitmap()
+    for ordinal in range(ARRAY_CONTAINER_MAX + 1):
+        bitmap.add(ordinal)
+    bitmap.add(65536 + 5)
+    
+    assert bitmap.discard(10)
+    assert not bitmap.discard(10)
+    assert bitmap.discard(65536 + 5)
+    assert not bitmap.discard(3 * 65536)
+    
+    assert 10 not in bitmap and 11 in bitmap
+    assert 65536 + 5 not in bitmap
+    assert len(bitmap) == ARRAY_CONTAINER_MAX
+    assert len(list(bitmap)) == ARRAY_CONTAINER_MAX
+
+
+def test_sparse_bitmap_is_compact():
+    """Test that sparse sets cost about 2 bytes per member"""
+    bitmap = OrdinalBitmap()
+    for ordinal in range(0, 500000, 250):
+        bitmap.add(ordinal)
+    
+    assert bitmap.nbytes == 2 * len(bitmap)
+
+
+def test_swiped_set_uses_shared_ordinals():
+    """Test that offerers share seeker ordinals but not swiped members"""
+    ordinals = SeekerOrdinals()
+    first, second = SwipedSet(ordinals), SwipedSet(ordinals)
+    seeker_a, seeker_b = uuid4(), uuid4()
+    
+    assert first.add(seeker_a)
+    assert not first.add(seeker_a)
+    second.add(seeker_b)
+    
+    assert seeker_a in first and seeker_a not in second
+    assert seeker_b in second and seeker_b not in first
+    assert uuid4() not in first
+    assert len(ordinals) == 2